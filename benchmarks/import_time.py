@@ -0,0 +1,43 @@
+import argparse
+import os
+import sys
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, "src"), os.path.join(ROOT, "tests")]
+
+from testkit.import_time import measure_imports, total_import_time  # noqa: E402
+from test_import_time import STARTUP_BUDGET_US  # noqa: E402
+
+STATEMENTS = [
+    "import hoverconnector",
+    "import hoverconnector; from hoverconnector.config import load_configuration",
+    "from hoverconnector.models import DnsRecord",
+    "from hoverconnector.connection import Connection",
+    "from hoverconnector.async_connection import AsyncConnection",
+    "from hoverconnector.cli import main",
+]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the import time of hoverconnector (python -X importtime)")
+    parser.add_argument("statement", nargs="*", help="statements to measure, the usual entry points by default")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules listed per statement")
+    arguments = parser.parse_args(argv)
+
+    # Modules the interpreter loads by itself (site, typing, ...) are left out of the listings
+    interpreter = set(measure_imports("pass"))
+    for statement in arguments.statement or STATEMENTS:
+        print(f"{total_import_time(statement) / 1000:8.1f}ms  {statement}")
+        slowest = sorted(((name, measure) for name, measure in measure_imports(statement).items()
+                          if name not in interpreter), key=lambda item: item[1].self_us, reverse=True)
+        for name, measure in slowest[:arguments.top]:
+            print(f"          {measure.self_us / 1000:6.1f}ms  {name}")
+
+    startup = total_import_time(STATEMENTS[1])
+    print(f"startup: {startup / 1000:.1f}ms (budget {STARTUP_BUDGET_US / 1000:.1f}ms)")
+    return 0 if startup < STARTUP_BUDGET_US else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, "src"), os.path.join(ROOT, "tests")]
+
+from hoverconnector.async_connection import AsyncConnection  # noqa: E402
+from hoverconnector.connection import Connection  # noqa: E402
+from hoverconnector.record_type import RecordType  # noqa: E402
+from testkit.hover_emulator import HoverEmulator  # noqa: E402
+from testkit.hover_mock import HOVER_DOMAIN_DETAILS  # noqa: E402
+from testkit.hover_server import HoverServer  # noqa: E402
+
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+DOMAINS = [f"domain{index}.local" for index in range(16)]
+HOME_ID = "dns1234565"
+
+
+def percentile(latencies: List[float], fraction: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    return dict(
+        calls=len(latencies),
+        throughput=round(len(latencies) / elapsed, 1),
+        p50_ms=round(percentile(latencies, 0.50) * 1000, 3),
+        p99_ms=round(percentile(latencies, 0.99) * 1000, 3),
+        mean_ms=round(statistics.mean(latencies) * 1000, 3),
+    )
+
+
+def timed(function: Callable, latencies: List[float]):
+    started_at = time.perf_counter()
+    result = function()
+    latencies.append(time.perf_counter() - started_at)
+    return result
+
+
+def sequential(call: Callable[[int], object], iterations: int) -> Dict[str, float]:
+    latencies = []
+    started_at = time.perf_counter()
+    for index in range(iterations):
+        timed(lambda: call(index), latencies)
+    return summarize(latencies, time.perf_counter() - started_at)
+
+
+def threaded(call: Callable[[int], object], iterations: int, workers: int) -> Dict[str, float]:
+    latencies = []
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda index: timed(lambda: call(index), latencies), range(iterations)))
+    return summarize(latencies, time.perf_counter() - started_at)
+
+
+def asynchronous(call: Callable[[AsyncConnection, int], object], connection: Connection, iterations: int,
+                 workers: int) -> Dict[str, float]:
+    async def scenario():
+        latencies = []
+        async with AsyncConnection(connection=connection, max_concurrency=workers) as async_connection:
+            semaphore = asyncio.Semaphore(workers)
+
+            async def one(index: int):
+                async with semaphore:
+                    started = time.perf_counter()
+                    await call(async_connection, index)
+                    latencies.append(time.perf_counter() - started)
+
+            started_at = time.perf_counter()
+            await asyncio.gather(*(one(index) for index in range(iterations)))
+            return summarize(latencies, time.perf_counter() - started_at)
+
+    return asyncio.run(scenario())
+
+
+def serve(pipe) -> None:
+    emulator = HoverEmulator()
+    for domain_name in DOMAINS:
+        emulator.add_domain(domain_name, HOVER_DOMAIN_DETAILS["domain"]["dns"])
+
+    with HoverServer(emulator=emulator) as server:
+        pipe.send(server.configuration())
+        # Serves until the benchmark is over
+        try:
+            pipe.recv()
+        except EOFError:
+            pass
+
+
+def start_server() -> Tuple[multiprocessing.Process, object, dict]:
+    # The stand-in server runs in its own process: it does not compete with the measured client for the GIL
+    context = multiprocessing.get_context("spawn")
+    pipe, server_pipe = context.Pipe()
+    process = context.Process(target=serve, args=(server_pipe,), name="hover-server", daemon=True)
+    process.start()
+    if not pipe.poll(30):
+        process.terminate()
+        raise RuntimeError("The stand-in Hover server did not start")
+    return process, pipe, pipe.recv()
+
+
+def stop_server(process: multiprocessing.Process, pipe) -> None:
+    pipe.send(None)
+    process.join(5)
+    if process.is_alive():
+        process.terminate()
+
+
+def run_round(configuration: dict, iterations: int, workers: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    configuration = dict(configuration, session=dict(pool_maxsize=workers))
+
+    results["login.sequential"] = sequential(lambda index: Connection(configuration).log_in(),
+                                             max(1, iterations // 4))
+
+    connection = Connection(configuration)
+    connection.log_in()
+
+    def read(index: int):
+        return connection.get_domain(DOMAINS[index % len(DOMAINS)])
+
+    def write(index: int):
+        return connection.update_entry(domain_name=DOMAINS[index % len(DOMAINS)], dns_entry_id=HOME_ID,
+                                       name="home", record_type=RecordType.A, content=f"10.0.0.{index % 250}",
+                                       ttl=300)
+
+    results["read.sequential"] = sequential(read, iterations)
+    results["read.threaded"] = threaded(read, iterations, workers)
+    results["read.async"] = asynchronous(
+        lambda client, index: client.get_domain(DOMAINS[index % len(DOMAINS)]), connection, iterations, workers)
+
+    results["write.sequential"] = sequential(write, iterations)
+    results["write.threaded"] = threaded(write, iterations, workers)
+    results["write.async"] = asynchronous(
+        lambda client, index: client.update_entry(domain_name=DOMAINS[index % len(DOMAINS)],
+                                                  dns_entry_id=HOME_ID, name="home", content="10.0.0.1",
+                                                  ttl=300),
+        Connection(configuration, cookies=connection.cookies), iterations, workers)
+    return results
+
+
+def medians(rounds: List[Dict[str, Dict[str, float]]]) -> Dict[str, Dict[str, float]]:
+    # A single run is at the mercy of the scheduler: each measure is the median of the rounds
+    return {name: {measure: statistics.median(result[name][measure] for result in rounds)
+                   for measure in measures}
+            for name, measures in rounds[0].items()}
+
+
+def run(iterations: int, workers: int, rounds: int) -> Dict[str, Dict[str, float]]:
+    process, pipe, configuration = start_server()
+    try:
+        return medians([run_round(configuration, iterations, workers) for _ in range(max(1, rounds))])
+    finally:
+        stop_server(process, pipe)
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    regressions = []
+    for name, measures in baseline.items():
+        current = results.get(name, None)
+        if current is None:
+            continue
+        if current["throughput"] < measures["throughput"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {current['throughput']}/s < baseline {measures['throughput']}/s")
+        # p99 of a few hundred calls is a handful of samples, too noisy to gate on: it is reported only
+        if current["p50_ms"] > measures["p50_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {current['p50_ms']}ms > baseline {measures['p50_ms']}ms")
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Connection against a local Hover stand-in server")
+    parser.add_argument("--iterations", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=5, help="repeat the scenarios and keep the medians")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="accepted relative regression")
+    parser.add_argument("--save-baseline", action="store_true", help="replace the baseline with these results")
+    arguments = parser.parse_args(argv)
+
+    results = run(arguments.iterations, arguments.workers, arguments.rounds)
+    document = dict(python=platform.python_version(), platform=platform.platform(), iterations=arguments.iterations,
+                    workers=arguments.workers, rounds=arguments.rounds, results=results)
+    print(json.dumps(document, indent=2))
+
+    if arguments.output:
+        with open(arguments.output, "w") as f:
+            json.dump(document, f, indent=2)
+    if arguments.save_baseline:
+        with open(arguments.baseline, "w") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+        return 0
+
+    if os.path.exists(arguments.baseline):
+        with open(arguments.baseline, "r") as f:
+            regressions = compare(results, json.load(f)["results"], arguments.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,5 +17,11 @@ setup(
     version=datetime.utcnow().strftime("%Y%m%d.%H%M"),
     description='Hover interaction library (hover.com private API)',
     install_requires=install_requires,
+    extras_require={
+        "fast": ["orjson"],
+    },
+    entry_points={
+        "console_scripts": ["hoverconnector=hoverconnector.cli:main"],
+    },
     license='MIT',
 )
@@ -1,4 +1,34 @@
-from hoverconnector.connection import Connection
-from hoverconnector.record_type import RecordType
+import importlib
+from typing import TYPE_CHECKING
 
-__ALL__ = ["Connection", "RecordType"]
+if TYPE_CHECKING:
+    from hoverconnector.accounts import ConnectionManager
+    from hoverconnector.async_connection import AsyncConnection
+    from hoverconnector.connection import Connection
+    from hoverconnector.models import DnsRecord, Domain
+    from hoverconnector.record_type import RecordType
+
+# Modules are only imported on first access: requests and asyncio stay out of short-lived scripts that don't need them
+_EXPORTS = dict(
+    AsyncConnection="hoverconnector.async_connection",
+    Connection="hoverconnector.connection",
+    ConnectionManager="hoverconnector.accounts",
+    DnsRecord="hoverconnector.models",
+    Domain="hoverconnector.models",
+    RecordType="hoverconnector.record_type",
+)
+
+__ALL__ = ["AsyncConnection", "Connection", "ConnectionManager", "DnsRecord", "Domain", "RecordType"]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name, None)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
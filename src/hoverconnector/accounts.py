@@ -0,0 +1,174 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from requests import Response
+
+from hoverconnector.connection import Connection, status_is
+from hoverconnector.exceptions import HoverResponseException, UnknownDomainException
+from hoverconnector.files import read_json, write_json_atomically
+from hoverconnector.models import parse_domains
+from hoverconnector.record_type import RecordType
+from hoverconnector.zone import Zone
+
+# Statuses answered for a domain the account does not own (anymore): the routing table is refreshed once
+NOT_OWNED_STATUS_CODES = (403, 404)
+
+
+def account_session_store(session_store: dict, account: str) -> dict:
+    # Accounts never share a stored session: the shared path gets the account name, e.g. session.work.json
+    root, extension = os.path.splitext(session_store["path"])
+    return dict(session_store, path=f"{root}.{account}{extension}")
+
+
+class ConnectionManager:
+    def __init__(self, configuration: dict, routing_path: str = None, routing_max_age: float = None) -> None:
+        super().__init__()
+        accounts_config = configuration.get("accounts", None) or {}
+        several_accounts = bool(accounts_config)
+        if not accounts_config:
+            accounts_config = {"default": {}}
+
+        # Each account overrides the shared sections (endpoints, session, retry, ...) with its own credential
+        shared = {key: value for key, value in configuration.items() if key not in ("accounts", "routing")}
+        shared_store = shared.get("session_store", None) or {}
+        self.configurations: Dict[str, dict] = {}
+        for name, account in accounts_config.items():
+            account = account or {}
+            self.configurations[name] = account_config = dict(shared, **account)
+            if several_accounts and shared_store.get("path", None) and "session_store" not in account:
+                account_config["session_store"] = account_session_store(shared_store, name)
+
+        routing_config = configuration.get("routing", {})
+        self.routing_path = routing_path or routing_config.get("path", None)
+        self.routing_max_age = routing_max_age or routing_config.get("max_age", None)
+
+        self.connections: Dict[str, Connection] = {}
+        self.routes: Dict[str, str] = {}
+        self.routes_refreshed = False
+        self._lock = threading.RLock()
+        self._account_locks = {name: threading.Lock() for name in self.configurations}
+        self.load_routes()
+
+    @property
+    def accounts(self) -> List[str]:
+        return list(self.configurations)
+
+    def connection(self, account: str) -> Connection:
+        # Accounts are only logged into once a call needs them
+        with self._account_locks[account]:
+            connection = self.connections.get(account, None)
+            if connection is None:
+                connection = Connection(self.configurations[account])
+                connection.log_in()
+                self.connections[account] = connection
+            return connection
+
+    def load_routes(self) -> None:
+        if self.routing_path is None:
+            return
+        stored = read_json(self.routing_path)
+        if stored is None or set(stored.get("accounts", [])) != set(self.configurations):
+            return
+        if self.routing_max_age is not None and stored.get("saved_at", 0) + self.routing_max_age < time.time():
+            return
+        self.routes = dict(stored.get("routes", {}))
+
+    def save_routes(self) -> None:
+        if self.routing_path is not None:
+            write_json_atomically(self.routing_path, dict(saved_at=time.time(), accounts=self.accounts,
+                                                          routes=self.routes))
+
+    def refresh_routes(self) -> Dict[str, str]:
+        with self._lock:
+            routes = {}
+            for account in self.configurations:
+                connection = self.connection(account)
+                response = connection.list_domains()
+                if not status_is(response.status_code, 200):
+                    raise HoverResponseException(response=response)
+                for domain in parse_domains(response, connection.codec):
+                    routes.setdefault(domain.name, account)
+
+            self.routes = routes
+            self.routes_refreshed = True
+            self.save_routes()
+            return routes
+
+    def account_of(self, domain_name: str) -> str:
+        with self._lock:
+            account = self.routes.get(domain_name, None)
+            if account is None and not self.routes_refreshed:
+                account = self.refresh_routes().get(domain_name, None)
+        if account is None:
+            raise UnknownDomainException(domain_name)
+        return account
+
+    def connection_for(self, domain_name: str) -> Connection:
+        return self.connection(self.account_of(domain_name))
+
+    def dispatch(self, domain_name: str, call: Callable[[Connection], Optional[Response]]) -> Optional[Response]:
+        account = self.account_of(domain_name)
+        connection = self.connection(account)
+        response = call(connection)
+        if response is not None and response.status_code == 401:
+            # The account's session expired (or was restored stale from its store): log in again and retry
+            connection.log_in(refresh=True)
+            response = call(connection)
+        if response is None or response.status_code not in NOT_OWNED_STATUS_CODES:
+            return response
+
+        with self._lock:
+            # The route may come from a saved table and the domain moved to another account since
+            if self.routes_refreshed:
+                return response
+            self.refresh_routes()
+        if self.routes.get(domain_name, None) in (None, account):
+            return response
+        return call(self.connection(self.routes[domain_name]))
+
+    def list_domain_names(self) -> List[str]:
+        if not self.routes_refreshed:
+            self.refresh_routes()
+        return list(self.routes)
+
+    def get_domain(self, domain_name: str) -> Response:
+        return self.dispatch(domain_name, lambda connection: connection.get_domain(domain_name))
+
+    def get_zone(self, domain_name: str, refresh: bool = False) -> Zone:
+        zones: List[Zone] = []
+
+        def call(connection: Connection) -> Optional[Response]:
+            try:
+                zones.append(connection.get_zone(domain_name, refresh=refresh))
+            except HoverResponseException as e:
+                return e.response
+            return None
+
+        response = self.dispatch(domain_name, call)
+        if not zones:
+            raise HoverResponseException(response=response)
+        return zones[-1]
+
+    def update_entry(self, domain_name: str, dns_entry_id: str, name: str, record_type: RecordType = RecordType.A,
+                     content: str = None, ttl: int = None, retry: bool = False) -> Response:
+        return self.dispatch(domain_name, lambda connection: connection.update_entry(
+            domain_name=domain_name, dns_entry_id=dns_entry_id, name=name, record_type=record_type, content=content,
+            ttl=ttl, retry=retry))
+
+    def create_entry(self, domain_name: str, name: str, record_type: RecordType, content: str, ttl: int,
+                     retry: bool = False) -> Response:
+        return self.dispatch(domain_name, lambda connection: connection.create_entry(
+            domain_name=domain_name, name=name, record_type=record_type, content=content, ttl=ttl, retry=retry))
+
+    def close(self) -> None:
+        for connection in self.connections.values():
+            connection.close()
+        self.connections.clear()
+
+    def __enter__(self) -> "ConnectionManager":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
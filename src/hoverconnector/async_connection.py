@@ -0,0 +1,83 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Iterable
+
+from requests import Response
+from requests.cookies import RequestsCookieJar
+
+from hoverconnector.connection import Connection
+from hoverconnector.hover_response import HoverResponse
+from hoverconnector.record_type import RecordType
+
+
+class AsyncConnection:
+    def __init__(self, configuration: dict = None, cookies: RequestsCookieJar = None,
+                 connection: Connection = None, max_concurrency: int = None) -> None:
+        super().__init__()
+        self.connection = connection or Connection(configuration=configuration, cookies=cookies)
+
+        # The blocking calls run on their own pool, sized after the HTTP pool so that no worker waits for a socket
+        self.max_concurrency = max_concurrency or self.connection.session_settings["pool_maxsize"]
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="hoverconnector")
+
+    def __getattr__(self, item: str):
+        # Endpoint building is shared with the synchronous connection
+        if item.startswith("endpoint_") or item in ("endpoints", "cookies", "username", "password", "hooks",
+                                                    "add_hook", "remove_hook"):
+            return getattr(self.connection, item)
+        raise AttributeError(item)
+
+    async def run(self, function: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(function, *args, **kwargs))
+
+    async def log_in(self, username: str = None, password: str = None, save=True,
+                     cookies: RequestsCookieJar = None) -> HoverResponse:
+        return await self.run(self.connection.log_in, username=username, password=password, save=save,
+                              cookies=cookies)
+
+    async def list_domains(self, cookies: RequestsCookieJar = None) -> Response:
+        return await self.run(self.connection.list_domains, cookies=cookies)
+
+    async def get_domain(self, domain_name: str, cookies: RequestsCookieJar = None) -> Response:
+        return await self.run(self.connection.get_domain, domain_name, cookies=cookies)
+
+    async def get_domains(self, domain_names: Iterable[str], concurrency: int = None,
+                          cookies: RequestsCookieJar = None) -> Dict[str, Response]:
+        semaphore = asyncio.Semaphore(concurrency or self.max_concurrency)
+
+        async def fetch(domain_name: str) -> Response:
+            async with semaphore:
+                return await self.get_domain(domain_name, cookies=cookies)
+
+        domain_names = list(dict.fromkeys(domain_names))
+        responses = await asyncio.gather(*(fetch(domain_name) for domain_name in domain_names))
+        return dict(zip(domain_names, responses))
+
+    async def update_entry(self, domain_name: str, dns_entry_id: str, name: str,
+                           record_type: RecordType = RecordType.A, content: str = None, ttl: int = None,
+                           cookies: RequestsCookieJar = None, retry: bool = False) -> Response:
+        return await self.run(self.connection.update_entry, domain_name=domain_name, dns_entry_id=dns_entry_id,
+                              name=name, record_type=record_type, content=content, ttl=ttl, cookies=cookies,
+                              retry=retry)
+
+    async def create_entry(self, domain_name: str, name: str, record_type: RecordType, content: str, ttl: int,
+                           cookies: RequestsCookieJar = None, retry: bool = False) -> Response:
+        return await self.run(self.connection.create_entry, domain_name=domain_name, name=name,
+                              record_type=record_type, content=content, ttl=ttl, cookies=cookies, retry=retry)
+
+    async def create_mx_entry(self, domain_name: str, mail_server: str, name: str = "@", priority: int = 0,
+                              ttl: int = 300, cookies: RequestsCookieJar = None, retry: bool = False) -> Response:
+        return await self.run(self.connection.create_mx_entry, domain_name=domain_name, mail_server=mail_server,
+                              name=name, priority=priority, ttl=ttl, cookies=cookies, retry=retry)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        self.connection.close()
+
+    async def __aenter__(self) -> "AsyncConnection":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
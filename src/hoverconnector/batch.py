@@ -0,0 +1,65 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, TYPE_CHECKING, Tuple, TypeVar, Union
+
+from hoverconnector.record_type import RecordType
+
+if TYPE_CHECKING:
+    from requests import Response
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class EntryChange(NamedTuple):
+    domain_name: str
+    name: str
+    record_type: RecordType
+    content: str = None
+    ttl: int = None
+    dns_entry_id: str = None
+
+    @property
+    def is_create(self) -> bool:
+        return self.dns_entry_id is None
+
+
+class BatchResult(NamedTuple):
+    change: EntryChange
+    response: Optional["Response"] = None
+    error: Optional[BaseException] = None
+    # Not sent again: a journal shows an earlier run already applied it
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        if self.skipped:
+            return True
+        return self.error is None and self.response is not None and 200 <= self.response.status_code < 300
+
+
+def as_entry_change(change: Union[EntryChange, dict]) -> EntryChange:
+    if isinstance(change, EntryChange):
+        return change
+    return EntryChange(**change)
+
+
+def run_ordered(function: Callable[[T], R], items: Iterable[T], max_workers: int = 8,
+                window: int = None) -> Iterator[Tuple[T, Optional[R], Optional[BaseException]]]:
+    # At most "window" items are in flight, so that huge (or endless) iterables are never fully materialized
+    window = window or max_workers * 2
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hoverconnector-batch") as executor:
+        pending = deque()
+        for item in items:
+            pending.append((item, executor.submit(function, item)))
+            if len(pending) >= window:
+                yield collect(*pending.popleft())
+        while pending:
+            yield collect(*pending.popleft())
+
+
+def collect(item, future) -> tuple:
+    try:
+        return item, future.result(), None
+    except Exception as e:
+        return item, None, e
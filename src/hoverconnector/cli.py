@@ -0,0 +1,120 @@
+import argparse
+import sys
+import time
+from typing import List
+
+from hoverconnector import ddns
+from hoverconnector.config import load_configuration
+from hoverconnector.connection import Connection
+from hoverconnector.exporter import export_zones, open_sink, SINKS
+from hoverconnector.files import open_text
+from hoverconnector.importer import import_records, record_set_sizes, ImportStats
+from hoverconnector.zonefile import parse_bind, parse_jsonl
+
+
+class Progress:
+    def __init__(self, stream=sys.stderr, interval: float = 0.5) -> None:
+        super().__init__()
+        self.stream = stream
+        self.interval = interval
+        self.last_report = 0.0
+
+    def report(self, stats, force: bool = False) -> None:
+        now = time.monotonic()
+        if force or now - self.last_report >= self.interval:
+            self.last_report = now
+            self.stream.write(f"\r{stats}")
+            self.stream.flush()
+
+    def done(self, stats) -> None:
+        self.report(stats, force=True)
+        self.stream.write("\n")
+
+
+def import_command(arguments: argparse.Namespace) -> int:
+    file_name = arguments.file[:-3] if arguments.file.endswith(".gz") else arguments.file
+    file_format = arguments.format or ("jsonl" if file_name.endswith(".jsonl") else "bind")
+
+    def skipped(line_number: int, reason: str) -> None:
+        sys.stderr.write(f"\rline {line_number} skipped: {reason}\n")
+
+    def parse(lines, on_skip=None):
+        if file_format == "jsonl":
+            return parse_jsonl(lines, default_ttl=arguments.ttl)
+        return parse_bind(lines, domain_name=arguments.domain, origin=arguments.origin, default_ttl=arguments.ttl,
+                          on_skip=on_skip)
+
+    # The file is read twice, records are never all held in memory: the first pass only counts the record sets
+    with open_text(arguments.file) as lines:
+        set_sizes = record_set_sizes(parse(lines))
+
+    with Connection(load_configuration(arguments.config)) as connection, open_text(arguments.file) as lines:
+        connection.log_in()
+        specs = parse(lines, on_skip=skipped)
+
+        progress = Progress()
+
+        def on_result(result, stats: ImportStats) -> None:
+            if not result.ok:
+                reason = result.error or f"{result.response.status_code} {result.response.text}"
+                sys.stderr.write(f"\r{result.change.name} {result.change.record_type.value} failed: {reason}\n")
+            progress.report(stats)
+
+        stats = import_records(connection, arguments.domain, specs, max_workers=arguments.workers,
+                               on_result=on_result, set_sizes=set_sizes)
+        progress.done(stats)
+    return 1 if stats.failed else 0
+
+
+def export_command(arguments: argparse.Namespace) -> int:
+    started_at = time.monotonic()
+    with Connection(load_configuration(arguments.config)) as connection, \
+            open_sink(arguments.output, file_format=arguments.format, compress=arguments.gzip) as sink:
+        connection.log_in()
+        stats = export_zones(connection, sink, domain_names=arguments.domain or None, max_workers=arguments.workers)
+
+    elapsed = time.monotonic() - started_at
+    sys.stderr.write(f"{stats.records} records of {stats.domains} domains exported in {elapsed:.1f}s\n")
+    return 0
+
+
+def ddns_command(arguments: argparse.Namespace) -> int:
+    ddns.main(["--config", arguments.config] + arguments.ddns_arguments)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="hoverconnector", description="Manage DNS records hosted at Hover")
+    parser.add_argument("--config", default="config.yml", help="configuration file (see config.example.yml)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="create or update records from a BIND zone or JSONL file")
+    import_parser.add_argument("file", help="zone file (.gz files are decompressed on the fly)")
+    import_parser.add_argument("--domain", required=True, help="domain receiving the records")
+    import_parser.add_argument("--format", choices=["bind", "jsonl"], help="guessed from the extension by default")
+    import_parser.add_argument("--origin", help="BIND origin, the domain by default")
+    import_parser.add_argument("--ttl", type=int, default=3600, help="TTL of records without one")
+    import_parser.add_argument("--workers", type=int, default=8, help="concurrent calls to Hover")
+    import_parser.set_defaults(handler=import_command)
+
+    export_parser = commands.add_parser("export", help="write the records of every domain to a file")
+    export_parser.add_argument("output", help="output file (.gz files are compressed)")
+    export_parser.add_argument("--format", choices=list(SINKS), help="guessed from the extension, bind by default")
+    export_parser.add_argument("--gzip", action="store_true", help="compress the output")
+    export_parser.add_argument("--domain", action="append", help="domain to export (repeatable), all by default")
+    export_parser.add_argument("--workers", type=int, default=4, help="zones fetched concurrently")
+    export_parser.set_defaults(handler=export_command)
+
+    ddns_parser = commands.add_parser("ddns", help="dynamic DNS daemon (see python -m hoverconnector.ddns -h)")
+    ddns_parser.add_argument("ddns_arguments", nargs=argparse.REMAINDER)
+    ddns_parser.set_defaults(handler=ddns_command)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    arguments = build_parser().parse_args(argv)
+    return arguments.handler(arguments)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+import importlib.util
+from typing import Any, Union
+
+
+class JsonCodec:
+    name = "json"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._module = None
+
+    @property
+    def module(self):
+        # Imported on first use, the codec is picked at import time but scripts which never parse JSON don't pay for it
+        if self._module is None:
+            self._module = importlib.import_module(self.name)
+        return self._module
+
+    def dumps(self, data: Any) -> bytes:
+        return self.module.dumps(data, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self.module.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def dumps(self, data: Any) -> bytes:
+        return self.module.dumps(data)
+
+
+CODECS = dict(json=JsonCodec, orjson=OrjsonCodec)
+
+
+def is_available(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+def get_codec(name: str = None) -> JsonCodec:
+    if name is None:
+        return default_codec
+    if name not in CODECS:
+        raise ValueError(f"Unknown JSON codec: {name}")
+    if not is_available(name):
+        raise ValueError(f"{name} is not installed")
+    return CODECS[name]()
+
+
+# orjson parses the large list_domains payloads several times faster, the standard library is the fallback
+default_codec = OrjsonCodec() if is_available("orjson") else JsonCodec()
@@ -0,0 +1,221 @@
+import os
+import re
+from typing import Any, Dict, List, Tuple
+
+# Plain scalars resolved like PyYAML does (YAML 1.1); anything it would turn into another type (dates, octal or
+# sexagesimal numbers, .inf, ...) makes the whole file go through PyYAML instead. The patterns are compiled (and
+# cached) by re on first use rather than at import time.
+NULL = r"^(~|null|Null|NULL|)$"
+TRUE = r"^(yes|Yes|YES|true|True|TRUE|on|On|ON)$"
+FALSE = r"^(no|No|NO|false|False|FALSE|off|Off|OFF)$"
+INTEGER = r"^[-+]?(0|[1-9][0-9_]*)$"
+FLOAT = r"^([-+]?[0-9][0-9_]*\.[0-9_]*|\.[0-9][0-9_]*)([eE][-+][0-9]+)?$"
+AMBIGUOUS = (r"^([-+]?0[0-9bx_]|[-+]?[0-9][0-9_]*(:[0-5]?[0-9])+|[-+]?\.(inf|Inf|INF|nan|NaN|NAN)$|"
+             r"[0-9]{4}-[0-9]{1,2}-[0-9]{1,2}|[-+]?[0-9]+[eE]|=$|<<$)")
+ANCHOR = r"^&([^\s\[\]{},]+)(?:\s+(.*))?$"
+ALIAS = r"^\*([^\s\[\]{},]+)$"
+DOUBLE_QUOTE_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "n": "\n", "t": "\t", "r": "\r", "0": "\0"}
+
+
+class UnsupportedYaml(Exception):
+    pass
+
+
+def load_configuration(path: str) -> dict:
+    with open(os.path.expanduser(path), "r") as f:
+        text = f.read()
+    try:
+        return parse_yaml(text) or {}
+    except UnsupportedYaml:
+        # The configuration files of the project only use a small subset of YAML, PyYAML is only loaded for the rest
+        import yaml
+        return yaml.load(text, yaml.SafeLoader) or {}
+
+
+def parse_yaml(text: str) -> Any:
+    lines = []
+    for line in text.splitlines():
+        content = strip_comment(line).rstrip()
+        if not content.strip():
+            continue
+        stripped = content.lstrip(" ")
+        if stripped.startswith(("\t", "---", "...", "%", "?", "!", "{")) or content.startswith("\t"):
+            raise UnsupportedYaml(line)
+        lines.append((len(content) - len(stripped), stripped))
+
+    if not lines:
+        return None
+    anchors: Dict[str, Any] = {}
+    value, index = parse_block(lines, 0, lines[0][0], anchors)
+    if index != len(lines):
+        raise UnsupportedYaml(lines[index][1])
+    return value
+
+
+def strip_comment(line: str) -> str:
+    quote = None
+    for index, character in enumerate(line):
+        if quote is not None:
+            if character == quote:
+                quote = None
+        elif character in "'\"" and (index == 0 or line[index - 1] in " :-[,"):
+            quote = character
+        elif character == "#" and (index == 0 or line[index - 1] in " \t"):
+            return line[:index]
+    return line
+
+
+def parse_block(lines: List[Tuple[int, str]], index: int, indent: int, anchors: Dict[str, Any]) -> Tuple[Any, int]:
+    if lines[index][1] == "-" or lines[index][1].startswith("- "):
+        return parse_sequence(lines, index, indent, anchors)
+    return parse_mapping(lines, index, indent, anchors)
+
+
+def parse_sequence(lines: List[Tuple[int, str]], index: int, indent: int,
+                   anchors: Dict[str, Any]) -> Tuple[list, int]:
+    items = []
+    while index < len(lines) and lines[index][0] == indent and (lines[index][1] == "-"
+                                                               or lines[index][1].startswith("- ")):
+        rest = lines[index][1][1:].lstrip(" ")
+        if not rest:
+            item, index = parse_nested(lines, index + 1, indent, anchors, allow_sequence=False)
+        elif split_key(rest) is not None:
+            # "- key: value" starts a mapping indented like its first key
+            offset = len(lines[index][1]) - len(rest)
+            lines[index] = (indent + offset, rest)
+            item, index = parse_mapping(lines, index, indent + offset, anchors)
+        else:
+            item, index = parse_scalar(rest, anchors), index + 1
+        items.append(item)
+    return items, check_dedent(lines, index, indent)
+
+
+def parse_mapping(lines: List[Tuple[int, str]], index: int, indent: int,
+                  anchors: Dict[str, Any]) -> Tuple[dict, int]:
+    mapping = {}
+    while index < len(lines) and lines[index][0] == indent and not (lines[index][1] == "-"
+                                                                    or lines[index][1].startswith("- ")):
+        split = split_key(lines[index][1])
+        if split is None:
+            raise UnsupportedYaml(lines[index][1])
+        key, rest = split
+
+        anchor = re.match(ANCHOR, rest)
+        if anchor is not None and not anchor.group(2):
+            value, index = parse_nested(lines, index + 1, indent, anchors, allow_sequence=True)
+            anchors[anchor.group(1)] = value
+        elif not rest:
+            value, index = parse_nested(lines, index + 1, indent, anchors, allow_sequence=True)
+        else:
+            value, index = parse_scalar(rest, anchors), index + 1
+        mapping[parse_key(key)] = value
+    return mapping, check_dedent(lines, index, indent)
+
+
+def parse_nested(lines: List[Tuple[int, str]], index: int, indent: int, anchors: Dict[str, Any],
+                 allow_sequence: bool) -> Tuple[Any, int]:
+    if index < len(lines):
+        nested_indent, text = lines[index]
+        if nested_indent > indent:
+            return parse_block(lines, index, nested_indent, anchors)
+        # A sequence may be indented like the key holding it
+        if allow_sequence and nested_indent == indent and (text == "-" or text.startswith("- ")):
+            return parse_sequence(lines, index, indent, anchors)
+    return None, index
+
+
+def check_dedent(lines: List[Tuple[int, str]], index: int, indent: int) -> int:
+    if index < len(lines) and lines[index][0] > indent:
+        raise UnsupportedYaml(lines[index][1])
+    return index
+
+
+def split_key(text: str):
+    if text[0] in "'\"[*&|>":
+        return None
+    match = re.match(r"^([^:]*?):(?:\s+(.*))?$", text)
+    if match is None or not match.group(1):
+        return None
+    return match.group(1).rstrip(), (match.group(2) or "").strip()
+
+
+def parse_key(key: str) -> Any:
+    value = resolve_plain(key)
+    if isinstance(value, (dict, list)):
+        raise UnsupportedYaml(key)
+    return value
+
+
+def parse_scalar(text: str, anchors: Dict[str, Any]) -> Any:
+    anchor = re.match(ANCHOR, text)
+    if anchor is not None:
+        value = parse_scalar(anchor.group(2), anchors)
+        anchors[anchor.group(1)] = value
+        return value
+
+    alias = re.match(ALIAS, text)
+    if alias is not None:
+        if alias.group(1) not in anchors:
+            raise UnsupportedYaml(text)
+        return anchors[alias.group(1)]
+
+    if text[0] == "[":
+        return parse_flow_sequence(text, anchors)
+    if text[0] in "{|>!%@`":
+        raise UnsupportedYaml(text)
+    if text[0] in "'\"":
+        return parse_quoted(text)
+    if ": " in text or text.endswith(":"):
+        raise UnsupportedYaml(text)
+    return resolve_plain(text)
+
+
+def parse_flow_sequence(text: str, anchors: Dict[str, Any]) -> list:
+    if not text.endswith("]") or any(character in text[1:-1] for character in "[]{}'\""):
+        raise UnsupportedYaml(text)
+    items = [item.strip() for item in text[1:-1].split(",")]
+    if items[-1] == "":
+        items.pop()
+    if any(not item for item in items):
+        raise UnsupportedYaml(text)
+    return [parse_scalar(item, anchors) for item in items]
+
+
+def parse_quoted(text: str) -> str:
+    quote = text[0]
+    if len(text) < 2 or text[-1] != quote:
+        raise UnsupportedYaml(text)
+    body = text[1:-1]
+    if quote == "'":
+        if "'" in body.replace("''", ""):
+            raise UnsupportedYaml(text)
+        return body.replace("''", "'")
+
+    value = []
+    characters = iter(body)
+    for character in characters:
+        if character == '"':
+            raise UnsupportedYaml(text)
+        if character == "\\":
+            escaped = next(characters, None)
+            if escaped not in DOUBLE_QUOTE_ESCAPES:
+                raise UnsupportedYaml(text)
+            character = DOUBLE_QUOTE_ESCAPES[escaped]
+        value.append(character)
+    return "".join(value)
+
+
+def resolve_plain(text: str) -> Any:
+    if re.match(AMBIGUOUS, text):
+        raise UnsupportedYaml(text)
+    if re.match(NULL, text):
+        return None
+    if re.match(TRUE, text):
+        return True
+    if re.match(FALSE, text):
+        return False
+    if re.match(INTEGER, text):
+        return int(text.replace("_", ""))
+    if re.match(FLOAT, text):
+        return float(text.replace("_", ""))
+    return text
@@ -1,14 +1,32 @@
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Union
+
 import requests
 from requests import Response
+from requests.adapters import HTTPAdapter
 from requests.cookies import RequestsCookieJar
 
+from hoverconnector.batch import EntryChange, BatchResult, as_entry_change, run_ordered
+from hoverconnector.cache import ReadCache, MISSING
+from hoverconnector.codec import JsonCodec, default_codec
+from hoverconnector.instrumentation import Hook, RequestEvent, fire, request_size, response_size
+from hoverconnector.models import DnsRecord, Domain, intern, name_matcher, parse_domain, parse_record, payload_of
+from hoverconnector.rate_limiter import AdaptiveRateLimiter
+from hoverconnector.retry import RetryPolicy
+from hoverconnector.session_store import SessionStore, StoredSession, authentication_cookie
+from hoverconnector.single_flight import SingleFlight
+from hoverconnector.zone import Zone
 from hoverconnector.record_type import RecordType
-from hoverconnector.exceptions import HoverLoginException, ConnectionConfigurationException
+from hoverconnector.exceptions import HoverLoginException, ConnectionConfigurationException, HoverResponseException
 from hoverconnector.hover_response import HoverResponse
 
 
 class Connection:
-    def __init__(self, configuration: dict = None, cookies: RequestsCookieJar = None) -> None:
+    def __init__(self, configuration: dict = None, cookies: RequestsCookieJar = None,
+                 rate_limiter: AdaptiveRateLimiter = None, retry_policy: RetryPolicy = None,
+                 session_store: SessionStore = None, hooks: Iterable[Hook] = None,
+                 codec: JsonCodec = None) -> None:
         super().__init__()
         if configuration is None:
             configuration = {}
@@ -31,8 +49,110 @@ class Connection:
 
         self.cookies = cookies or RequestsCookieJar()
 
+        session_config = configuration.get("session", {})
+        self.session_settings = dict(
+            pool_connections=session_config.get("pool_connections", 10),
+            pool_maxsize=session_config.get("pool_maxsize", 10),
+            pool_block=session_config.get("pool_block", False),
+            keep_alive=session_config.get("keep_alive", True),
+            connect_timeout=session_config.get("connect_timeout", 5),
+            read_timeout=session_config.get("read_timeout", 30)
+        )
+        self.timeout = (self.session_settings["connect_timeout"], self.session_settings["read_timeout"])
+        self.session = self.build_session()
+
+        cache_config = configuration.get("cache", {})
+        self.cache = ReadCache(ttl=cache_config.get("ttl", 30), max_size=cache_config.get("max_size", 256)) \
+            if cache_config.get("enabled", False) else None
+
+        single_flight_config = configuration.get("single_flight", {})
+        self.single_flight = SingleFlight() if single_flight_config.get("enabled", True) else None
+
+        rate_limit_config = configuration.get("rate_limit", {})
+        self.rate_limiter = rate_limiter or (AdaptiveRateLimiter.from_configuration(rate_limit_config)
+                                             if rate_limit_config.get("enabled", False) else None)
+
+        retry_config = configuration.get("retry", {})
+        self.retry_policy = retry_policy or (RetryPolicy.from_configuration(retry_config)
+                                             if retry_config.get("enabled", True) else None)
+
+        session_store_config = configuration.get("session_store", {})
+        self.session_store = session_store or (SessionStore.from_configuration(session_store_config)
+                                               if session_store_config.get("path", None) else None)
+
+        self.zones: Dict[str, Zone] = {}
+        self._upsert_locks: Dict[tuple, threading.Lock] = {}
+        self._upsert_locks_lock = threading.Lock()
+        self.hooks: List[Hook] = list(hooks or [])
+        self.codec = codec or default_codec
+
+    def build_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.session_settings["pool_connections"],
+                              pool_maxsize=self.session_settings["pool_maxsize"],
+                              pool_block=self.session_settings["pool_block"])
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not self.session_settings["keep_alive"]:
+            session.headers["Connection"] = "close"
+
+        # The session shares the connection's jar so that cookies set by any response are kept for later calls
+        session.cookies = self.cookies
+        return session
+
+    def add_hook(self, hook: Hook) -> Hook:
+        self.hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook: Hook) -> None:
+        self.hooks.remove(hook)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "Connection":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
     def log_in(self, username: str = None, password: str = None, save=True,
-               cookies: RequestsCookieJar = None) -> HoverResponse:
+               cookies: RequestsCookieJar = None, refresh: bool = False) -> HoverResponse:
+        rejected = None
+        if refresh:
+            # Hover rejected the current session: it is dropped and never restored from the store again
+            jar = cookies if cookies is not None else self.cookies
+            rejected = authentication_cookie(jar)
+            jar.clear()
+
+        if self.session_store is None or cookies is not None:
+            return self.authenticate(username=username, password=password, save=save, cookies=cookies)
+
+        # The store is replaced atomically, a fresh session can be used without waiting for the lock
+        stored = self.session_store.load()
+        if self.restorable(stored, rejected):
+            self.update_cookies(stored.cookies)
+            return HoverResponse(cookies=self.cookies)
+
+        with self.session_store.locked():
+            # Another process may have refreshed the session while this one was waiting for the lock
+            stored = self.session_store.load()
+            if self.restorable(stored, rejected):
+                self.update_cookies(stored.cookies)
+                return HoverResponse(cookies=self.cookies)
+            if stored is not None and not refresh:
+                self.update_cookies(stored.cookies)
+
+            hover_response = self.authenticate(username=username, password=password, save=save)
+            self.session_store.save(self.cookies)
+            return hover_response
+
+    def restorable(self, stored: Optional[StoredSession], rejected: Optional[str]) -> bool:
+        return self.session_store.is_fresh(stored) and (rejected is None
+                                                        or authentication_cookie(stored.cookies) != rejected)
+
+    def authenticate(self, username: str = None, password: str = None, save=True,
+                     cookies: RequestsCookieJar = None) -> HoverResponse:
         cookies = cookies or self.cookies or RequestsCookieJar()
         username = username or self.username
         password = password or self.password
@@ -41,9 +161,10 @@ class Connection:
 
         # When an "hover_session" has not yet been established, we need to retrieve a page to get the "session" ID
         if len(cookies.items()) == 0 or "hover_session" not in cookies:
-            response = requests.get(url=self.endpoint_establish())
+            response = self.send("GET", self.endpoint_establish(), endpoint="establish")
         else:
-            response = requests.get(url=self.endpoint_establish(), cookies=cookies, allow_redirects=False)
+            response = self.send("GET", self.endpoint_establish(), cookies=cookies, endpoint="establish",
+                                 allow_redirects=False)
         cookies.update(response.cookies)
         self.update_cookies(cookies)
 
@@ -56,72 +177,278 @@ class Connection:
 
             if required_fields:
                 raise ConnectionConfigurationException(*required_fields)
-            response = requests.post(url=self.endpoint_login(),
-                                     json={"username": username, "password": password, "remember": save},
-                                     cookies=cookies)
+            response = self.send("POST", self.endpoint_login(),
+                                 json={"username": username, "password": password, "remember": save},
+                                 cookies=cookies, endpoint="login")
 
             if not status_is(response.status_code, 200):
                 raise HoverLoginException(response=response)
 
             cookies.update(response.cookies)
             self.cookies.update(cookies)
-        return HoverResponse(response=response, cookies=cookies)
+        return HoverResponse(response=response, cookies=cookies, codec=self.codec)
 
     def update_cookies(self, cookies: RequestsCookieJar) -> None:
         self.cookies.update(cookies)
 
     def list_domains(self, cookies: RequestsCookieJar = None) -> Response:
-        cookies = cookies or self.cookies
-        return requests.get(self.endpoint_list_domains(), cookies=cookies)
+        return self.cached_get(("list_domains",), self.endpoint_list_domains(), cookies=cookies,
+                               endpoint="list_domains")
 
     def get_domain(self, domain_name: str, cookies: RequestsCookieJar = None) -> Response:
+        return self.cached_get(("domain", domain_name), self.endpoint_domain(domain_name), cookies=cookies,
+                               endpoint="get_domain")
+
+    def cached_get(self, key: tuple, url: str, cookies: RequestsCookieJar = None, endpoint: str = None) -> Response:
+        # Reads made with another cookie jar may belong to another account and are neither cached nor coalesced
+        own_cookies = cookies is None or cookies is self.cookies
+        use_cache = self.cache is not None and own_cookies
         cookies = cookies or self.cookies
-        return requests.get(self.endpoint_domain(domain_name), cookies=cookies)
+
+        started_at = time.perf_counter()
+        if use_cache:
+            response = self.cache.get(key)
+            if response is not MISSING:
+                if self.hooks:
+                    fire(self.hooks, RequestEvent(endpoint=endpoint or "get", method="GET", url=url,
+                                                  status_code=response.status_code,
+                                                  latency=time.perf_counter() - started_at,
+                                                  response_bytes=response_size(response), cache_hit=True))
+                return response
+
+        def fetch() -> Response:
+            generation = self.cache.generation(key) if use_cache else None
+            fetched = self.send("GET", url, cookies=cookies, endpoint=endpoint, cache_hit=False if use_cache else None)
+            if use_cache and status_is(fetched.status_code, 200):
+                self.cache.set(key, fetched, generation=generation)
+            return fetched
+
+        if self.single_flight is None or not own_cookies:
+            return fetch()
+
+        # Identical reads made while one is in flight share its response instead of calling Hover again
+        response, coalesced = self.single_flight.do(key, fetch)
+        if coalesced and self.hooks:
+            fire(self.hooks, RequestEvent(endpoint=endpoint or "get", method="GET", url=url,
+                                          status_code=response.status_code, latency=time.perf_counter() - started_at,
+                                          response_bytes=response_size(response), coalesced=True))
+        return response
+
+    def iter_domains(self, status: Union[str, Iterable[str]] = None,
+                     cookies: RequestsCookieJar = None) -> Iterator[Domain]:
+        response = self.list_domains(cookies=cookies)
+        if not status_is(response.status_code, 200):
+            raise HoverResponseException(response=response)
+
+        statuses = {status} if isinstance(status, str) else set(status) if status is not None else None
+        nameservers_cache = {}
+        for item in payload_of(response, self.codec).get("domains", []):
+            if statuses is None or item.get("status", None) in statuses:
+                yield parse_domain(item, nameservers_cache)
+
+    def iter_records(self, domain: Union[str, Iterable[str]] = None,
+                     record_type: Union[RecordType, Iterable[RecordType]] = None,
+                     name: Union[str, Pattern] = None, status: Union[str, Iterable[str]] = None, prefetch: int = 4,
+                     cookies: RequestsCookieJar = None) -> Iterator[DnsRecord]:
+        if domain is None:
+            domain_names = (item.name for item in self.iter_domains(status=status, cookies=cookies))
+        else:
+            domain_names = [domain] if isinstance(domain, str) else domain
+        record_types = [record_type] if isinstance(record_type, RecordType) else record_type
+        type_values = {item.value for item in record_types} if record_types is not None else None
+        matches = name_matcher(name)
+
+        # The next zones are fetched while the current one is consumed: at most "prefetch" zones are held at once
+        prefetch = max(1, prefetch)
+        for domain_name, response, error in run_ordered(lambda item: self.get_domain(item, cookies=cookies),
+                                                        domain_names, max_workers=prefetch, window=prefetch):
+            if error is not None:
+                raise error
+            if not status_is(response.status_code, 200):
+                raise HoverResponseException(response=response)
+
+            payload = payload_of(response, self.codec)["domain"]
+            domain_name = intern(payload["name"])
+            for item in payload.get("dns", []):
+                # Filtered on the raw items: records which are not kept are never built
+                if type_values is not None and item["type"] not in type_values:
+                    continue
+                if matches is not None and not matches(item["name"]):
+                    continue
+                yield parse_record(item, domain_name)
+
+    def invalidate_domain(self, domain_name: str) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(("domain", domain_name))
+        # A read started before the write may not see it: later reads do not join it
+        if self.single_flight is not None:
+            self.single_flight.forget(("domain", domain_name))
+
+    def get_zone(self, domain_name: str, refresh: bool = False, cookies: RequestsCookieJar = None) -> Zone:
+        zone = self.zones.get(domain_name, None)
+        if zone is not None and not refresh:
+            return zone
+
+        response = self.get_domain(domain_name, cookies=cookies)
+        if not status_is(response.status_code, 200):
+            raise HoverResponseException(response=response)
+
+        self.zones[domain_name] = zone = Zone.from_response(response, self.codec)
+        return zone
+
+    def forget_zone(self, domain_name: str) -> None:
+        self.zones.pop(domain_name, None)
 
     def update_entry(self, domain_name: str, dns_entry_id: str, name: str, record_type: RecordType = RecordType.A,
-                     content: str = None, ttl: int = None, cookies: RequestsCookieJar = None) -> Response:
+                     content: str = None, ttl: int = None, cookies: RequestsCookieJar = None,
+                     retry: bool = False) -> Response:
         cookies = cookies or self.cookies
-        json_payload = {
-            "domain": {
-                "id": f"domain-{domain_name}",
-                "dns_records": [{
-                    "id": dns_entry_id,
-                    "name": name,
-                    "type": record_type.value
-                }],
-            },
-            "fields": {
-            }
-        }
-        if content is not None and len(content) > 0:
-            json_payload["fields"]["content"] = content
-        if ttl is not None and ttl > 0:
-            json_payload["fields"]["ttl"] = ttl
-
-        return requests.put(self.endpoint_update_entry(), cookies=cookies, json=json_payload)
+        json_payload = update_entry_payload(domain_name=domain_name, dns_entry_id=dns_entry_id, name=name,
+                                            record_type=record_type, content=content, ttl=ttl)
+        response = self.send("PUT", self.endpoint_update_entry(), cookies=cookies, json=json_payload, retry=retry,
+                             endpoint="update_entry")
+        self.invalidate_domain(domain_name)
+
+        zone = self.zones.get(domain_name, None)
+        if zone is not None and status_is(response.status_code, 200):
+            zone.update(dns_entry_id, content=json_payload["fields"].get("content", None),
+                        ttl=json_payload["fields"].get("ttl", None))
+        return response
 
     def create_entry(self, domain_name: str, name: str, record_type: RecordType, content: str, ttl: int,
-                     cookies: RequestsCookieJar = None) -> Response:
+                     cookies: RequestsCookieJar = None, retry: bool = False) -> Response:
         cookies = cookies or self.cookies
 
-        json_payload = {
-            "dns_record": {
-                "name": name,
-                "content": content,
-                "type": record_type.value,
-                "ttl": ttl
-            },
-            "id": f"domain-{domain_name}"
-        }
-        return requests.post(self.endpoint_create_entry(), cookies=cookies, json=json_payload)
+        json_payload = create_entry_payload(domain_name=domain_name, name=name, record_type=record_type,
+                                            content=content, ttl=ttl)
+        response = self.send("POST", self.endpoint_create_entry(), cookies=cookies, json=json_payload, retry=retry,
+                             endpoint="create_entry")
+        self.invalidate_domain(domain_name)
+
+        zone = self.zones.get(domain_name, None)
+        if zone is not None and status_is(response.status_code, 200):
+            try:
+                zone.record_created(response, self.codec)
+            except (ValueError, KeyError):
+                # Without the new record's id the zone cannot be trusted anymore, it is fetched again when needed
+                self.forget_zone(domain_name)
+        return response
 
     def create_mx_entry(self, domain_name: str, mail_server: str, name: str = "@", priority: int = 0, ttl: int = 300,
-                        cookies: RequestsCookieJar = None) -> Response:
+                        cookies: RequestsCookieJar = None, retry: bool = False) -> Response:
         return self.create_entry(
             record_type=RecordType.MX,
             domain_name=domain_name, name=name, content=f'{priority} {mail_server}', ttl=ttl, cookies=cookies,
+            retry=retry,
         )
 
+    def upsert_lock(self, domain_name: str, name: str, record_type: RecordType) -> threading.Lock:
+        with self._upsert_locks_lock:
+            return self._upsert_locks.setdefault((domain_name, name, record_type), threading.Lock())
+
+    def upsert_entry(self, domain_name: str, name: str, record_type: RecordType, content: str, ttl: int,
+                     cookies: RequestsCookieJar = None, retry: bool = False) -> Optional[Response]:
+        # Find and write are serialized per name and type: two threads never both create the record. Writers in other
+        # connections or processes are not seen, upserts are not atomic on Hover's side
+        with self.upsert_lock(domain_name, name, record_type):
+            zone = self.get_zone(domain_name, cookies=cookies)
+            record = zone.find_one(name, record_type, content=content)
+            if record is None and record_type in SINGLE_VALUE_TYPES:
+                record = zone.find_one(name, record_type)
+
+            if record is None:
+                return self.create_entry(domain_name=domain_name, name=name, record_type=record_type,
+                                         content=content, ttl=ttl, cookies=cookies, retry=retry)
+            return self.update_changed_entry(record, content=content, ttl=ttl, cookies=cookies, retry=retry)
+
+    def upsert_mx_entry(self, domain_name: str, mail_server: str, name: str = "@", priority: int = 0, ttl: int = 300,
+                        cookies: RequestsCookieJar = None, retry: bool = False) -> Optional[Response]:
+        with self.upsert_lock(domain_name, name, RecordType.MX):
+            zone = self.get_zone(domain_name, cookies=cookies)
+            record = next((record for record in zone.find(name, RecordType.MX)
+                           if mx_server(record.content) == mail_server), None)
+
+            if record is None:
+                return self.create_mx_entry(domain_name=domain_name, mail_server=mail_server, name=name,
+                                            priority=priority, ttl=ttl, cookies=cookies, retry=retry)
+            return self.update_changed_entry(record, content=f'{priority} {mail_server}', ttl=ttl, cookies=cookies,
+                                             retry=retry)
+
+    def update_changed_entry(self, record: DnsRecord, content: str, ttl: int, cookies: RequestsCookieJar = None,
+                             retry: bool = False) -> Optional[Response]:
+        content = content if content != record.content else None
+        ttl = ttl if ttl != record.ttl else None
+        if content is None and ttl is None:
+            return None
+
+        return self.update_entry(domain_name=record.domain_name, dns_entry_id=record.id, name=record.name,
+                                 record_type=record.record_type, content=content, ttl=ttl, cookies=cookies,
+                                 retry=retry)
+
+    def send(self, method: str, url: str, cookies: RequestsCookieJar = None, retry: bool = None,
+             endpoint: str = None, cache_hit: bool = None, **kwargs) -> Response:
+        kwargs.setdefault("timeout", self.timeout)
+        if "json" in kwargs:
+            # Encoded once with the connection's codec, retries send the same bytes
+            kwargs["data"] = self.codec.dumps(kwargs.pop("json"))
+            kwargs["headers"] = dict(kwargs.get("headers", None) or {}, **{"Content-Type": "application/json"})
+        attempts = [1]
+
+        def attempt_once(attempt: int) -> Response:
+            attempts[0] = attempt
+            return self.send_once(method, url, cookies=cookies, **kwargs)
+
+        started_at = time.perf_counter()
+        response = error = None
+        try:
+            # Reads are always safe to replay, writes only when the caller says so (Hover accepts duplicate entries)
+            retry = method in SAFE_METHODS if retry is None else retry
+            if retry and self.retry_policy is not None:
+                response = self.retry_policy.execute(attempt_once)
+            else:
+                response = attempt_once(1)
+            return response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if self.hooks:
+                fire(self.hooks, RequestEvent(
+                    endpoint=endpoint or method.lower(), method=method, url=url,
+                    status_code=response.status_code if response is not None else None,
+                    latency=time.perf_counter() - started_at, request_bytes=request_size(response, kwargs),
+                    response_bytes=response_size(response), retries=attempts[0] - 1, cache_hit=cache_hit,
+                    error=type(error).__name__ if error is not None else None))
+
+    def send_once(self, method: str, url: str, cookies: RequestsCookieJar = None, **kwargs) -> Response:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        response = self.session.request(method, url, cookies=cookies, **kwargs)
+        if self.rate_limiter is not None:
+            self.rate_limiter.feedback(response)
+        return response
+
+    def apply_change(self, change: EntryChange, cookies: RequestsCookieJar = None, retry: bool = False) -> Response:
+        if change.is_create:
+            return self.create_entry(domain_name=change.domain_name, name=change.name,
+                                     record_type=change.record_type, content=change.content, ttl=change.ttl,
+                                     cookies=cookies, retry=retry)
+        return self.update_entry(domain_name=change.domain_name, dns_entry_id=change.dns_entry_id, name=change.name,
+                                 record_type=change.record_type, content=change.content, ttl=change.ttl,
+                                 cookies=cookies, retry=retry)
+
+    def iter_update_entries(self, changes: Iterable[Union[EntryChange, dict]], max_workers: int = 8,
+                            cookies: RequestsCookieJar = None, retry: bool = False) -> Iterator[BatchResult]:
+        changes = (as_entry_change(change) for change in changes)
+        for change, response, error in run_ordered(lambda item: self.apply_change(item, cookies=cookies, retry=retry),
+                                                   changes, max_workers=max_workers):
+            yield BatchResult(change=change, response=response, error=error)
+
+    def update_entries(self, changes: Iterable[Union[EntryChange, dict]], max_workers: int = 8,
+                       cookies: RequestsCookieJar = None, retry: bool = False) -> List[BatchResult]:
+        return list(self.iter_update_entries(changes, max_workers=max_workers, cookies=cookies, retry=retry))
+
     def endpoint_establish(self) -> str:
         endpoint = self.endpoints["establish"]
         if endpoint is None:
@@ -172,5 +499,50 @@ class Connection:
         return f'{self.endpoints["protocol"]}://{endpoint}'
 
 
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Types for which a name holds a single value: upserting a new content replaces the existing one
+SINGLE_VALUE_TYPES = (RecordType.A, RecordType.AAAA, RecordType.CNAME)
+
+
+def update_entry_payload(domain_name: str, dns_entry_id: str, name: str, record_type: RecordType, content: str = None,
+                         ttl: int = None) -> dict:
+    json_payload = {
+        "domain": {
+            "id": f"domain-{domain_name}",
+            "dns_records": [{
+                "id": dns_entry_id,
+                "name": name,
+                "type": record_type.value
+            }],
+        },
+        "fields": {
+        }
+    }
+    if content is not None and len(content) > 0:
+        json_payload["fields"]["content"] = content
+    if ttl is not None and ttl > 0:
+        json_payload["fields"]["ttl"] = ttl
+    return json_payload
+
+
+def create_entry_payload(domain_name: str, name: str, record_type: RecordType, content: str, ttl: int) -> dict:
+    return {
+        "dns_record": {
+            "name": name,
+            "content": content,
+            "type": record_type.value,
+            "ttl": ttl
+        },
+        "id": f"domain-{domain_name}"
+    }
+
+
+def mx_server(content: Optional[str]) -> Optional[str]:
+    # "<priority> <mail server>", Hover does not reject an empty or partial content
+    fields = (content or "").split()
+    return fields[-1] if fields else None
+
+
 def status_is(status_code, range_start):
     return range_start <= status_code < range_start + 100
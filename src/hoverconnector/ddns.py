@@ -0,0 +1,159 @@
+import argparse
+import logging
+import os
+import threading
+import time
+from typing import Callable, List, Optional
+
+import requests
+from requests import Response
+
+from hoverconnector.config import load_configuration
+from hoverconnector.connection import Connection, status_is
+from hoverconnector.exceptions import HoverResponseException
+from hoverconnector.files import read_json, write_json_atomically
+from hoverconnector.record_type import RecordType
+
+logger = logging.getLogger(__name__)
+
+
+class IpifySource:
+    def __init__(self, url: str = "https://api.ipify.org?format=json", timeout: float = 10) -> None:
+        super().__init__()
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def __call__(self) -> str:
+        response = self.session.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["ip"].strip()
+
+
+class DynamicDnsUpdater:
+    def __init__(self, connection: Connection, domain_name: str, name: str, ip_source: Callable[[], str] = None,
+                 record_type: RecordType = RecordType.A, ttl: int = 300, interval: float = 300,
+                 state_path: str = None) -> None:
+        super().__init__()
+        self.connection = connection
+        self.domain_name = domain_name
+        self.name = name
+        self.ip_source = ip_source or IpifySource()
+        self.record_type = record_type
+        self.ttl = ttl
+        self.interval = interval
+        self.state_path = os.path.expanduser(state_path) if state_path else None
+        self.state = read_json(self.state_path, {}) if self.state_path else {}
+        self.stop_event = threading.Event()
+
+    def poll_once(self) -> Optional[Response]:
+        try:
+            address = self.ip_source()
+        except Exception as e:
+            logger.warning("Could not retrieve the current address: %s", e)
+            return None
+
+        if address == self.state.get("address", None):
+            return None
+
+        try:
+            response = self.publish(address)
+        except HoverResponseException as e:
+            response = e.response
+        if response is not None and response.status_code == 401:
+            # The session expired during the daemon's lifetime: authenticate again (not from the session store, which
+            # holds the expired session) and publish once more
+            self.connection.log_in(refresh=True)
+            response = self.publish(address)
+
+        if response is None or status_is(response.status_code, 200):
+            record = self.connection.get_zone(self.domain_name).find_one(self.name, self.record_type, address)
+            self.save_state(address, record.id if record is not None else None)
+            logger.info("%s.%s now points to %s", self.name, self.domain_name, address)
+        else:
+            logger.warning("Could not publish %s (%s): %s", address, response.status_code, response.content)
+        return response
+
+    def publish(self, address: str) -> Optional[Response]:
+        dns_entry_id = self.state.get("dns_entry_id", None)
+        if dns_entry_id is not None and dns_entry_id in self.connection.get_zone(self.domain_name):
+            response = self.connection.update_entry(domain_name=self.domain_name, dns_entry_id=dns_entry_id,
+                                                    name=self.name, record_type=self.record_type, content=address,
+                                                    ttl=self.ttl)
+            if status_is(response.status_code, 200) or response.status_code == 401:
+                return response
+            # The record was deleted or recreated outside the daemon and the cached zone is stale: it is fetched again
+            # and the record looked up by name
+            logger.info("%s.%s (%s) could not be updated (%s), looking it up again", self.name, self.domain_name,
+                        dns_entry_id, response.status_code)
+            self.connection.forget_zone(self.domain_name)
+            self.state.pop("dns_entry_id", None)
+        return self.connection.upsert_entry(domain_name=self.domain_name, name=self.name,
+                                            record_type=self.record_type, content=address, ttl=self.ttl)
+
+    def save_state(self, address: str, dns_entry_id: str) -> None:
+        self.state = dict(address=address, dns_entry_id=dns_entry_id, published_at=time.time())
+        if self.state_path:
+            write_json_atomically(self.state_path, self.state)
+
+    def run(self) -> None:
+        self.connection.log_in()
+        while not self.stop_event.is_set():
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("Could not update %s.%s", self.name, self.domain_name)
+            self.stop_event.wait(self.interval)
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Keep a Hover DNS record pointing to the current address")
+    parser.add_argument("--config", required=True, help="configuration file (see config.example.yml)")
+    parser.add_argument("--domain", help="domain name, e.g. my-domain-name.local")
+    parser.add_argument("--name", help="record name, e.g. home")
+    parser.add_argument("--type", choices=[RecordType.A.value, RecordType.AAAA.value], help="record type")
+    parser.add_argument("--ttl", type=int)
+    parser.add_argument("--interval", type=float, help="seconds between two address checks")
+    parser.add_argument("--state", help="file keeping the last published address")
+    parser.add_argument("--ip-source", help="URL answering with {\"ip\": \"...\"}")
+    parser.add_argument("--once", action="store_true", help="check and publish once, then exit")
+    arguments = parser.parse_args(argv)
+
+    configuration = load_configuration(arguments.config)
+    ddns_config = configuration.get("ddns", {})
+
+    def setting(name: str, default=None):
+        value = getattr(arguments, name)
+        return value if value is not None else ddns_config.get(name, default)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    ip_source_url = setting("ip_source")
+    updater = DynamicDnsUpdater(
+        connection=Connection(configuration),
+        domain_name=setting("domain"),
+        name=setting("name"),
+        ip_source=IpifySource(ip_source_url) if ip_source_url else IpifySource(),
+        record_type=RecordType(setting("type", RecordType.A.value)),
+        ttl=setting("ttl", 300),
+        interval=setting("interval", 300),
+        state_path=setting("state")
+    )
+    if updater.domain_name is None or updater.name is None:
+        parser.error("the domain and the record name are required (arguments or 'ddns' configuration)")
+
+    if arguments.once:
+        updater.connection.log_in()
+        updater.poll_once()
+        return
+
+    try:
+        updater.run()
+    except KeyboardInterrupt:
+        updater.stop()
+
+
+if __name__ == "__main__":
+    main()
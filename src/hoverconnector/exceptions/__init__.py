@@ -1,4 +1,7 @@
-from requests import Response
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from requests import Response
 
 
 class ConnectionConfigurationException(Exception):
@@ -7,5 +10,17 @@ class ConnectionConfigurationException(Exception):
 
 
 class HoverLoginException(Exception):
-    def __init__(self, response: Response) -> None:
+    def __init__(self, response: "Response") -> None:
         super().__init__(response.content.decode(response.encoding), response.status_code)
+
+
+class HoverResponseException(Exception):
+    def __init__(self, response: "Response") -> None:
+        super().__init__(response.content.decode(response.encoding or "utf-8"), response.status_code)
+        self.response = response
+
+
+class UnknownDomainException(Exception):
+    def __init__(self, domain_name: str) -> None:
+        super().__init__(f"No account owns the domain {domain_name}")
+        self.domain_name = domain_name
@@ -0,0 +1,128 @@
+import csv
+import json
+from typing import IO, Iterable, Iterator, List, NamedTuple
+
+from hoverconnector.batch import run_ordered
+from hoverconnector.connection import Connection, status_is
+from hoverconnector.exceptions import HoverResponseException
+from hoverconnector.files import open_text
+from hoverconnector.models import DnsRecord, parse_domains, parse_records
+from hoverconnector.record_type import RecordType
+
+# Types holding a host name in their content, written with a trailing dot to stay absolute in BIND files
+HOSTNAME_TYPES = (RecordType.CNAME, RecordType.NS, RecordType.MX, RecordType.SRV)
+
+
+class ExportStats(NamedTuple):
+    domains: int
+    records: int
+
+
+class RecordSink:
+    def __init__(self, stream: IO[str]) -> None:
+        super().__init__()
+        self.stream = stream
+
+    def start_domain(self, domain_name: str) -> None:
+        pass
+
+    def write(self, record: DnsRecord) -> None:
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        self.stream.close()
+
+    def __enter__(self) -> "RecordSink":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class JsonlSink(RecordSink):
+    def write(self, record: DnsRecord) -> None:
+        self.stream.write(json.dumps(dict(domain=record.domain_name, id=record.id, name=record.name,
+                                          type=record.record_type.value, content=record.content, ttl=record.ttl)))
+        self.stream.write("\n")
+
+
+class CsvSink(RecordSink):
+    def __init__(self, stream: IO[str]) -> None:
+        super().__init__(stream)
+        self.writer = csv.writer(stream)
+        self.writer.writerow(["domain", "id", "name", "type", "content", "ttl"])
+
+    def write(self, record: DnsRecord) -> None:
+        self.writer.writerow([record.domain_name, record.id, record.name, record.record_type.value, record.content,
+                              record.ttl])
+
+
+class BindSink(RecordSink):
+    def start_domain(self, domain_name: str) -> None:
+        self.stream.write(f"$ORIGIN {domain_name}.\n")
+
+    def write(self, record: DnsRecord) -> None:
+        self.stream.write(f"{record.name}\t{record.ttl}\tIN\t{record.record_type.value}\t{bind_content(record)}\n")
+
+
+SINKS = dict(bind=BindSink, jsonl=JsonlSink, csv=CsvSink)
+
+
+def character_strings(content: str, limit: int = 255) -> Iterator[str]:
+    # Character strings are limited to 255 bytes: longer values (e.g. DKIM keys) are split, between characters
+    chunk, size = [], 0
+    for character in content:
+        length = len(character.encode("utf-8"))
+        if size + length > limit:
+            yield "".join(chunk)
+            chunk, size = [], 0
+        chunk.append(character)
+        size += length
+    yield "".join(chunk)
+
+
+def bind_content(record: DnsRecord) -> str:
+    if record.record_type == RecordType.TXT:
+        # Split before escaping, the escapes are not part of the value
+        return " ".join('"{}"'.format(chunk.replace("\\", "\\\\").replace('"', '\\"'))
+                        for chunk in character_strings(record.content))
+    if record.record_type in HOSTNAME_TYPES and not record.content.endswith("."):
+        return f"{record.content}."
+    return record.content
+
+
+def open_sink(path: str, file_format: str = None, compress: bool = False) -> RecordSink:
+    if compress and not path.endswith(".gz"):
+        path = f"{path}.gz"
+    if file_format is None:
+        name = path[:-3] if path.endswith(".gz") else path
+        file_format = next((candidate for candidate in SINKS if name.endswith(f".{candidate}")), "bind")
+    return SINKS[file_format](open_text(path, "w"))
+
+
+def list_domain_names(connection: Connection) -> List[str]:
+    response = connection.list_domains()
+    if not status_is(response.status_code, 200):
+        raise HoverResponseException(response=response)
+    return [domain.name for domain in parse_domains(response, connection.codec)]
+
+
+def export_zones(connection: Connection, sink: RecordSink, domain_names: Iterable[str] = None,
+                 max_workers: int = 4) -> ExportStats:
+    if domain_names is None:
+        domain_names = list_domain_names(connection)
+
+    domains = records = 0
+    # Zones are fetched concurrently but written, then released, one at a time and in order
+    for domain_name, response, error in run_ordered(connection.get_domain, domain_names, max_workers=max_workers):
+        if error is not None:
+            raise error
+        if not status_is(response.status_code, 200):
+            raise HoverResponseException(response=response)
+
+        sink.start_domain(domain_name)
+        for record in parse_records(response, connection.codec):
+            sink.write(record)
+            records += 1
+        domains += 1
+    return ExportStats(domains=domains, records=records)
@@ -0,0 +1,37 @@
+import gzip
+import json
+import os
+import tempfile
+from typing import IO
+
+
+def write_json_atomically(path: str, data, mode: int = 0o600) -> None:
+    # Written next to the target then renamed over it: readers only ever see a complete file
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=".hoverconnector-", suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temporary_path, mode)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def read_json(path: str, default=None):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return default
+
+
+def open_text(path: str, mode: str = "r") -> IO[str]:
+    path = os.path.expanduser(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, f"{mode}t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
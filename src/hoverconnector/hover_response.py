@@ -1,12 +1,31 @@
-from requests import Response
-from requests.cookies import RequestsCookieJar
+from typing import TYPE_CHECKING
+
+from hoverconnector.codec import JsonCodec, default_codec
+
+if TYPE_CHECKING:
+    from requests import Response
+    from requests.cookies import RequestsCookieJar
+
+NOT_DECODED = object()
 
 
 class HoverResponse:
-    def __init__(self, response: Response, cookies: RequestsCookieJar = None) -> None:
+    def __init__(self, response: "Response" = None, cookies: "RequestsCookieJar" = None,
+                 codec: JsonCodec = None) -> None:
         super().__init__()
-        self.status_code = response.status_code
-        self.cookies = cookies or response.cookies
-        self.content = response.json() \
-            if "json" in response.headers.get("Content-Type", "").lower() \
-            else response.content
+        # Without a response, the session was restored from a session store and no call was made
+        self.response = response
+        self.status_code = response.status_code if response is not None else None
+        self.cookies = cookies if response is None else cookies or response.cookies
+        self.codec = codec or default_codec
+        self._content = NOT_DECODED
+
+    @property
+    def content(self):
+        # Most callers only check the status or the cookies: the body is decoded on first access only
+        if self._content is NOT_DECODED:
+            response = self.response
+            self._content = None if response is None else self.codec.loads(response.content) \
+                if "json" in response.headers.get("Content-Type", "").lower() and response.content \
+                else response.content
+        return self._content
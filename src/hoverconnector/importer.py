@@ -0,0 +1,104 @@
+import copy
+import itertools
+import time
+from collections import Counter
+from typing import Callable, Iterable, Iterator, Mapping, Set, Tuple
+
+from hoverconnector.batch import EntryChange, BatchResult
+from hoverconnector.connection import Connection, SINGLE_VALUE_TYPES
+from hoverconnector.reconciler import RecordSpec
+from hoverconnector.record_type import RecordType
+from hoverconnector.zone import Zone
+
+
+class ImportStats:
+    def __init__(self) -> None:
+        super().__init__()
+        self.started_at = time.monotonic()
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.failed = 0
+
+    @property
+    def processed(self) -> int:
+        return self.created + self.updated + self.unchanged + self.failed
+
+    @property
+    def throughput(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def count(self, result: BatchResult) -> None:
+        if not result.ok:
+            self.failed += 1
+        elif result.change.is_create:
+            self.created += 1
+        else:
+            self.updated += 1
+
+    def __str__(self) -> str:
+        return f"{self.processed} records ({self.created} created, {self.updated} updated, " \
+               f"{self.unchanged} unchanged, {self.failed} failed) - {self.throughput:.1f} records/s"
+
+
+RecordSetKey = Tuple[str, RecordType]
+
+
+def record_set_sizes(specs: Iterable[RecordSpec]) -> Counter:
+    # A first pass over the file which only keeps the (name, type) keys, never the records
+    return Counter((spec.name, spec.record_type) for spec in specs)
+
+
+def with_set_sizes(specs: Iterable[RecordSpec],
+                   set_sizes: Mapping[RecordSetKey, int] = None) -> Iterator[Tuple[RecordSpec, int]]:
+    if set_sizes is not None:
+        for spec in specs:
+            yield spec, set_sizes[(spec.name, spec.record_type)]
+        return
+    # Without a first pass, only the consecutive records of a name and type (as zone files list them) are held at once
+    for _, group in itertools.groupby(specs, key=lambda item: (item.name, item.record_type)):
+        group = list(group)
+        for spec in group:
+            yield spec, len(group)
+
+
+def plan_changes(zone: Zone, specs: Iterable[RecordSpec], stats: ImportStats,
+                 set_sizes: Mapping[RecordSetKey, int] = None) -> Iterator[EntryChange]:
+    # Planned against a copy of the zone as fetched: records created by the workers meanwhile are never matched
+    zone = Zone(zone.domain_name, [copy.copy(record) for record in zone])
+
+    # Existing records are claimed once: two records of the same name in the file never target the same entry
+    claimed: Set[str] = set()
+    for spec, set_size in with_set_sizes(specs, set_sizes):
+        record = next((record for record in zone.find(spec.name, spec.record_type)
+                       if record.content == spec.content and record.id not in claimed), None)
+        # Only a single value may replace the existing one: a record set in the file (round-robin A) is created
+        if record is None and spec.record_type in SINGLE_VALUE_TYPES and set_size == 1:
+            record = next((record for record in zone.find(spec.name, spec.record_type)
+                           if record.id not in claimed), None)
+
+        if record is None:
+            yield EntryChange(zone.domain_name, spec.name, spec.record_type, spec.content, spec.ttl)
+            continue
+
+        claimed.add(record.id)
+        if record.content == spec.content and record.ttl == spec.ttl:
+            stats.unchanged += 1
+            continue
+        yield EntryChange(zone.domain_name, spec.name, spec.record_type,
+                          content=spec.content if record.content != spec.content else None,
+                          ttl=spec.ttl if record.ttl != spec.ttl else None, dns_entry_id=record.id)
+
+
+def import_records(connection: Connection, domain_name: str, specs: Iterable[RecordSpec], max_workers: int = 8,
+                   on_result: Callable[[BatchResult, ImportStats], None] = None,
+                   set_sizes: Mapping[RecordSetKey, int] = None) -> ImportStats:
+    stats = ImportStats()
+    zone = connection.get_zone(domain_name, refresh=True)
+    for result in connection.iter_update_entries(plan_changes(zone, specs, stats, set_sizes=set_sizes),
+                                                 max_workers=max_workers):
+        stats.count(result)
+        if on_result is not None:
+            on_result(result, stats)
+    return stats
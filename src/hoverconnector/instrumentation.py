@@ -0,0 +1,170 @@
+import json
+import logging
+import threading
+from collections import Counter, defaultdict, deque
+from typing import Callable, Dict, List, NamedTuple, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from requests import Response
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestEvent(NamedTuple):
+    endpoint: str
+    method: str
+    url: str
+    status_code: Optional[int]
+    latency: float
+    request_bytes: int = 0
+    response_bytes: int = 0
+    retries: int = 0
+    # None when the connection has no cache, True when the response was served from it without calling Hover
+    cache_hit: Optional[bool] = None
+    error: Optional[str] = None
+    # True when the call joined an identical read already in flight and shared its response
+    coalesced: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status_code is not None and 200 <= self.status_code < 300
+
+
+Hook = Callable[[RequestEvent], None]
+
+
+def request_size(response: Optional["Response"], kwargs: dict) -> int:
+    request = getattr(response, "request", None)
+    body = getattr(request, "body", None)
+    if body is None:
+        body = kwargs.get("data", None)
+    return len(body) if isinstance(body, (bytes, str)) else 0
+
+
+def response_size(response: Optional["Response"]) -> int:
+    if response is None:
+        return 0
+    length = response.headers.get("Content-Length", None)
+    return int(length) if length and length.isdigit() else len(response.content or b"")
+
+
+def fire(hooks: List[Hook], event: RequestEvent) -> None:
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception:
+            # Instrumentation never breaks the call being measured
+            logger.exception("Request hook %r failed", hook)
+
+
+class EndpointMetrics:
+    def __init__(self, window: int) -> None:
+        super().__init__()
+        self.statuses = Counter()
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.calls = 0
+        self.errors = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.coalesced = 0
+        self.recent = deque(maxlen=window)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class MetricsAggregator:
+    def __init__(self, prefix: str = "hoverconnector", window: int = 1024) -> None:
+        super().__init__()
+        self.prefix = prefix
+        self.window = window
+        self.endpoints: Dict[str, EndpointMetrics] = defaultdict(lambda: EndpointMetrics(self.window))
+        self.lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        with self.lock:
+            metrics = self.endpoints[event.endpoint]
+            if event.cache_hit:
+                # Served from the cache: Hover was not called, the latency would skew metrics
+                metrics.cache_hits += 1
+                return
+            if event.coalesced:
+                # Shared the response of a read in flight, whose own event already counted the call
+                metrics.coalesced += 1
+                return
+            if event.cache_hit is False:
+                metrics.cache_misses += 1
+
+            metrics.calls += 1
+            metrics.statuses[str(event.status_code) if event.error is None else "error"] += 1
+            if not event.ok:
+                metrics.errors += 1
+            metrics.latency_sum += event.latency
+            metrics.recent.append(event.latency)
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if event.latency <= bound:
+                    metrics.buckets[index] += 1
+            metrics.request_bytes += event.request_bytes
+            metrics.response_bytes += event.response_bytes
+            metrics.retries += event.retries
+
+    def reset(self) -> None:
+        with self.lock:
+            self.endpoints.clear()
+
+    def summary(self) -> Dict[str, dict]:
+        with self.lock:
+            return {endpoint: dict(
+                calls=metrics.calls, errors=metrics.errors, statuses=dict(metrics.statuses),
+                latency=dict(mean=metrics.latency_sum / metrics.calls if metrics.calls else None,
+                             p50=metrics.percentile(0.5), p95=metrics.percentile(0.95), p99=metrics.percentile(0.99)),
+                request_bytes=metrics.request_bytes, response_bytes=metrics.response_bytes, retries=metrics.retries,
+                cache=dict(hits=metrics.cache_hits, misses=metrics.cache_misses), coalesced=metrics.coalesced
+            ) for endpoint, metrics in sorted(self.endpoints.items())}
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.summary(), **kwargs)
+
+    def to_prometheus(self) -> str:
+        # Samples of a metric family must be contiguous, they are grouped before being written
+        families = {name: (kind, []) for name, kind in (
+            ("requests_total", "counter"), ("request_duration_seconds", "histogram"),
+            ("request_bytes_total", "counter"), ("response_bytes_total", "counter"), ("retries_total", "counter"),
+            ("cache_lookups_total", "counter"), ("coalesced_requests_total", "counter"))}
+
+        def sample(family: str, labels: str, value, suffix: str = "") -> None:
+            families[family][1].append(f"{self.prefix}_{family}{suffix}{{{labels}}} {value}")
+
+        with self.lock:
+            for endpoint, metrics in sorted(self.endpoints.items()):
+                label = f'endpoint="{endpoint}"'
+                for status, count in sorted(metrics.statuses.items()):
+                    sample("requests_total", f'{label},status="{status}"', count)
+                for bound, count in zip(LATENCY_BUCKETS, metrics.buckets):
+                    sample("request_duration_seconds", f'{label},le="{bound}"', count, "_bucket")
+                sample("request_duration_seconds", f'{label},le="+Inf"', metrics.calls, "_bucket")
+                sample("request_duration_seconds", label, f"{metrics.latency_sum:.6f}", "_sum")
+                sample("request_duration_seconds", label, metrics.calls, "_count")
+                sample("request_bytes_total", label, metrics.request_bytes)
+                sample("response_bytes_total", label, metrics.response_bytes)
+                sample("retries_total", label, metrics.retries)
+                if metrics.cache_hits or metrics.cache_misses:
+                    sample("cache_lookups_total", f'{label},result="hit"', metrics.cache_hits)
+                    sample("cache_lookups_total", f'{label},result="miss"', metrics.cache_misses)
+                if metrics.coalesced:
+                    sample("coalesced_requests_total", label, metrics.coalesced)
+
+        lines = []
+        for name, (kind, samples) in families.items():
+            lines.append(f"# TYPE {self.prefix}_{name} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union, TYPE_CHECKING
+
+from hoverconnector.batch import BatchResult, EntryChange, as_entry_change, run_ordered
+from hoverconnector.connection import Connection, create_entry_payload, status_is, update_entry_payload
+from hoverconnector.codec import JsonCodec
+from hoverconnector.models import payload_of
+
+if TYPE_CHECKING:
+    from requests import Response
+
+BATCH = "batch"
+FINISHED = "finished"
+PLANNED = "planned"
+DONE = "done"
+FAILED = "failed"
+
+
+def change_payload(change: EntryChange) -> dict:
+    return dict(change._asdict(), record_type=change.record_type.value)
+
+
+def request_payload(change: EntryChange) -> dict:
+    if change.is_create:
+        return create_entry_payload(domain_name=change.domain_name, name=change.name, record_type=change.record_type,
+                                    content=change.content, ttl=change.ttl)
+    return update_entry_payload(domain_name=change.domain_name, dns_entry_id=change.dns_entry_id, name=change.name,
+                                record_type=change.record_type, content=change.content, ttl=change.ttl)
+
+
+def change_key(batch: str, position: int, change: EntryChange) -> str:
+    # A restarted batch plans the same changes in the same order and finds them in the journal; the same change
+    # planned again later (another batch, or another position) is a new write
+    encoded = json.dumps(dict(batch=batch, position=position, change=change_payload(change)), sort_keys=True,
+                         separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+def created_id(response: "Response", codec: JsonCodec = None) -> Optional[str]:
+    try:
+        return payload_of(response, codec)["dns_record"]["id"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class WriteJournal:
+    def __init__(self, path: str, fsync: bool = True) -> None:
+        super().__init__()
+        self.path = os.path.expanduser(path)
+        self.fsync = fsync
+        # Key of every completed write, with the id of the record it wrote
+        self.completed: Dict[str, Optional[str]] = {}
+        self.planned: Set[str] = set()
+        self.batches: List[str] = []
+        self.finished: Set[str] = set()
+        self._lock = threading.Lock()
+        self._file = None
+        self.load()
+
+    def load(self) -> None:
+        self.completed.clear()
+        self.planned.clear()
+        self.batches.clear()
+        self.finished.clear()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # The last line is cut short when the process died while writing it
+                continue
+            state = entry.get("state", None)
+            if state == PLANNED:
+                self.planned.add(entry["key"])
+            elif state == DONE:
+                self.completed[entry["key"]] = entry.get("id", None)
+            elif state == BATCH:
+                self.batches.append(entry["batch"])
+            elif state == FINISHED:
+                self.finished.add(entry["batch"])
+
+    @property
+    def unfinished_batch(self) -> Optional[str]:
+        # The last batch stopped before all its changes were applied, e.g. when the process died
+        if self.batches and self.batches[-1] not in self.finished:
+            return self.batches[-1]
+        return None
+
+    @property
+    def in_doubt(self) -> Set[str]:
+        # Sent (or about to be) when the previous run stopped: nothing tells whether Hover applied them
+        return self.planned - set(self.completed)
+
+    def append(self, entry: dict) -> None:
+        line = json.dumps(dict(entry, at=time.time()), separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def start_batch(self, batch: str = None) -> str:
+        batch = batch or uuid.uuid4().hex
+        if batch not in self.batches:
+            self.append(dict(state=BATCH, batch=batch))
+            self.batches.append(batch)
+        return batch
+
+    def finish_batch(self, batch: str) -> None:
+        self.append(dict(state=FINISHED, batch=batch))
+        self.finished.add(batch)
+
+    def record_planned(self, key: str, change: EntryChange) -> None:
+        # The request sent to Hover, and the change it was built from
+        self.append(dict(state=PLANNED, key=key, change=change_payload(change), request=request_payload(change)))
+        with self._lock:
+            self.planned.add(key)
+
+    def record_done(self, key: str, record_id: Optional[str], status_code: int = None) -> None:
+        self.append(dict(state=DONE, key=key, id=record_id, status=status_code))
+        with self._lock:
+            self.completed[key] = record_id
+
+    def record_failed(self, key: str, status_code: int = None, error: str = None) -> None:
+        self.append(dict(state=FAILED, key=key, status=status_code, error=error))
+
+    def find_applied(self, connection: Connection, change: EntryChange) -> Optional[str]:
+        # Updates are safe to send again; a creation in doubt is looked up so that it is not made twice
+        if not change.is_create:
+            return None
+        zone = connection.get_zone(change.domain_name, refresh=True)
+        record = zone.find_one(change.name, change.record_type, content=change.content)
+        return record.id if record is not None else None
+
+    def apply_one(self, connection: Connection, change: EntryChange, key: str, resume: bool,
+                  retry: bool) -> Optional["Response"]:
+        if resume and key in self.planned and key not in self.completed:
+            record_id = self.find_applied(connection, change)
+            if record_id is not None:
+                self.record_done(key, record_id)
+                return None
+
+        self.record_planned(key, change)
+        try:
+            response = connection.apply_change(change, retry=retry)
+        except Exception as e:
+            self.record_failed(key, error=type(e).__name__)
+            raise
+
+        if status_is(response.status_code, 200):
+            self.record_done(key, created_id(response, connection.codec) if change.is_create else change.dns_entry_id,
+                             response.status_code)
+        else:
+            self.record_failed(key, status_code=response.status_code)
+        return response
+
+    def apply(self, connection: Connection, changes: Iterable[Union[EntryChange, dict]], batch: str = None,
+              max_workers: int = 8, resume: bool = True, retry: bool = False) -> Iterator[BatchResult]:
+        # Without a batch id, a batch the previous run did not finish is resumed, otherwise a new one starts
+        batch = self.start_batch(batch or (self.unfinished_batch if resume else None))
+        keyed = ((change, change_key(batch, position, change))
+                 for position, change in enumerate(as_entry_change(change) for change in changes))
+
+        def run(item) -> Optional["Response"]:
+            change, key = item
+            if resume and key in self.completed:
+                return None
+            return self.apply_one(connection, change, key, resume=resume, retry=retry)
+
+        failed = False
+        for (change, key), response, error in run_ordered(run, keyed, max_workers=max_workers):
+            result = BatchResult(change=change, response=response, error=error,
+                                 skipped=error is None and response is None)
+            failed = failed or not result.ok
+            yield result
+        # A batch with failed writes stays open: running it again retries them and skips the others
+        if not failed:
+            self.finish_batch(batch)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "WriteJournal":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,130 @@
+import fnmatch
+import sys
+from typing import Callable, Dict, List, Optional, Pattern, TYPE_CHECKING, Tuple, Union
+
+from hoverconnector.codec import JsonCodec, default_codec
+from hoverconnector.record_type import RecordType
+
+if TYPE_CHECKING:
+    from requests import Response
+
+
+class DnsRecord:
+    __slots__ = ("id", "domain_name", "name", "record_type", "content", "ttl", "is_default", "can_revert")
+
+    def __init__(self, id: str, domain_name: str, name: str, record_type: RecordType, content: str, ttl: int,
+                 is_default: bool = False, can_revert: bool = False) -> None:
+        self.id = id
+        self.domain_name = domain_name
+        self.name = name
+        self.record_type = record_type
+        self.content = content
+        self.ttl = ttl
+        self.is_default = is_default
+        self.can_revert = can_revert
+
+    @property
+    def key(self) -> Tuple[str, RecordType]:
+        return self.name, self.record_type
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, DnsRecord) and all(getattr(self, slot) == getattr(other, slot)
+                                                    for slot in self.__slots__)
+
+    def __hash__(self) -> int:
+        return hash((self.id, self.domain_name))
+
+    def __repr__(self) -> str:
+        return f"DnsRecord({self.id}: {self.name}.{self.domain_name} {self.ttl} {self.record_type.value} " \
+               f"{self.content})"
+
+
+class Domain:
+    __slots__ = ("id", "name", "status", "expiry_date", "registration_date", "autorenew", "locked", "nameservers")
+
+    def __init__(self, id: str, name: str, status: str = None, expiry_date: str = None,
+                 registration_date: str = None, autorenew: bool = False, locked: bool = False,
+                 nameservers: Tuple[str, ...] = ()) -> None:
+        self.id = id
+        self.name = name
+        self.status = status
+        self.expiry_date = expiry_date
+        self.registration_date = registration_date
+        self.autorenew = autorenew
+        self.locked = locked
+        self.nameservers = nameservers
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Domain) and all(getattr(self, slot) == getattr(other, slot)
+                                                 for slot in self.__slots__)
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f"Domain({self.name}, {self.status}, expires {self.expiry_date})"
+
+
+def intern(value: str) -> str:
+    return sys.intern(value) if value is not None else None
+
+
+def name_matcher(pattern: Union[str, Pattern, None]) -> Optional[Callable[[str], bool]]:
+    # Strings are shell-style patterns ("_dmarc*", "mail?"), compiled regular expressions are searched
+    if pattern is None:
+        return None
+    if isinstance(pattern, str):
+        return lambda name: fnmatch.fnmatchcase(name, pattern)
+    return lambda name: pattern.search(name) is not None
+
+
+def payload_of(response: Union["Response", dict], codec: JsonCodec = None) -> dict:
+    if isinstance(response, dict):
+        return response
+    # Responses shared by the read cache or by coalesced reads are only decoded once; payloads are never modified
+    payload = getattr(response, "hover_payload", None)
+    if payload is None:
+        payload = response.hover_payload = (codec or default_codec).loads(response.content)
+    return payload
+
+
+def parse_domain(item: dict, nameservers_cache: Dict[Tuple[str, ...], Tuple[str, ...]] = None) -> Domain:
+    # Most accounts use the same couple of nameserver sets: every domain points to a single shared tuple
+    nameservers = tuple(intern(nameserver) for nameserver in item.get("nameservers", None) or ())
+    if nameservers_cache is not None:
+        nameservers = nameservers_cache.setdefault(nameservers, nameservers)
+
+    return Domain(
+        id=item["id"],
+        name=intern(item["name"]),
+        status=intern(item.get("status", None)),
+        expiry_date=intern(item.get("expiry_date", None)),
+        registration_date=intern(item.get("registration_date", None)),
+        autorenew=item.get("autorenew", None) == "on",
+        locked=item.get("locked", None) == "on",
+        nameservers=nameservers
+    )
+
+
+def parse_domains(response: Union["Response", dict], codec: JsonCodec = None) -> List[Domain]:
+    nameservers_cache = {}
+    return [parse_domain(item, nameservers_cache) for item in payload_of(response, codec).get("domains", [])]
+
+
+def parse_record(item: dict, domain_name: str) -> DnsRecord:
+    return DnsRecord(
+        id=item["id"],
+        domain_name=domain_name,
+        name=intern(item["name"]),
+        record_type=RecordType(item["type"]),
+        content=item["content"],
+        ttl=item.get("ttl", None),
+        is_default=item.get("is_default", False),
+        can_revert=item.get("can_revert", False)
+    )
+
+
+def parse_records(response: Union["Response", dict], codec: JsonCodec = None) -> List[DnsRecord]:
+    domain = payload_of(response, codec)["domain"]
+    domain_name = intern(domain["name"])
+    return [parse_record(item, domain_name) for item in domain.get("dns", [])]
@@ -0,0 +1,104 @@
+import threading
+import time
+from typing import Callable, Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from requests import Response
+
+THROTTLING_STATUS_CODES = (429, 502, 503, 504)
+
+
+class AdaptiveRateLimiter:
+    def __init__(self, rate: float = 5.0, burst: int = 10, min_rate: float = 0.5, max_rate: float = None,
+                 backoff_factor: float = 0.5, ramp_up_factor: float = 1.2, ramp_up_after: int = 20,
+                 throttling_status_codes: Iterable[int] = THROTTLING_STATUS_CODES,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep) -> None:
+        super().__init__()
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate
+        self.burst = burst
+        self.backoff_factor = backoff_factor
+        self.ramp_up_factor = ramp_up_factor
+        self.ramp_up_after = ramp_up_after
+        self.throttling_status_codes = frozenset(throttling_status_codes)
+        self.clock = clock
+        self.sleep = sleep
+
+        self._rate = min(rate, self.max_rate)
+        self._tokens = float(burst)
+        self._last_refill = clock()
+        self._blocked_until = 0.0
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_configuration(cls, configuration: dict) -> "AdaptiveRateLimiter":
+        settings = {key: value for key, value in configuration.items() if key != "enabled"}
+        return cls(**settings)
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def acquire(self) -> float:
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+            wait = max(wait, self._blocked_until - now)
+
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def feedback(self, response: "Response") -> None:
+        with self._lock:
+            if response.status_code in self.throttling_status_codes:
+                self._refill(self.clock())
+                self._successes = 0
+                self._rate = max(self.min_rate, self._rate * self.backoff_factor)
+                retry_after = parse_retry_after(response)
+                if retry_after:
+                    self._blocked_until = max(self._blocked_until, self.clock() + retry_after)
+                return
+
+            self._successes += 1
+            if self._successes >= self.ramp_up_after and self._rate < self.max_rate:
+                self._refill(self.clock())
+                self._successes = 0
+                self._rate = min(self.max_rate, self._rate * self.ramp_up_factor)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+
+
+def shared_slot(index: int) -> property:
+    return property(lambda self: self._state[index], lambda self, value: self._state.__setitem__(index, value))
+
+
+class SharedRateLimiter(AdaptiveRateLimiter):
+    # The bucket lives in shared memory: processes created with it (e.g. pool workers) draw from a single budget
+    _rate = shared_slot(0)
+    _tokens = shared_slot(1)
+    _last_refill = shared_slot(2)
+    _blocked_until = shared_slot(3)
+    _successes = shared_slot(4)
+
+    def __init__(self, rate: float = 5.0, burst: int = 10, context=None, **kwargs) -> None:
+        if context is None:
+            import multiprocessing
+            context = multiprocessing.get_context()
+        # Guarded by the limiter's own lock, the array does not need another one
+        self._state = context.Array("d", 5, lock=False)
+        super().__init__(rate=rate, burst=burst, **kwargs)
+        self._lock = context.Lock()
+
+
+def parse_retry_after(response: "Response") -> float:
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", 0)))
+    except ValueError:
+        # HTTP-date values are not worth the parsing: the reduced rate already spaces the next calls
+        return 0.0
@@ -0,0 +1,117 @@
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from requests import Response
+
+from hoverconnector.connection import Connection
+from hoverconnector.models import DnsRecord
+from hoverconnector.record_type import RecordType
+
+
+class RecordSpec(NamedTuple):
+    name: str
+    record_type: RecordType
+    content: str
+    ttl: int = 900
+
+
+class RecordUpdate(NamedTuple):
+    dns_entry_id: str
+    name: str
+    record_type: RecordType
+    content: str = None
+    ttl: int = None
+
+
+class Plan:
+    def __init__(self, domain_name: str) -> None:
+        super().__init__()
+        self.domain_name = domain_name
+        self.creates: List[RecordSpec] = []
+        self.updates: List[RecordUpdate] = []
+        self.removals: List[DnsRecord] = []
+        self.unchanged: List[DnsRecord] = []
+
+    def is_empty(self) -> bool:
+        return not self.creates and not self.updates
+
+    def call_count(self) -> int:
+        return len(self.creates) + len(self.updates)
+
+    def __repr__(self) -> str:
+        return f"Plan({self.domain_name}: {len(self.creates)} to create, {len(self.updates)} to update, " \
+               f"{len(self.removals)} unwanted, {len(self.unchanged)} unchanged)"
+
+
+class ZoneReconciler:
+    def __init__(self, connection: Connection) -> None:
+        super().__init__()
+        self.connection = connection
+
+    def plan(self, domain_name: str, desired: Iterable[RecordSpec]) -> Plan:
+        zone = self.connection.get_zone(domain_name, refresh=True)
+        return compute_plan(domain_name, zone, desired)
+
+    def apply(self, plan: Plan) -> List[Response]:
+        responses = []
+        for update in plan.updates:
+            responses.append(self.connection.update_entry(
+                domain_name=plan.domain_name, dns_entry_id=update.dns_entry_id, name=update.name,
+                record_type=update.record_type, content=update.content, ttl=update.ttl
+            ))
+        for spec in plan.creates:
+            responses.append(self.connection.create_entry(
+                domain_name=plan.domain_name, name=spec.name, record_type=spec.record_type, content=spec.content,
+                ttl=spec.ttl
+            ))
+        return responses
+
+    def reconcile(self, desired_zones: Dict[str, Iterable[RecordSpec]]) -> Dict[str, Plan]:
+        plans = {}
+        for domain_name, desired in desired_zones.items():
+            plans[domain_name] = plan = self.plan(domain_name, desired)
+            self.apply(plan)
+        return plans
+
+
+def compute_plan(domain_name: str, existing: Iterable[DnsRecord], desired: Iterable[RecordSpec]) -> Plan:
+    plan = Plan(domain_name)
+
+    existing_by_key: Dict[Tuple[str, RecordType], List[DnsRecord]] = {}
+    for record in existing:
+        existing_by_key.setdefault(record.key, []).append(record)
+
+    desired_by_key: Dict[Tuple[str, RecordType], List[RecordSpec]] = {}
+    for spec in desired:
+        desired_by_key.setdefault((spec.name, spec.record_type), []).append(spec)
+
+    for key, specs in desired_by_key.items():
+        candidates = list(existing_by_key.pop(key, []))
+
+        # Records which already hold the wanted content only ever need their TTL fixed
+        unmatched = []
+        for spec in specs:
+            match = next((record for record in candidates if record.content == spec.content), None)
+            if match is None:
+                unmatched.append(spec)
+                continue
+            candidates.remove(match)
+            if match.ttl != spec.ttl:
+                plan.updates.append(RecordUpdate(match.id, spec.name, spec.record_type, ttl=spec.ttl))
+            else:
+                plan.unchanged.append(match)
+
+        # Unwanted records of the same name and type are rewritten in place: one call instead of a create and a delete
+        for spec in unmatched:
+            if not candidates:
+                plan.creates.append(spec)
+                continue
+            record = candidates.pop(0)
+            plan.updates.append(RecordUpdate(record.id, spec.name, spec.record_type, content=spec.content,
+                                             ttl=spec.ttl if record.ttl != spec.ttl else None))
+
+        plan.removals.extend(candidates)
+
+    for records in existing_by_key.values():
+        plan.removals.extend(records)
+
+    return plan
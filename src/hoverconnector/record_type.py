@@ -6,3 +6,7 @@ class RecordType(Enum):
     MX = "MX"
     CNAME = "CNAME"
     TXT = "TXT"
+    AAAA = "AAAA"
+    SRV = "SRV"
+    NS = "NS"
+    CAA = "CAA"
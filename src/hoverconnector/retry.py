@@ -0,0 +1,57 @@
+import random
+import time
+from typing import Callable, Iterable, Tuple, Type
+
+import requests
+from requests import Response
+
+from hoverconnector.rate_limiter import parse_retry_after
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRYABLE_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = 3, backoff_base: float = 0.5, backoff_cap: float = 10.0,
+                 jitter: bool = True, retry_status_codes: Iterable[int] = RETRYABLE_STATUS_CODES,
+                 retry_exceptions: Tuple[Type[BaseException], ...] = RETRYABLE_EXCEPTIONS,
+                 sleep: Callable[[float], None] = time.sleep, uniform: Callable[[float, float], float] = random.uniform
+                 ) -> None:
+        super().__init__()
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.jitter = jitter
+        self.retry_status_codes = frozenset(retry_status_codes)
+        self.retry_exceptions = tuple(retry_exceptions)
+        self.sleep = sleep
+        self.uniform = uniform
+
+    @classmethod
+    def from_configuration(cls, configuration: dict) -> "RetryPolicy":
+        settings = {key: value for key, value in configuration.items() if key != "enabled"}
+        if "retry_exceptions" in settings:
+            # Exceptions are named after the ones of "requests.exceptions", e.g. "ConnectionError" or "Timeout"
+            settings["retry_exceptions"] = tuple(getattr(requests.exceptions, name)
+                                                 for name in settings["retry_exceptions"])
+        return cls(**settings)
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1))
+        # "Full jitter": spreads the retries of concurrent workers instead of having them hit the API in lockstep
+        return self.uniform(0, delay) if self.jitter else delay
+
+    def execute(self, function: Callable[[int], Response]) -> Response:
+        attempt = 1
+        while True:
+            try:
+                response = function(attempt)
+            except self.retry_exceptions:
+                if attempt >= self.max_attempts:
+                    raise
+                self.sleep(self.backoff(attempt))
+            else:
+                if response.status_code not in self.retry_status_codes or attempt >= self.max_attempts:
+                    return response
+                self.sleep(max(self.backoff(attempt), parse_retry_after(response)))
+            attempt += 1
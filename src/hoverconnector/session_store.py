@@ -0,0 +1,81 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple, Optional
+
+from requests.cookies import RequestsCookieJar, create_cookie
+
+from hoverconnector.files import read_json, write_json_atomically
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+AUTHENTICATION_COOKIE = "hoverauth"
+
+
+def authentication_cookie(cookies: RequestsCookieJar) -> Optional[str]:
+    return next((cookie.value for cookie in cookies if cookie.name == AUTHENTICATION_COOKIE), None)
+
+
+class StoredSession(NamedTuple):
+    cookies: RequestsCookieJar
+    saved_at: float
+
+
+class SessionStore:
+    def __init__(self, path: str, max_age: float = None) -> None:
+        super().__init__()
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.lock_path = f"{self.path}.lock"
+        self.max_age = max_age
+
+    @classmethod
+    def from_configuration(cls, configuration: dict) -> "SessionStore":
+        return cls(path=configuration["path"], max_age=configuration.get("max_age", None))
+
+    @contextmanager
+    def locked(self, exclusive: bool = True) -> Iterator[None]:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load(self) -> Optional[StoredSession]:
+        stored = read_json(self.path)
+        if stored is None:
+            return None
+
+        cookies = RequestsCookieJar()
+        for cookie in stored.get("cookies", []):
+            cookies.set_cookie(create_cookie(**cookie))
+        cookies.clear_expired_cookies()
+        return StoredSession(cookies=cookies, saved_at=stored.get("saved_at", 0))
+
+    def is_fresh(self, stored: Optional[StoredSession]) -> bool:
+        if stored is None or AUTHENTICATION_COOKIE not in stored.cookies:
+            return False
+        return self.max_age is None or stored.saved_at + self.max_age > time.time()
+
+    def save(self, cookies: RequestsCookieJar) -> None:
+        stored = dict(saved_at=time.time(), cookies=[
+            dict(name=cookie.name, value=cookie.value, domain=cookie.domain, path=cookie.path,
+                 expires=cookie.expires, secure=cookie.secure)
+            for cookie in cookies
+        ])
+
+        write_json_atomically(self.path, stored)
+
+    def clear(self) -> None:
+        with self.locked():
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
@@ -0,0 +1,56 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, NamedTuple, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class FlightStats(NamedTuple):
+    calls: int
+    coalesced: int
+    in_flight: int
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        super().__init__()
+        self._flights: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, call: Callable[[], T]) -> Tuple[T, bool]:
+        with self._lock:
+            flight = self._flights.get(key, None)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+                self._calls += 1
+            else:
+                self._coalesced += 1
+        if not leader:
+            # Followers wait for the leader's result (or exception) instead of calling again
+            return flight.result(), True
+
+        try:
+            result = call()
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                if self._flights.get(key, None) is flight:
+                    del self._flights[key]
+
+    def forget(self, key: Hashable) -> None:
+        # Calls made from now on start a new flight, callers already waiting still get the current result
+        with self._lock:
+            self._flights.pop(key, None)
+
+    @property
+    def stats(self) -> FlightStats:
+        with self._lock:
+            return FlightStats(calls=self._calls, coalesced=self._coalesced, in_flight=len(self._flights))
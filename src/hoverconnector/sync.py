@@ -0,0 +1,107 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import traceback
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional
+
+from hoverconnector.connection import Connection
+from hoverconnector.rate_limiter import SharedRateLimiter
+from hoverconnector.zone import Zone
+
+# A task gets the worker's connection and a freshly fetched zone; it must be importable (defined at module level)
+Task = Callable[[Connection, Zone], Any]
+
+
+class ShardResult(NamedTuple):
+    domain_name: str
+    result: Any = None
+    # Formatted traceback: exceptions raised in workers are not always picklable
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_worker = None
+
+
+class ShardWorker:
+    def __init__(self, configuration: dict, rate_limiter: Optional[SharedRateLimiter], task: Task) -> None:
+        super().__init__()
+        # The session store already holds the parent's cookies: log_in restores them without authenticating again
+        self.connection = Connection(configuration, rate_limiter=rate_limiter)
+        self.connection.log_in()
+        self.task = task
+
+    def run(self, domain_names: List[str]) -> List[ShardResult]:
+        results = []
+        for domain_name in domain_names:
+            try:
+                zone = self.connection.get_zone(domain_name, refresh=True)
+                results.append(ShardResult(domain_name, result=self.task(self.connection, zone)))
+            except Exception:
+                results.append(ShardResult(domain_name, error=traceback.format_exc()))
+            finally:
+                # Zones are only needed by the task, workers do not keep every zone they went through
+                self.connection.forget_zone(domain_name)
+        return results
+
+
+def start_worker(configuration: dict, rate_limiter: Optional[SharedRateLimiter], task: Task) -> None:
+    global _worker
+    _worker = ShardWorker(configuration, rate_limiter, task)
+
+
+def run_shard(domain_names: List[str]) -> List[ShardResult]:
+    return _worker.run(domain_names)
+
+
+def shards(domain_names: Iterable[str], size: int) -> Iterator[List[str]]:
+    shard = []
+    for domain_name in domain_names:
+        shard.append(domain_name)
+        if len(shard) >= size:
+            yield shard
+            shard = []
+    if shard:
+        yield shard
+
+
+class ShardedSync:
+    def __init__(self, configuration: dict, processes: int = None, shard_size: int = 16,
+                 rate_limiter: SharedRateLimiter = None, context=None) -> None:
+        super().__init__()
+        self.context = context or multiprocessing.get_context()
+        self.processes = processes or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self.configuration = configuration
+
+        rate_limit_config = configuration.get("rate_limit", {})
+        self.rate_limiter = rate_limiter or (SharedRateLimiter.from_configuration(dict(rate_limit_config,
+                                                                                       context=self.context))
+                                             if rate_limit_config.get("enabled", False) else None)
+
+    def run(self, task: Task, domain_names: Iterable[str] = None) -> Iterator[ShardResult]:
+        # Workers share one authenticated session through a session store, a temporary one when none is configured
+        configuration = self.configuration
+        directory = None
+        if not configuration.get("session_store", {}).get("path", None):
+            directory = tempfile.mkdtemp(prefix="hoverconnector-")
+            configuration = dict(configuration, session_store=dict(path=os.path.join(directory, "session.json")))
+
+        try:
+            with Connection(configuration, rate_limiter=self.rate_limiter) as connection:
+                connection.log_in()
+                if domain_names is None:
+                    domain_names = [domain.name for domain in connection.iter_domains()]
+
+            with self.context.Pool(self.processes, initializer=start_worker,
+                                   initargs=(configuration, self.rate_limiter, task)) as pool:
+                # Shards are handed out as workers free up: a few huge zones do not hold back the others
+                for results in pool.imap_unordered(run_shard, shards(domain_names, self.shard_size)):
+                    yield from results
+        finally:
+            if directory is not None:
+                shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,158 @@
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, List, NamedTuple, Optional, Tuple, Union
+
+from hoverconnector.batch import BatchResult, EntryChange, as_entry_change
+from hoverconnector.connection import Connection
+from hoverconnector.record_type import RecordType
+
+
+class WriteBehindStats(NamedTuple):
+    submitted: int
+    merged: int
+    written: int
+    pending: int
+
+
+def write_key(change: EntryChange) -> tuple:
+    if not change.is_create:
+        return change.domain_name, change.dns_entry_id
+    # A creation has no record id yet and a name may hold a record set (round-robin A): only identical creations are
+    # merged, each distinct value is created
+    return change.domain_name, change.name, change.record_type, change.content
+
+
+def merge(pending: EntryChange, change: EntryChange) -> EntryChange:
+    if change.is_create:
+        return change
+    # Updates only send the fields they change: a field left out by the last write keeps the previous pending value
+    return change._replace(content=change.content or pending.content, ttl=change.ttl or pending.ttl)
+
+
+class WriteBehindQueue:
+    def __init__(self, connection: Connection, delay: float = 1.0, max_pending: int = 64, max_workers: int = 4,
+                 retry: bool = False, clock: Callable[[], float] = time.monotonic) -> None:
+        super().__init__()
+        self.connection = connection
+        self.delay = delay
+        self.max_pending = max_pending
+        self.max_workers = max_workers
+        self.retry = retry
+        self.clock = clock
+
+        self._pending: "OrderedDict[tuple, Tuple[EntryChange, List[Future]]]" = OrderedDict()
+        self._first_pending_at: Optional[float] = None
+        self._condition = threading.Condition()
+        # Flushes run one at a time: a write never overtakes an earlier write to the same record
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._submitted = 0
+        self._merged = 0
+        self._written = 0
+
+    def update_entry(self, domain_name: str, dns_entry_id: str, name: str, record_type: RecordType = RecordType.A,
+                     content: str = None, ttl: int = None) -> Future:
+        return self.submit(EntryChange(domain_name=domain_name, name=name, record_type=record_type, content=content,
+                                       ttl=ttl, dns_entry_id=dns_entry_id))
+
+    def create_entry(self, domain_name: str, name: str, record_type: RecordType, content: str, ttl: int) -> Future:
+        return self.submit(EntryChange(domain_name=domain_name, name=name, record_type=record_type, content=content,
+                                       ttl=ttl))
+
+    def submit(self, change: Union[EntryChange, dict]) -> Future:
+        change = as_entry_change(change)
+        key = write_key(change)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The write-behind queue is closed")
+
+            self._submitted += 1
+            # Each caller gets its own future, all resolved with the response of the single merged write
+            future = Future()
+            pending = self._pending.get(key, None)
+            if pending is not None:
+                self._merged += 1
+                self._pending[key] = (merge(pending[0], change), pending[1] + [future])
+            else:
+                self._pending[key] = (change, [future])
+                if self._first_pending_at is None:
+                    self._first_pending_at = self.clock()
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, name="hoverconnector-write-behind", daemon=True)
+                self._thread.start()
+                # The thread does not keep the interpreter alive: writes still pending at exit are sent by close()
+                atexit.register(self.close)
+            self._condition.notify_all()
+        return future
+
+    def run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                # Flushed once the oldest pending write waited "delay" seconds, or as soon as the queue is full
+                while self._pending and not self._closed and len(self._pending) < self.max_pending:
+                    remaining = self._first_pending_at + self.delay - self.clock()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+            self.flush()
+
+    def flush(self) -> List[BatchResult]:
+        with self._flush_lock:
+            with self._condition:
+                pending = list(self._pending.values())
+                self._pending.clear()
+                self._first_pending_at = None
+
+            writes = []
+            for change, futures in pending:
+                # A write is withdrawn once every caller waiting for it cancelled its future
+                waiting = [future for future in futures if future.set_running_or_notify_cancel()]
+                if waiting:
+                    writes.append((change, waiting))
+            results = []
+            if not writes:
+                return results
+
+            for (change, futures), result in zip(writes, self.connection.iter_update_entries(
+                    (change for change, _ in writes), max_workers=self.max_workers, retry=self.retry)):
+                for future in futures:
+                    if result.error is not None:
+                        future.set_exception(result.error)
+                    else:
+                        future.set_result(result.response)
+                results.append(result)
+
+            with self._condition:
+                self._written += len(results)
+            return results
+
+    @property
+    def stats(self) -> WriteBehindStats:
+        with self._condition:
+            return WriteBehindStats(submitted=self._submitted, merged=self._merged, written=self._written,
+                                    pending=len(self._pending))
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            atexit.unregister(self.close)
+        # Writes still pending are sent before closing
+        self.flush()
+
+    def __enter__(self) -> "WriteBehindQueue":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,96 @@
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, TYPE_CHECKING, Tuple, Union
+
+from hoverconnector.codec import JsonCodec
+from hoverconnector.models import DnsRecord, parse_records, parse_record, payload_of
+from hoverconnector.record_type import RecordType
+
+if TYPE_CHECKING:
+    from requests import Response
+
+
+class Zone:
+    def __init__(self, domain_name: str, records: Iterable[DnsRecord] = ()) -> None:
+        super().__init__()
+        self.domain_name = domain_name
+        self._by_id: Dict[str, DnsRecord] = {}
+        self._by_key: Dict[Tuple[str, RecordType], List[DnsRecord]] = {}
+        self._by_content: Dict[str, List[DnsRecord]] = {}
+        self._lock = threading.RLock()
+        for record in records:
+            self.add(record)
+
+    @classmethod
+    def from_response(cls, response: Union["Response", dict], codec: JsonCodec = None) -> "Zone":
+        payload = payload_of(response, codec)
+        return cls(payload["domain"]["name"], parse_records(payload))
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[DnsRecord]:
+        with self._lock:
+            return iter(list(self._by_id.values()))
+
+    def __contains__(self, dns_entry_id: str) -> bool:
+        return dns_entry_id in self._by_id
+
+    def get(self, dns_entry_id: str) -> Optional[DnsRecord]:
+        return self._by_id.get(dns_entry_id, None)
+
+    def find(self, name: str, record_type: RecordType) -> List[DnsRecord]:
+        with self._lock:
+            return list(self._by_key.get((name, record_type), ()))
+
+    def find_one(self, name: str, record_type: RecordType, content: str = None) -> Optional[DnsRecord]:
+        with self._lock:
+            for record in self._by_key.get((name, record_type), ()):
+                if content is None or record.content == content:
+                    return record
+        return None
+
+    def with_content(self, content: str) -> List[DnsRecord]:
+        with self._lock:
+            return list(self._by_content.get(content, ()))
+
+    def add(self, record: DnsRecord) -> None:
+        with self._lock:
+            self.remove(record.id)
+            self._by_id[record.id] = record
+            self._by_key.setdefault(record.key, []).append(record)
+            self._by_content.setdefault(record.content, []).append(record)
+
+    def remove(self, dns_entry_id: str) -> Optional[DnsRecord]:
+        with self._lock:
+            record = self._by_id.pop(dns_entry_id, None)
+            if record is not None:
+                unindex(self._by_key, record.key, record)
+                unindex(self._by_content, record.content, record)
+            return record
+
+    def update(self, dns_entry_id: str, content: str = None, ttl: int = None) -> Optional[DnsRecord]:
+        with self._lock:
+            record = self._by_id.get(dns_entry_id, None)
+            if record is None:
+                return None
+            if content is not None and content != record.content:
+                unindex(self._by_content, record.content, record)
+                record.content = content
+                self._by_content.setdefault(content, []).append(record)
+            if ttl is not None:
+                record.ttl = ttl
+            return record
+
+    def record_created(self, response: Union["Response", dict], codec: JsonCodec = None) -> DnsRecord:
+        record = parse_record(payload_of(response, codec)["dns_record"], self.domain_name)
+        self.add(record)
+        return record
+
+
+def unindex(index: dict, key, record: DnsRecord) -> None:
+    records = index.get(key, None)
+    if records is None:
+        return
+    records[:] = [indexed for indexed in records if indexed is not record]
+    if not records:
+        del index[key]
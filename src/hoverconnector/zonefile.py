@@ -0,0 +1,173 @@
+import json
+import re
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from hoverconnector.reconciler import RecordSpec
+from hoverconnector.record_type import RecordType
+
+CLASSES = ("IN", "CH", "HS", "CS")
+TTL_UNITS = dict(s=1, m=60, h=3600, d=86400, w=604800)
+# Names holding a domain name in their rdata, expanded against the origin when relative
+HOSTNAME_TYPES = (RecordType.CNAME, RecordType.NS)
+# Number of rdata fields below which a record is malformed
+RDATA_FIELDS = {RecordType.MX: 2, RecordType.SRV: 4}
+TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|(?:[^\s"\\]|\\.)+')
+# RFC 1035 escapes: \DDD is a byte given in decimal, \X is X itself
+ESCAPE = re.compile(rb"\\(\d{3}|.)", re.DOTALL)
+
+
+class ZoneFileException(Exception):
+    def __init__(self, line_number: int, message: str) -> None:
+        super().__init__(f"line {line_number}: {message}")
+        self.line_number = line_number
+
+
+def parse_ttl(value: str) -> Optional[int]:
+    if value.isdigit():
+        return int(value)
+
+    total = 0
+    for amount, unit in re.findall(r"(\d+)([smhdw])", value.lower()):
+        total += int(amount) * TTL_UNITS[unit]
+    return total if total and re.fullmatch(r"(\d+[smhdw])+", value.lower()) else None
+
+
+def strip_comment(line: str) -> str:
+    quoted = escaped = False
+    for index, character in enumerate(line):
+        if escaped:
+            escaped = False
+        elif character == "\\":
+            escaped = True
+        elif character == '"':
+            quoted = not quoted
+        elif character == ";" and not quoted:
+            return line[:index]
+    return line
+
+
+def logical_lines(lines: Iterable[str]) -> Iterator[tuple]:
+    # Records spanning several lines between parentheses are joined into one (line number, text) pair
+    pending, start, depth = [], 0, 0
+    for line_number, line in enumerate(lines, start=1):
+        line = strip_comment(line.rstrip("\r\n"))
+        if not pending:
+            start = line_number
+        depth += line.count("(") - line.count(")")
+        pending.append(line.replace("(", " ").replace(")", " ") if "(" in line or ")" in line else line)
+        if depth <= 0:
+            text = " ".join(pending) if len(pending) > 1 else pending[0]
+            pending, depth = [], 0
+            if text.strip():
+                yield start, text
+    if pending:
+        raise ZoneFileException(start, "unbalanced parentheses")
+
+
+def relative_name(name: str, domain_name: str) -> str:
+    name = name.rstrip(".")
+    if name == domain_name:
+        return "@"
+    if name.endswith(f".{domain_name}"):
+        return name[:-len(domain_name) - 1]
+    return name
+
+
+def absolute_name(name: str, origin: str) -> str:
+    if name == "@":
+        return origin
+    return name[:-1] if name.endswith(".") else f"{name}.{origin}"
+
+
+def character_string(token: str, line_number: int) -> str:
+    text = token[1:-1] if token.startswith('"') else token
+    if "\\" not in text:
+        return text
+
+    def unescape(match) -> bytes:
+        escaped = match.group(1)
+        if not escaped.isdigit():
+            return escaped
+        if int(escaped) > 255:
+            raise ZoneFileException(line_number, f"invalid escape \\{escaped.decode()}")
+        return bytes([int(escaped)])
+
+    # \DDD escapes are bytes: a non-ASCII character is written as the escapes of its UTF-8 encoding
+    try:
+        return ESCAPE.sub(unescape, text.encode("utf-8")).decode("utf-8")
+    except UnicodeDecodeError:
+        raise ZoneFileException(line_number, "character string is not valid UTF-8")
+
+
+def record_content(record_type: RecordType, rdata: List[str], origin: str, line_number: int) -> str:
+    if record_type == RecordType.TXT:
+        return "".join(character_string(token, line_number) for token in rdata)
+    if record_type in HOSTNAME_TYPES:
+        return absolute_name(rdata[0], origin)
+    if record_type == RecordType.MX:
+        return f"{rdata[0]} {absolute_name(rdata[1], origin)}"
+    if record_type == RecordType.SRV:
+        return " ".join(rdata[:3] + [absolute_name(rdata[3], origin)])
+    return " ".join(rdata)
+
+
+def parse_bind(lines: Iterable[str], domain_name: str, origin: str = None, default_ttl: int = 3600,
+               on_skip: Callable[[int, str], None] = None) -> Iterator[RecordSpec]:
+    domain_name = domain_name.rstrip(".")
+    origin = (origin or domain_name).rstrip(".")
+    owner = "@"
+    for line_number, text in logical_lines(lines):
+        tokens = TOKEN.findall(text)
+        directive = tokens[0].upper()
+        if directive == "$ORIGIN":
+            origin = tokens[1].rstrip(".")
+            continue
+        if directive == "$TTL":
+            default_ttl = parse_ttl(tokens[1]) or default_ttl
+            continue
+        if directive.startswith("$"):
+            if on_skip is not None:
+                on_skip(line_number, f"unsupported directive {tokens[0]}")
+            continue
+
+        # A line starting with blanks belongs to the previous owner
+        if not text[0].isspace():
+            owner = relative_name(f"{absolute_name(tokens.pop(0), origin)}.", domain_name)
+
+        ttl = default_ttl
+        while tokens and (tokens[0].upper() in CLASSES or parse_ttl(tokens[0]) is not None):
+            token = tokens.pop(0)
+            if token.upper() not in CLASSES:
+                ttl = parse_ttl(token)
+        if not tokens:
+            raise ZoneFileException(line_number, "missing record type")
+
+        type_name, rdata = tokens[0].upper(), tokens[1:]
+        try:
+            record_type = RecordType(type_name)
+        except ValueError:
+            if on_skip is not None:
+                on_skip(line_number, f"unsupported record type {type_name}")
+            continue
+        if record_type == RecordType.NS and owner == "@":
+            # Apex nameservers belong to the previous provider, Hover sets its own
+            if on_skip is not None:
+                on_skip(line_number, "apex NS record")
+            continue
+        if len(rdata) < RDATA_FIELDS.get(record_type, 1):
+            raise ZoneFileException(line_number, f"missing data for {type_name} record")
+
+        yield RecordSpec(name=owner, record_type=record_type,
+                         content=record_content(record_type, rdata, origin, line_number), ttl=ttl)
+
+
+def parse_jsonl(lines: Iterable[str], default_ttl: int = 3600) -> Iterator[RecordSpec]:
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+            yield RecordSpec(name=item["name"], record_type=RecordType(item["type"].upper()),
+                             content=item["content"], ttl=int(item.get("ttl", None) or default_ttl))
+        except (ValueError, KeyError) as e:
+            raise ZoneFileException(line_number, f"invalid record: {e}")
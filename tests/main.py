@@ -2,6 +2,54 @@ import unittest
 
 # noinspection PyUnresolvedReferences
 from test_connection import TestConnection
+# noinspection PyUnresolvedReferences
+from test_async_connection import TestAsyncConnection
+# noinspection PyUnresolvedReferences
+from test_reconciler import TestZoneReconciler
+# noinspection PyUnresolvedReferences
+from test_cache import TestReadCache
+# noinspection PyUnresolvedReferences
+from test_rate_limiter import TestAdaptiveRateLimiter
+# noinspection PyUnresolvedReferences
+from test_retry import TestRetryPolicy
+# noinspection PyUnresolvedReferences
+from test_session_store import TestSessionStore
+# noinspection PyUnresolvedReferences
+from test_models import TestModels
+# noinspection PyUnresolvedReferences
+from test_zone import TestZone
+# noinspection PyUnresolvedReferences
+from test_upsert import TestUpsert
+# noinspection PyUnresolvedReferences
+from test_ddns import TestDynamicDnsUpdater
+# noinspection PyUnresolvedReferences
+from test_import import TestImport
+# noinspection PyUnresolvedReferences
+from test_export import TestExport
+# noinspection PyUnresolvedReferences
+from test_hover_server import TestHoverServer
+# noinspection PyUnresolvedReferences
+from test_hover_emulator import TestHoverEmulator
+# noinspection PyUnresolvedReferences
+from test_instrumentation import TestInstrumentation, TestMetricsAggregator
+# noinspection PyUnresolvedReferences
+from test_codec import TestCodec
+# noinspection PyUnresolvedReferences
+from test_config import TestConfig
+# noinspection PyUnresolvedReferences
+from test_import_time import TestImportTime
+# noinspection PyUnresolvedReferences
+from test_accounts import TestConnectionManager
+# noinspection PyUnresolvedReferences
+from test_iteration import TestIteration
+# noinspection PyUnresolvedReferences
+from test_sync import TestShardedSync, TestSharedRateLimiter
+# noinspection PyUnresolvedReferences
+from test_single_flight import TestSingleFlight, TestConnectionCoalescing
+# noinspection PyUnresolvedReferences
+from test_write_behind import TestWriteBehindQueue
+# noinspection PyUnresolvedReferences
+from test_journal import TestWriteJournal
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,129 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from hamcrest import assert_that, equal_to, calling, raises, has_entries, has_length, has_properties, \
+    contains_inanyorder, empty
+
+from hoverconnector.accounts import ConnectionManager
+from hoverconnector.exceptions import UnknownDomainException
+from hoverconnector.record_type import RecordType
+from testkit.hover_emulator import HoverEmulator
+from testkit.hover_mock import HOVER_DOMAIN_DETAILS
+from testkit.hover_server import HoverServer
+
+LOG_IN = ("POST", "/signin/auth.json")
+
+
+class TestConnectionManager(TestCase):
+    def setUp(self) -> None:
+        self.personal = HoverServer().start()
+        work = HoverEmulator()
+        work.add_domain("work.local", HOVER_DOMAIN_DETAILS["domain"]["dns"])
+        self.work = HoverServer(emulator=work).start()
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.routing_path = os.path.join(self.directory.name, "routing.json")
+        shared = self.personal.configuration()
+        self.configuration = dict(shared, routing=dict(path=self.routing_path), accounts=dict(
+            personal=dict(credential=shared["credential"]),
+            work=dict(credential=shared["credential"], endpoints=self.work.configuration()["endpoints"])
+        ))
+
+    def tearDown(self) -> None:
+        self.personal.stop()
+        self.work.stop()
+        self.directory.cleanup()
+
+    def test_calls_are_routed_to_the_owning_account(self):
+        with ConnectionManager(self.configuration) as manager:
+            created = manager.create_entry(domain_name="work.local", name="www", record_type=RecordType.A,
+                                           content="10.0.0.2", ttl=300)
+            updated = manager.update_entry(domain_name="some_domain1.local", dns_entry_id="dns1234565",
+                                           name="home", content="10.0.0.9")
+
+            assert_that(manager.account_of("work.local"), equal_to("work"))
+            assert_that(manager.list_domain_names(), contains_inanyorder("some_domain1.local", "some_domain2.local",
+                                                                         "work.local"))
+            assert_that(created.status_code, equal_to(200))
+            assert_that(updated.status_code, equal_to(200))
+            assert_that(manager.get_zone("work.local", refresh=True).find_one("www", RecordType.A),
+                        has_properties(content="10.0.0.2"))
+        assert_that(self.personal.emulator.records("some_domain1.local"),
+                    has_entries(dns1234565=has_entries(content="10.0.0.9")))
+
+    def test_saved_routes_avoid_logging_into_every_account(self):
+        with ConnectionManager(self.configuration) as manager:
+            manager.refresh_routes()
+        self.personal.emulator.requests.clear()
+        self.work.emulator.requests.clear()
+
+        with ConnectionManager(self.configuration) as manager:
+            response = manager.get_domain("work.local")
+
+            assert_that(response.status_code, equal_to(200))
+            assert_that(manager.connections, has_length(1))
+        assert_that(self.personal.emulator.requests, empty())
+        assert_that(self.work.emulator.requests, has_entries({LOG_IN: 1}))
+
+    def test_stale_routes_are_refreshed(self):
+        with ConnectionManager(self.configuration) as manager:
+            manager.refresh_routes()
+        self.work.emulator.add_domain("moved.local", HOVER_DOMAIN_DETAILS["domain"]["dns"])
+
+        with ConnectionManager(self.configuration) as manager:
+            manager.routes["moved.local"] = "personal"
+
+            assert_that(manager.get_domain("moved.local").status_code, equal_to(200))
+            assert_that(manager.account_of("moved.local"), equal_to("work"))
+
+    def test_unknown_domains_are_rejected(self):
+        with ConnectionManager(self.configuration) as manager:
+            assert_that(calling(manager.get_domain).with_args("nobody.local"), raises(UnknownDomainException))
+
+    def test_single_account_configuration(self):
+        with ConnectionManager(self.personal.configuration()) as manager:
+            assert_that(manager.accounts, equal_to(["default"]))
+            assert_that(manager.get_domain("some_domain2.local").status_code, equal_to(200))
+
+    def test_accounts_do_not_share_the_top_level_session_store(self):
+        store_path = os.path.join(self.directory.name, "session.json")
+        configuration = dict(self.configuration, session_store=dict(path=store_path))
+
+        with ConnectionManager(configuration) as manager:
+            assert_that(manager.get_domain("some_domain1.local").status_code, equal_to(200))
+            assert_that(manager.get_domain("work.local").status_code, equal_to(200))
+            assert_that(manager.configurations["work"]["session_store"],
+                        has_entries(path=os.path.join(self.directory.name, "session.work.json")))
+        assert_that(self.personal.emulator.requests[LOG_IN], equal_to(1))
+        assert_that(self.work.emulator.requests[LOG_IN], equal_to(1))
+
+    def test_zone_of_a_moved_domain_is_rerouted(self):
+        self.work.emulator.add_domain("moved.local", HOVER_DOMAIN_DETAILS["domain"]["dns"])
+
+        with ConnectionManager(self.configuration) as manager:
+            manager.routes["moved.local"] = "personal"
+
+            assert_that(manager.get_zone("moved.local"), has_length(len(HOVER_DOMAIN_DETAILS["domain"]["dns"])))
+            assert_that(manager.account_of("moved.local"), equal_to("work"))
+
+    def test_validation_errors_do_not_refresh_routes(self):
+        with ConnectionManager(self.configuration) as manager:
+            manager.routes["some_domain1.local"] = "personal"
+            response = manager.update_entry(domain_name="some_domain1.local", dns_entry_id="unknown", name="home",
+                                            content="10.0.0.9")
+
+            assert_that(response.status_code, equal_to(422))
+            assert_that(manager.routes_refreshed, equal_to(False))
+
+    def test_expired_session_is_renewed(self):
+        self.personal.emulator.faults.session_lifetime = 0.05
+        configuration = dict(self.configuration, session_store=dict(path=os.path.join(self.directory.name, "s.json")))
+
+        with ConnectionManager(configuration) as manager:
+            manager.get_domain("some_domain1.local")
+            time.sleep(0.1)
+
+            assert_that(manager.get_domain("some_domain1.local").status_code, equal_to(200))
+        assert_that(self.personal.emulator.requests[LOG_IN], equal_to(2))
@@ -0,0 +1,47 @@
+import asyncio
+from unittest import TestCase
+
+import yaml
+from hamcrest import assert_that, equal_to, contains_exactly, has_entries, anything
+from httmock import HTTMock
+
+from hoverconnector.async_connection import AsyncConnection
+from hoverconnector.record_type import RecordType
+from testkit.configuration import test_config
+from testkit.hover_mock import http_mock_signin, http_mock_domain, http_mock_entry_create
+from testkit.matchers import has_status_code
+
+
+class TestAsyncConnection(TestCase):
+    def test_shares_endpoints_with_connection(self):
+        connection = AsyncConnection(configuration=yaml.safe_load(test_config))
+
+        assert_that(connection.endpoint_domain("my_domain.local"),
+                    equal_to("http://fake_hover.local/api/control_panel/my_domain.local/dns"))
+        connection.close()
+
+    def test_log_in_and_create_entry(self):
+        async def scenario():
+            async with AsyncConnection(configuration=yaml.safe_load(test_config)) as connection:
+                hover_response = await connection.log_in()
+                created = await connection.create_entry(domain_name="some_domain1.local", name="hostname",
+                                                        record_type=RecordType.A, content="127.0.0.1", ttl=300)
+                return hover_response, created
+
+        with HTTMock(http_mock_signin, http_mock_entry_create):
+            hover_response, created = asyncio.run(scenario())
+
+        assert_that(hover_response.cookies, has_entries(dict(hoverauth=anything())))
+        assert_that(created, has_status_code(200))
+
+    def test_get_domains_fetches_every_domain(self):
+        async def scenario():
+            async with AsyncConnection(configuration=yaml.safe_load(test_config), max_concurrency=2) as connection:
+                connection.cookies.set("hoverauth", "HOVERAUTH")
+                return await connection.get_domains(["a.local", "b.local", "c.local", "a.local"])
+
+        with HTTMock(http_mock_domain):
+            responses = asyncio.run(scenario())
+
+        assert_that(list(responses), contains_exactly("a.local", "b.local", "c.local"))
+        assert_that(all(response.status_code == 200 for response in responses.values()), equal_to(True))
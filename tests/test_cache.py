@@ -0,0 +1,48 @@
+from unittest import TestCase
+
+from hamcrest import assert_that, equal_to, has_properties, close_to
+
+from hoverconnector.cache import ReadCache, MISSING
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestReadCache(TestCase):
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = ReadCache(ttl=10, clock=clock)
+        cache.set("key", "value")
+
+        clock.now = 9.9
+        assert_that(cache.get("key"), equal_to("value"))
+        clock.now = 10
+        assert_that(cache.get("key") is MISSING, equal_to(True))
+        assert_that(cache.stats, has_properties(hits=1, misses=1, expirations=1, size=0))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ReadCache(ttl=10, max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert_that(cache.get("b") is MISSING, equal_to(True))
+        assert_that(cache.get("a"), equal_to(1))
+        assert_that(cache.get("c"), equal_to(3))
+        assert_that(cache.stats, has_properties(evictions=1, hit_ratio=close_to(0.75, 0.001)))
+
+    def test_value_read_before_an_invalidation_is_not_stored(self):
+        cache = ReadCache(ttl=10)
+        generation = cache.generation("key")
+        cache.invalidate("key")
+        cache.set("key", "stale", generation=generation)
+
+        assert_that(cache.get("key") is MISSING, equal_to(True))
+        cache.set("key", "fresh", generation=cache.generation("key"))
+        assert_that(cache.get("key"), equal_to("fresh"))
@@ -0,0 +1,84 @@
+from unittest import TestCase
+
+import yaml
+from hamcrest import assert_that, equal_to, calling, raises, instance_of, has_entries, has_length, greater_than
+from httmock import HTTMock, all_requests, response
+from requests import Response
+
+from hoverconnector.codec import JsonCodec, OrjsonCodec, get_codec, is_available
+from hoverconnector.connection import Connection
+from hoverconnector.hover_response import HoverResponse
+from hoverconnector.record_type import RecordType
+from testkit.configuration import test_config
+from testkit.hover_emulator import HoverEmulator
+
+PAYLOAD = {"domain": {"id": "domain-example.com", "dns": [{"id": "dns1", "content": "é", "ttl": 900}]}}
+
+
+def json_response(body: bytes, status_code: int = 200) -> Response:
+    result = Response()
+    result.status_code = status_code
+    result.headers["Content-Type"] = "application/json; charset=utf-8"
+    result._content = body
+    return result
+
+
+class TestCodec(TestCase):
+    def test_codecs_round_trip(self):
+        codecs = [JsonCodec()] + ([OrjsonCodec()] if is_available("orjson") else [])
+        for codec in codecs:
+            assert_that(codec.loads(codec.dumps(PAYLOAD)), equal_to(PAYLOAD))
+            assert_that(codec.dumps(PAYLOAD), instance_of(bytes))
+
+    def test_get_codec(self):
+        assert_that(get_codec("json"), instance_of(JsonCodec))
+        assert_that(calling(get_codec).with_args("pickle"), raises(ValueError))
+
+    def test_content_is_decoded_lazily(self):
+        hover_response = HoverResponse(json_response(b"{not json"))
+
+        assert_that(hover_response.status_code, equal_to(200))
+        assert_that(calling(getattr).with_args(hover_response, "content"), raises(ValueError))
+        assert_that(HoverResponse(json_response(b'{"succeeded": true}')).content, equal_to({"succeeded": True}))
+
+    def test_payloads_are_encoded_with_the_codec(self):
+        sent = []
+
+        @all_requests
+        def capture(url, request):
+            sent.append(request)
+            return response(status_code=200, content=b'{"succeeded": true}', request=request)
+
+        class UpperCodec(JsonCodec):
+            def dumps(self, data) -> bytes:
+                return super().dumps(data).upper()
+
+        connection = Connection(yaml.safe_load(test_config), codec=UpperCodec())
+        with HTTMock(capture):
+            connection.create_entry(domain_name="example.com", name="www", record_type=RecordType.A,
+                                    content="10.0.0.1", ttl=300)
+
+        assert_that(sent[0].body, equal_to(b'{"DNS_RECORD":{"NAME":"WWW","CONTENT":"10.0.0.1","TYPE":"A","TTL":300},'
+                                           b'"ID":"DOMAIN-EXAMPLE.COM"}'))
+        assert_that(sent[0].headers, has_entries({"Content-Type": "application/json"}))
+
+    def test_payloads_are_decoded_with_the_codec(self):
+        class CountingCodec(JsonCodec):
+            def __init__(self) -> None:
+                super().__init__()
+                self.decoded = 0
+
+            def loads(self, data):
+                self.decoded += 1
+                return super().loads(data)
+
+        codec = CountingCodec()
+        connection = Connection(yaml.safe_load(test_config), codec=codec)
+        with HTTMock(HoverEmulator.with_fixtures().mock()):
+            connection.log_in()
+            domains = list(connection.iter_domains())
+            zone = connection.get_zone("some_domain1.local")
+
+        assert_that(domains, has_length(greater_than(0)))
+        assert_that(len(zone), greater_than(0))
+        assert_that(codec.decoded, equal_to(2))
@@ -0,0 +1,54 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import yaml
+from hamcrest import assert_that, equal_to, calling, raises
+
+from hoverconnector.config import load_configuration, parse_yaml, UnsupportedYaml
+from testkit.configuration import test_config
+
+EXAMPLE = os.path.join(os.path.dirname(__file__), "..", "config.example.yml")
+
+SUPPORTED = [
+    test_config,
+    "a: 1\nb: -2\nc: 0.5\nd: 1_000\ne: .5\nf: 1.\n",
+    "a: true\nb: off\nc: ~\nd:\ne: null\nf: Yes\n",
+    "a: 'it''s'\nb: \"tab\\there\"\nc: it's\nd: \"# not a comment\"  # a comment\n",
+    "a: [1, two, three, ]\nb: []\nc: http://example.com/path\nd: ~/.cache/file\n",
+    "a:\n- 1\n- b: 2\n  c: 3\n-\n  - nested\nd:\n  - x\n",
+    "base: &base\n  ttl: 300\n  type: A\ncopy: *base\nvalue: &v 10\nother: *v\n",
+    "# only a comment\nkey: value # trailing\n\n\nnext: +1\n",
+]
+
+UNSUPPORTED = [
+    "a: 0755\n", "a: 2024-01-01\n", "a: 1e5\n", "a: .inf\n", "a: 1:30\n", "a: |\n  text\n", "a: {b: 1}\n",
+    "base: &b\n  x: 1\nc:\n  <<: *b\n", "---\na: 1\n", "a: b\n   c\n", "a: *missing\n", "a: [[1]]\n",
+]
+
+
+class TestConfig(TestCase):
+    def test_example_configuration_is_parsed_like_pyyaml(self):
+        with open(EXAMPLE) as f:
+            text = f.read()
+
+        assert_that(parse_yaml(text), equal_to(yaml.safe_load(text)))
+
+    def test_supported_subset_is_parsed_like_pyyaml(self):
+        for text in SUPPORTED:
+            assert_that(parse_yaml(text), equal_to(yaml.safe_load(text)), text)
+
+    def test_anything_else_falls_back_to_pyyaml(self):
+        for text in UNSUPPORTED:
+            assert_that(calling(parse_yaml).with_args(text), raises(UnsupportedYaml), text)
+
+            with tempfile.NamedTemporaryFile("w", suffix=".yml", delete=False) as f:
+                f.write(text)
+            try:
+                if text != "a: *missing\n":
+                    assert_that(load_configuration(f.name), equal_to(yaml.safe_load(text)), text)
+            finally:
+                os.remove(f.name)
+
+    def test_empty_file(self):
+        assert_that(parse_yaml("# nothing\n\n"), equal_to(None))
@@ -1,33 +1,22 @@
+import json
 from unittest import TestCase
 
 import yaml
-from hamcrest import assert_that, equal_to, calling, raises, all_of, none, anything, has_entries
-from httmock import HTTMock
+from hamcrest import assert_that, equal_to, calling, raises, all_of, none, anything, has_entries, \
+    has_properties, instance_of
+from httmock import HTTMock, urlmatch
 from requests.cookies import RequestsCookieJar
 
+from hoverconnector.batch import EntryChange
 from hoverconnector.connection import Connection
 from hoverconnector.exceptions import ConnectionConfigurationException, HoverLoginException
 from hoverconnector.record_type import RecordType
+from testkit.configuration import test_config
 from testkit.hover_mock import http_mock_signin, http_mock_domains, http_mock_entry_update, http_mock_domain, \
-    http_mock_entry_create
+    http_mock_entry_create, HOVER_TEST_DOMAIN
 from testkit.matchers import has_status_code, has_username, has_password, has_protocol, has_base, has_endpoint, \
     has_json_content
 
-test_config = """
-        credential:
-            username: my_username
-            password: my_password
-        endpoints:
-            protocol: http
-            base: fake_hover.local
-            establish: /signin
-            login: /signin/auth.json
-            list_domains: /api/control_panel/domains
-            list_entries: /api/control_panel/{domain}/dns
-            update_entry: &update_entry /api/control_panel/dns
-            create_entry: *update_entry
-        """
-
 
 class TestConnection(TestCase):
     def test_loading_empty_configuration(self):
@@ -75,6 +64,23 @@ class TestConnection(TestCase):
         assert_that(connection.endpoint_create_entry(),
                     equal_to(f"http://fake_hover.local/api/control_panel/dns"))
 
+    def test_session_configuration(self):
+        connection = Connection(configuration=yaml.safe_load(test_config))
+
+        adapter = connection.session.get_adapter("http://fake_hover.local")
+        assert_that(adapter._pool_connections, equal_to(4))
+        assert_that(adapter._pool_maxsize, equal_to(8))
+        assert_that(connection.timeout, equal_to((2, 10)))
+        assert_that(connection.session.cookies is connection.cookies, equal_to(True))
+
+    def test_session_keeps_cookies_between_calls(self):
+        with Connection(configuration=yaml.safe_load(test_config)) as connection:
+            with HTTMock(http_mock_signin, http_mock_domains):
+                connection.log_in()
+                domain_list_response = connection.list_domains()
+
+        assert_that(domain_list_response, has_status_code(200))
+
     def test_login_with_right_credentials(self):
         connection = Connection(configuration=yaml.safe_load(test_config))
 
@@ -235,4 +241,61 @@ class TestConnection(TestCase):
             })
         ))
 
+    def test_cached_reads_until_written(self):
+        config = yaml.safe_load(test_config)
+        config["cache"] = dict(enabled=True, ttl=60, max_size=1)
+        connection = Connection(configuration=config)
+        connection.cookies.set("hoverauth", "HOVERAUTH")
+
+        with HTTMock(http_mock_domain, http_mock_domains, http_mock_entry_create):
+            first = connection.get_domain(domain_name="some_domain1.local")
+            assert_that(connection.get_domain(domain_name="some_domain1.local") is first, equal_to(True))
+
+            connection.create_entry(domain_name="some_domain1.local", name="hostname", record_type=RecordType.A,
+                                    content="127.0.0.1", ttl=300)
+            assert_that(connection.get_domain(domain_name="some_domain1.local") is first, equal_to(False))
+
+            connection.list_domains()
+
+        assert_that(connection.cache.stats, has_properties(hits=1, misses=3, invalidations=1, evictions=1, size=1))
+
+    def test_read_in_flight_during_a_write_is_not_cached(self):
+        config = yaml.safe_load(test_config)
+        config["cache"] = dict(enabled=True, ttl=60)
+        connection = Connection(configuration=config)
+        connection.cookies.set("hoverauth", "HOVERAUTH")
+
+        @urlmatch(path=r"/api/control_panel/some_domain1.local/dns")
+        def written_meanwhile(url, request):
+            # A write to the zone completes while the read is in flight
+            connection.invalidate_domain("some_domain1.local")
+            return http_mock_domain(url, request)
+
+        with HTTMock(written_meanwhile):
+            first = connection.get_domain(domain_name="some_domain1.local")
+        with HTTMock(http_mock_domain):
+            assert_that(connection.get_domain(domain_name="some_domain1.local") is first, equal_to(False))
+
+    def test_update_entries_in_batch(self):
+        connection = Connection(configuration=yaml.safe_load(test_config))
+        connection.cookies.set("hoverauth", "HOVERAUTH")
+        changes = [
+            EntryChange("some_domain1.local", "host1", RecordType.A, "127.0.0.1", 300, dns_entry_id="dns1"),
+            dict(domain_name="some_domain1.local", name="host2", record_type=RecordType.A, content="127.0.0.2",
+                 ttl=300),
+            EntryChange("some_domain1.local", "host3", RecordType.A, "127.0.0.3", 300, dns_entry_id="dns3"),
+        ]
+
+        @urlmatch(netloc=HOVER_TEST_DOMAIN, path="/api/control_panel/dns", method="put")
+        def fail_host3(url, request):
+            if json.loads(request.body)["domain"]["dns_records"][0]["name"] == "host3":
+                raise ConnectionError("connection reset")
+
+        with HTTMock(fail_host3, http_mock_entry_update, http_mock_entry_create):
+            results = connection.update_entries(changes, max_workers=3)
+
+        assert_that([result.change.name for result in results], equal_to(["host1", "host2", "host3"]))
+        assert_that([result.ok for result in results], equal_to([True, True, False]))
+        assert_that(results[2].error, instance_of(ConnectionError))
+
     # TODO Add test for cookie expiration
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+import yaml
+from hamcrest import assert_that, equal_to, contains_exactly, none, has_entries
+from httmock import HTTMock, all_requests
+
+from hoverconnector.connection import Connection
+from hoverconnector.ddns import DynamicDnsUpdater
+from hoverconnector.files import read_json
+from testkit.configuration import test_config
+from testkit.hover_emulator import HoverEmulator, Faults
+from testkit.hover_mock import http_mock_domain, http_mock_entry_update, http_mock_entry_create
+
+
+class TestDynamicDnsUpdater(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.directory.name, "ddns.json")
+        self.connection = Connection(configuration=yaml.safe_load(test_config))
+        self.connection.cookies.set("hoverauth", "HOVERAUTH")
+        self.calls = []
+
+        @all_requests
+        def record_call(url, request):
+            self.calls.append(request.method)
+
+        self.mock = HTTMock(record_call, http_mock_domain, http_mock_entry_update, http_mock_entry_create)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_only_changed_addresses_are_written(self):
+        addresses = iter(["127.0.0.1", "127.0.0.1", "10.0.0.1", "10.0.0.1"])
+        updater = DynamicDnsUpdater(self.connection, "some_domain1.local", "home", ip_source=lambda: next(addresses),
+                                    state_path=self.state_path)
+
+        with self.mock:
+            responses = [updater.poll_once() for _ in range(4)]
+
+        assert_that(self.calls, contains_exactly("GET", "PUT"))
+        assert_that(responses[2].status_code, equal_to(200))
+        assert_that(read_json(self.state_path), has_entries(address="10.0.0.1", dns_entry_id="dns1234565"))
+
+    def test_state_survives_restarts(self):
+        with self.mock:
+            DynamicDnsUpdater(self.connection, "some_domain1.local", "home", ip_source=lambda: "10.0.0.1",
+                              state_path=self.state_path).poll_once()
+            restarted = DynamicDnsUpdater(self.connection, "some_domain1.local", "home",
+                                          ip_source=lambda: "10.0.0.1", state_path=self.state_path)
+
+            assert_that(restarted.poll_once(), none())
+
+    def test_address_lookup_failures_are_ignored(self):
+        def failing_source():
+            raise OSError("network unreachable")
+
+        updater = DynamicDnsUpdater(self.connection, "some_domain1.local", "home", ip_source=failing_source)
+
+        assert_that(updater.poll_once(), none())
+        assert_that(self.calls, equal_to([]))
+
+    def test_expired_session_is_renewed_despite_the_session_store(self):
+        emulator = HoverEmulator.with_fixtures(Faults(session_lifetime=0.05))
+        configuration = yaml.safe_load(test_config)
+        configuration["session_store"] = dict(path=os.path.join(self.directory.name, "session.json"))
+        addresses = iter(["10.0.0.1", "10.0.0.2"])
+
+        with HTTMock(emulator.mock()), Connection(configuration) as connection:
+            updater = DynamicDnsUpdater(connection, "some_domain1.local", "home", ip_source=lambda: next(addresses))
+            connection.log_in()
+            updater.poll_once()
+            time.sleep(0.1)
+            response = updater.poll_once()
+
+        assert_that(response.status_code, equal_to(200))
+        assert_that(emulator.requests[("POST", "/signin/auth.json")], equal_to(2))
+        assert_that(emulator.records("some_domain1.local"), has_entries(dns1234565=has_entries(content="10.0.0.2")))
+
+    def test_record_deleted_outside_the_daemon_is_published_again(self):
+        emulator = HoverEmulator.with_fixtures()
+        addresses = iter(["10.0.0.1", "10.0.0.2", "10.0.0.2"])
+
+        with HTTMock(emulator.mock()), Connection(yaml.safe_load(test_config)) as connection:
+            updater = DynamicDnsUpdater(connection, "some_domain1.local", "home", ip_source=lambda: next(addresses),
+                                        state_path=self.state_path)
+            connection.log_in()
+            updater.poll_once()
+            with emulator.lock:
+                del emulator.domains["some_domain1.local"]["dns1234565"]
+            response = updater.poll_once()
+            emulator.requests.clear()
+
+            assert_that(updater.poll_once(), none())
+
+        assert_that(response.status_code, equal_to(200))
+        created = [record for record in emulator.records("some_domain1.local").values() if record["name"] == "home"]
+        assert_that([record["content"] for record in created], contains_exactly("10.0.0.2"))
+        assert_that(read_json(self.state_path), has_entries(address="10.0.0.2", dns_entry_id=created[0]["id"]))
+        assert_that(sum(emulator.requests.values()), equal_to(0))
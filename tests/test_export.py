@@ -0,0 +1,89 @@
+import gzip
+import io
+import os
+import tempfile
+from unittest import TestCase
+
+import yaml
+from hamcrest import assert_that, equal_to, contains_exactly, has_length, less_than_or_equal_to
+from httmock import HTTMock
+
+from hoverconnector import cli
+from hoverconnector.connection import Connection
+from hoverconnector.exporter import BindSink, bind_content, export_zones
+from hoverconnector.models import DnsRecord, parse_records
+from hoverconnector.record_type import RecordType
+from hoverconnector.zonefile import TOKEN, character_string, parse_bind
+from testkit.configuration import test_config
+from testkit.hover_mock import http_mock_signin, http_mock_domains, http_mock_domain, HOVER_DOMAIN_DETAILS
+
+
+class UnclosedStream(io.StringIO):
+    def close(self) -> None:
+        pass
+
+
+class TestExport(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.directory.name, "config.yml")
+        with open(self.config_path, "w") as f:
+            f.write(test_config)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_bind_export_can_be_imported_back(self):
+        stream = UnclosedStream()
+        with BindSink(stream) as sink:
+            sink.start_domain("some_domain1.local")
+            for record in parse_records(HOVER_DOMAIN_DETAILS):
+                sink.write(record)
+
+        imported = [(spec.name, spec.record_type, spec.content, spec.ttl)
+                    for spec in parse_bind(stream.getvalue().splitlines(), domain_name="some_domain1.local")]
+        assert_that(imported, equal_to([(record.name, record.record_type, record.content, record.ttl)
+                                        for record in parse_records(HOVER_DOMAIN_DETAILS)]))
+
+    def test_backslashes_survive_a_round_trip(self):
+        contents = ["a\\b", "end\\", 'say "hi"; bye', "\\\\\\\"", "\u00e9t\u00e9"]
+        stream = UnclosedStream()
+        with BindSink(stream) as sink:
+            sink.start_domain("some_domain1.local")
+            for index, content in enumerate(contents):
+                sink.write(DnsRecord(f"dns{index}", "some_domain1.local", "@", RecordType.TXT, content, 300))
+
+        imported = parse_bind(stream.getvalue().splitlines(), domain_name="some_domain1.local")
+        assert_that([spec.content for spec in imported], equal_to(contents))
+
+    def test_long_values_are_split_between_characters(self):
+        contents = ["a" * 254 + '"' + "b" * 10, "a" * 254 + "\\" + "b" * 10, "\u00e9" * 200]
+
+        for content in contents:
+            exported = bind_content(DnsRecord("dns1", "some_domain1.local", "@", RecordType.TXT, content, 300))
+            chunks = [character_string(token, 1) for token in TOKEN.findall(exported)]
+
+            assert_that("".join(chunks), equal_to(content))
+            assert_that(max(len(chunk.encode("utf-8")) for chunk in chunks), less_than_or_equal_to(255))
+
+    def test_export_command_writes_every_domain(self):
+        output = os.path.join(self.directory.name, "backup.jsonl")
+
+        with HTTMock(http_mock_signin, http_mock_domains, http_mock_domain):
+            status = cli.main(["--config", self.config_path, "export", output, "--gzip"])
+
+        with gzip.open(f"{output}.gz", "rt") as f:
+            lines = f.readlines()
+        assert_that(status, equal_to(0))
+        assert_that(lines, has_length(10))
+
+    def test_export_selected_domains(self):
+        connection = Connection(configuration=yaml.safe_load(test_config))
+        connection.cookies.set("hoverauth", "HOVERAUTH")
+        stream = UnclosedStream()
+
+        with HTTMock(http_mock_domain), BindSink(stream) as sink:
+            stats = export_zones(connection, sink, domain_names=["some_domain1.local"])
+
+        assert_that(stats, contains_exactly(1, 5))
+        assert_that(stream.getvalue().splitlines()[0], equal_to("$ORIGIN some_domain1.local."))
@@ -0,0 +1,83 @@
+import time
+from unittest import TestCase
+
+import yaml
+from hamcrest import assert_that, equal_to, has_length, has_entries, greater_than_or_equal_to, has_properties
+from httmock import HTTMock
+
+from hoverconnector.batch import EntryChange
+from hoverconnector.connection import Connection
+from hoverconnector.record_type import RecordType
+from hoverconnector.retry import RetryPolicy
+from testkit.configuration import test_config
+from testkit.hover_emulator import HoverEmulator, Faults, constant
+
+DOMAIN = "some_domain1.local"
+
+
+class TestHoverEmulator(TestCase):
+    def setUp(self) -> None:
+        self.faults = Faults()
+        self.emulator = HoverEmulator.with_fixtures(faults=self.faults)
+        self.mock = HTTMock(self.emulator.mock())
+        self.mock.__enter__()
+        self.connection = Connection(yaml.safe_load(test_config),
+                                     retry_policy=RetryPolicy(max_attempts=3, sleep=lambda seconds: None))
+        self.connection.log_in()
+
+    def tearDown(self) -> None:
+        self.connection.close()
+        self.mock.__exit__(None, None, None)
+
+    def test_writes_are_kept_per_domain(self):
+        self.connection.update_entry(domain_name=DOMAIN, dns_entry_id="dns1234565", name="home",
+                                     content="10.0.0.9", ttl=300)
+        self.connection.create_entry(domain_name=DOMAIN, name="www", record_type=RecordType.A, content="10.0.0.2",
+                                     ttl=300)
+
+        zone = self.connection.get_zone(DOMAIN, refresh=True)
+        assert_that(zone.get("dns1234565"), has_properties(content="10.0.0.9", ttl=300))
+        assert_that(zone.find_one("www", RecordType.A), has_properties(content="10.0.0.2"))
+        assert_that(self.emulator.records("some_domain2.local"), has_length(5))
+
+    def test_concurrent_creates_get_distinct_ids(self):
+        changes = [EntryChange(DOMAIN, f"host{index}", RecordType.A, f"10.0.1.{index}", 300) for index in range(40)]
+
+        results = self.connection.update_entries(changes, max_workers=8)
+
+        ids = {result.response.json()["dns_record"]["id"] for result in results}
+        assert_that(ids, has_length(40))
+        assert_that(self.emulator.records(DOMAIN), has_length(45))
+
+    def test_injected_errors_are_retried(self):
+        self.faults.fail_next(2, status_code=503)
+
+        assert_that(self.connection.list_domains().status_code, equal_to(200))
+        assert_that(self.emulator.requests, has_entries({("GET", "/api/control_panel/domains"): 3}))
+
+    def test_throttling_reports_retry_after(self):
+        self.faults.throttle_rate = 1.0
+        self.faults.retry_after = 2
+
+        response = self.connection.create_entry(domain_name=DOMAIN, name="www", record_type=RecordType.A,
+                                                content="10.0.0.2", ttl=300)
+
+        assert_that(response.status_code, equal_to(429))
+        assert_that(response.headers["Retry-After"], equal_to("2"))
+        assert_that(self.emulator.records(DOMAIN), has_length(5))
+
+    def test_expired_sessions_must_log_in_again(self):
+        self.faults.session_lifetime = 0.05
+        time.sleep(0.06)
+
+        assert_that(self.connection.list_domains().status_code, equal_to(401))
+        self.connection.log_in(cookies={})
+        assert_that(self.connection.list_domains().status_code, equal_to(200))
+
+    def test_latency_is_added_to_every_call(self):
+        self.faults.latency = constant(0.02)
+
+        started_at = time.monotonic()
+        self.connection.get_domain(DOMAIN)
+
+        assert_that(time.monotonic() - started_at, greater_than_or_equal_to(0.02))
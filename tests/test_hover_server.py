@@ -0,0 +1,37 @@
+from unittest import TestCase
+
+from hamcrest import assert_that, equal_to, has_entries, anything, has_properties
+
+from hoverconnector.connection import Connection
+from hoverconnector.models import parse_domains
+from hoverconnector.record_type import RecordType
+from testkit.hover_server import HoverServer
+
+
+class TestHoverServer(TestCase):
+    def setUp(self) -> None:
+        self.server = HoverServer().start()
+        self.connection = Connection(self.server.configuration())
+
+    def tearDown(self) -> None:
+        self.connection.close()
+        self.server.stop()
+
+    def test_connection_over_http(self):
+        hover_response = self.connection.log_in()
+        domains = parse_domains(self.connection.list_domains())
+        zone = self.connection.get_zone("some_domain1.local")
+        created = self.connection.create_entry(domain_name="some_domain1.local", name="www", record_type=RecordType.A,
+                                               content="10.0.0.2", ttl=300)
+        updated = self.connection.update_entry(domain_name="some_domain1.local", dns_entry_id="dns1234565", name="home",
+                                               content="10.0.0.1", ttl=300)
+
+        assert_that(hover_response.cookies, has_entries(dict(hoverauth=anything(), hover_device_id=anything())))
+        assert_that(len(domains), equal_to(2))
+        assert_that(created.status_code, equal_to(200))
+        assert_that(updated.status_code, equal_to(200))
+        assert_that(zone.find_one("www", RecordType.A), has_properties(content="10.0.0.2"))
+        assert_that(zone.find_one("home", RecordType.A), has_properties(content="10.0.0.1"))
+
+    def test_unauthenticated_calls_are_rejected(self):
+        assert_that(self.connection.list_domains().status_code, equal_to(401))
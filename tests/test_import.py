@@ -0,0 +1,149 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from hamcrest import assert_that, equal_to, contains_exactly, contains_inanyorder, has_properties, calling, raises
+import yaml
+from httmock import HTTMock, all_requests
+
+from hoverconnector import cli
+from hoverconnector.connection import Connection
+from hoverconnector.importer import ImportStats, import_records, plan_changes, record_set_sizes
+from hoverconnector.reconciler import RecordSpec
+from hoverconnector.models import DnsRecord
+from hoverconnector.record_type import RecordType
+from hoverconnector.zone import Zone
+from hoverconnector.zonefile import parse_bind, parse_jsonl, ZoneFileException
+from testkit.configuration import test_config
+from testkit.hover_emulator import HoverEmulator
+from testkit.hover_mock import http_mock_signin, http_mock_domain, http_mock_entry_update, http_mock_entry_create
+
+ZONE_FILE = """$ORIGIN some_domain1.local.
+$TTL 15m
+@       IN  SOA ns1.other.net. admin.some_domain1.local. (
+            2024010101 ; serial
+            3600 )
+@           NS     ns1.other.net.
+@           TXT    "MS=ms12345678"
+            TXT    "v=spf1 include:spf.protection.outlook.com" " -all"
+autodiscover CNAME autodiscover.outlook.com.
+home    300 IN A   10.0.0.1   ; moved
+www.some_domain1.local. 300 IN A 10.0.0.2
+"""
+
+
+class TestImport(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.config_path = self.write("config.yml", test_config)
+        self.calls = []
+
+        @all_requests
+        def record_call(url, request):
+            self.calls.append(request.method)
+
+        self.mock = HTTMock(record_call, http_mock_signin, http_mock_domain, http_mock_entry_update,
+                            http_mock_entry_create)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write(self, name: str, content: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_parse_bind(self):
+        skipped = []
+        records = list(parse_bind(ZONE_FILE.splitlines(), domain_name="some_domain1.local",
+                                  on_skip=lambda line, reason: skipped.append(line)))
+
+        assert_that(skipped, contains_exactly(3, 6))
+        assert_that(records, contains_exactly(
+            RecordSpec("@", RecordType.TXT, "MS=ms12345678", 900),
+            RecordSpec("@", RecordType.TXT, "v=spf1 include:spf.protection.outlook.com -all", 900),
+            RecordSpec("autodiscover", RecordType.CNAME, "autodiscover.outlook.com", 900),
+            RecordSpec("home", RecordType.A, "10.0.0.1", 300),
+            RecordSpec("www", RecordType.A, "10.0.0.2", 300),
+        ))
+
+    def test_parse_bind_decodes_escapes(self):
+        lines = ['a TXT "a\\\\b"', 'b TXT "end\\\\" ; comment', 'c TXT "say \\"hi\\"; bye"', 'd TXT "\\065\\195\\169"',
+                 'e TXT one\\ token']
+        records = parse_bind(lines, domain_name="some_domain1.local", default_ttl=300)
+
+        assert_that([record.content for record in records],
+                    contains_exactly("a\\b", "end\\", 'say "hi"; bye', "A\u00e9", "one token"))
+
+    def test_parse_bind_rejects_mx_without_preference(self):
+        records = parse_bind(["@ 300 IN MX mail.some_domain1.local."], domain_name="some_domain1.local")
+
+        assert_that(calling(list).with_args(records), raises(ZoneFileException, "line 1"))
+
+    def test_parse_jsonl(self):
+        lines = ['{"name": "home", "type": "a", "content": "10.0.0.1"}', "", '{"name": "www"}']
+
+        records = parse_jsonl(lines, default_ttl=60)
+
+        assert_that(next(records), equal_to(RecordSpec("home", RecordType.A, "10.0.0.1", 60)))
+        assert_that(calling(next).with_args(records), raises(ZoneFileException, "line 3"))
+
+    def test_import_command_only_writes_changes(self):
+        zone_path = self.write("zone.db", ZONE_FILE)
+
+        with self.mock:
+            status = cli.main(["--config", self.config_path, "import", zone_path, "--domain", "some_domain1.local",
+                               "--workers", "2"])
+
+        assert_that(status, equal_to(0))
+        # Session, login and zone fetch, then only the new content of "home" and the creation of "www"
+        assert_that(sorted(self.calls), contains_exactly("GET", "GET", "POST", "POST", "PUT"))
+
+    def test_record_set_is_created_into_an_empty_zone(self):
+        emulator = HoverEmulator()
+        emulator.add_domain("empty.local")
+        specs = [RecordSpec("www", RecordType.A, f"10.0.0.{index}", 300) for index in (1, 2, 3)]
+
+        with HTTMock(emulator.mock()), Connection(yaml.safe_load(test_config)) as connection:
+            connection.log_in()
+            # No latency: the first creations are back in the cached zone while the others are still planned
+            stats = import_records(connection, "empty.local", specs, max_workers=4)
+
+        assert_that(stats, has_properties(created=3, updated=0))
+        assert_that([record["content"] for record in emulator.records("empty.local").values()],
+                    contains_inanyorder("10.0.0.1", "10.0.0.2", "10.0.0.3"))
+
+    def test_record_set_does_not_replace_the_existing_value(self):
+        emulator = HoverEmulator()
+        emulator.add_domain("some.local", [dict(id="dns1", name="www", type="A", content="10.0.0.9", ttl=300)])
+        specs = [RecordSpec("www", RecordType.A, f"10.0.0.{index}", 300) for index in (1, 2)]
+
+        with HTTMock(emulator.mock()), Connection(yaml.safe_load(test_config)) as connection:
+            connection.log_in()
+            stats = import_records(connection, "some.local", specs, max_workers=2)
+
+        assert_that(stats, has_properties(created=2, updated=0))
+
+    def test_records_are_planned_as_they_are_read(self):
+        zone = Zone("some.local", [DnsRecord("dns1", "some.local", "www", RecordType.A, "10.0.0.9", 300)])
+        read = []
+
+        def specs():
+            for index in range(1000):
+                read.append(index)
+                yield RecordSpec(f"host{index}", RecordType.A, f"10.0.{index // 250}.{index % 250}", 300)
+
+        changes = plan_changes(zone, specs(), ImportStats())
+        next(changes)
+
+        assert_that(len(read), equal_to(2))
+
+    def test_scattered_record_set_is_counted_by_a_first_pass(self):
+        zone = Zone("some.local", [DnsRecord("dns1", "some.local", "www", RecordType.A, "10.0.0.9", 300)])
+        specs = [RecordSpec("www", RecordType.A, "10.0.0.1", 300), RecordSpec("mail", RecordType.A, "10.0.0.5", 300),
+                 RecordSpec("www", RecordType.A, "10.0.0.2", 300)]
+
+        changes = list(plan_changes(zone, iter(specs), ImportStats(), set_sizes=record_set_sizes(specs)))
+
+        assert_that([change.is_create for change in changes], contains_exactly(True, True, True))
@@ -0,0 +1,44 @@
+import os
+from unittest import TestCase
+
+from hamcrest import assert_that, is_not, has_item, less_than, has_key
+
+from testkit.import_time import measure_imports, total_import_time
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config.example.yml")
+
+HEAVY_MODULES = ("requests", "urllib3", "yaml", "asyncio", "orjson")
+
+# Import budget of a short-lived script loading its configuration, in microseconds. Generous on purpose: it catches
+# heavy imports creeping back in, not scheduling noise (a regression to eager imports costs 100ms+)
+STARTUP_BUDGET_US = 30000
+
+
+class TestImportTime(TestCase):
+    def test_package_import_does_not_load_heavy_dependencies(self):
+        imports = measure_imports("import hoverconnector")
+
+        for module in HEAVY_MODULES:
+            assert_that(imports, is_not(has_key(module)))
+
+    def test_configuration_is_loaded_without_yaml(self):
+        imports = measure_imports(f"from hoverconnector.config import load_configuration; "
+                                  f"load_configuration({EXAMPLE!r})")
+
+        assert_that(imports, is_not(has_key("yaml")))
+
+    def test_models_do_not_need_requests(self):
+        imports = measure_imports("from hoverconnector.models import DnsRecord; from hoverconnector import RecordType")
+
+        for module in HEAVY_MODULES:
+            assert_that(imports, is_not(has_key(module)))
+
+    def test_connection_is_imported_on_first_access(self):
+        imports = measure_imports("import hoverconnector; hoverconnector.Connection")
+
+        assert_that(list(imports), has_item("requests"))
+
+    def test_startup_budget(self):
+        elapsed_us = total_import_time("import hoverconnector; from hoverconnector.config import load_configuration")
+
+        assert_that(elapsed_us, less_than(STARTUP_BUDGET_US))
@@ -0,0 +1,104 @@
+import json
+from unittest import TestCase
+
+import requests
+import yaml
+from hamcrest import assert_that, equal_to, has_entries, contains_exactly, has_properties, contains_string, \
+    greater_than, calling, raises
+from httmock import HTTMock, urlmatch
+
+from hoverconnector.connection import Connection
+from hoverconnector.instrumentation import MetricsAggregator, RequestEvent
+from hoverconnector.retry import RetryPolicy
+from testkit.configuration import test_config
+from testkit.hover_emulator import HoverEmulator, Faults
+
+DOMAIN = "some_domain1.local"
+
+
+class TestInstrumentation(TestCase):
+    def setUp(self) -> None:
+        self.faults = Faults()
+        self.mock = HTTMock(HoverEmulator.with_fixtures(faults=self.faults).mock())
+        self.mock.__enter__()
+        self.events = []
+        configuration = yaml.safe_load(test_config)
+        configuration["cache"] = dict(enabled=True)
+        self.connection = Connection(configuration, hooks=[self.events.append],
+                                     retry_policy=RetryPolicy(sleep=lambda seconds: None))
+
+    def tearDown(self) -> None:
+        self.connection.close()
+        self.mock.__exit__(None, None, None)
+
+    def test_events_describe_every_call(self):
+        self.connection.log_in()
+        self.connection.get_domain(DOMAIN)
+        self.connection.get_domain(DOMAIN)
+        self.connection.update_entry(domain_name=DOMAIN, dns_entry_id="dns1234565", name="home", content="10.0.0.9")
+
+        assert_that([(event.endpoint, event.status_code, event.cache_hit) for event in self.events], contains_exactly(
+            ("establish", 200, None), ("login", 200, None), ("get_domain", 200, False), ("get_domain", 200, True),
+            ("update_entry", 200, None)))
+        assert_that(self.events[-1], has_properties(method="PUT", request_bytes=greater_than(0),
+                                                    response_bytes=greater_than(0), retries=0))
+
+    def test_retries_are_counted(self):
+        self.connection.log_in()
+        self.faults.fail_next(2)
+
+        self.connection.list_domains()
+
+        assert_that(self.events[-1], has_properties(endpoint="list_domains", status_code=200, retries=2))
+
+    def test_failures_are_reported_and_raised(self):
+        @urlmatch(path="/api/control_panel/domains")
+        def unreachable(url, request):
+            raise requests.ConnectionError("connection refused")
+
+        self.connection.retry_policy = None
+        with HTTMock(unreachable):
+            assert_that(calling(self.connection.list_domains), raises(requests.ConnectionError))
+
+        assert_that(self.events[-1], has_properties(status_code=None, error="ConnectionError"))
+
+    def test_failing_hooks_do_not_break_calls(self):
+        def broken(event):
+            raise ValueError("broken hook")
+
+        self.connection.add_hook(broken)
+        assert_that(self.connection.log_in().status_code, equal_to(200))
+
+        self.connection.remove_hook(broken)
+        assert_that(self.connection.hooks, contains_exactly(self.events.append))
+
+
+class TestMetricsAggregator(TestCase):
+    def setUp(self) -> None:
+        self.metrics = MetricsAggregator()
+        for latency in (0.01, 0.02, 0.3):
+            self.metrics(RequestEvent("get_domain", "GET", "url", 200, latency, response_bytes=100,
+                                      cache_hit=False))
+        self.metrics(RequestEvent("get_domain", "GET", "url", 200, 0.0, response_bytes=100, cache_hit=True))
+        self.metrics(RequestEvent("update_entry", "PUT", "url", 503, 1.5, request_bytes=80, retries=2))
+        self.metrics(RequestEvent("update_entry", "PUT", "url", None, 5.0, error="Timeout"))
+
+    def test_summary(self):
+        summary = json.loads(self.metrics.to_json())
+
+        assert_that(summary["get_domain"], has_entries(calls=3, errors=0, response_bytes=300,
+                                                       cache=has_entries(hits=1, misses=3),
+                                                       latency=has_entries(p50=0.02, p99=0.3)))
+        assert_that(summary["update_entry"], has_entries(calls=2, errors=2, retries=2, request_bytes=80,
+                                                         statuses=has_entries({"503": 1, "error": 1})))
+
+    def test_prometheus_text(self):
+        text = self.metrics.to_prometheus()
+
+        assert_that(text, contains_string('hoverconnector_requests_total{endpoint="update_entry",status="503"} 1'))
+        assert_that(text, contains_string(
+            'hoverconnector_request_duration_seconds_bucket{endpoint="get_domain",le="0.025"} 2'))
+        assert_that(text, contains_string(
+            'hoverconnector_request_duration_seconds_bucket{endpoint="get_domain",le="+Inf"} 3'))
+        assert_that(text, contains_string('hoverconnector_cache_lookups_total{endpoint="get_domain",result="hit"} 1'))
+        assert_that(text.count("# TYPE hoverconnector_requests_total counter"), equal_to(1))
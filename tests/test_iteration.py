@@ -0,0 +1,74 @@
+import re
+from unittest import TestCase
+
+import yaml
+from hamcrest import assert_that, equal_to, contains_exactly, contains_inanyorder, calling, raises, \
+    less_than_or_equal_to, instance_of, has_properties, all_of
+from httmock import HTTMock
+
+from hoverconnector.connection import Connection
+from hoverconnector.exceptions import HoverResponseException
+from hoverconnector.models import Domain
+from hoverconnector.record_type import RecordType
+from testkit.configuration import test_config
+from testkit.hover_emulator import HoverEmulator
+from testkit.hover_mock import HOVER_DOMAIN_DETAILS
+
+DOMAINS = [f"domain{index}.local" for index in range(10)]
+
+
+class TestIteration(TestCase):
+    def setUp(self) -> None:
+        self.emulator = HoverEmulator()
+        for domain_name in DOMAINS:
+            self.emulator.add_domain(domain_name, HOVER_DOMAIN_DETAILS["domain"]["dns"], details=dict(status="active"))
+        self.emulator.add_domain("expired.local", HOVER_DOMAIN_DETAILS["domain"]["dns"], details=dict(status="expired"))
+        self.mock = HTTMock(self.emulator.mock())
+        self.mock.__enter__()
+        self.connection = Connection(yaml.safe_load(test_config))
+        self.connection.log_in()
+
+    def tearDown(self) -> None:
+        self.connection.close()
+        self.mock.__exit__(None, None, None)
+
+    def zone_requests(self) -> int:
+        return sum(count for (method, path), count in self.emulator.requests.items()
+                   if method == "GET" and path.endswith("/dns"))
+
+    def test_iter_domains(self):
+        domains = list(self.connection.iter_domains(status="expired"))
+
+        assert_that(domains, contains_exactly(all_of(instance_of(Domain), has_properties(name="expired.local"))))
+        assert_that(list(self.connection.iter_domains()),
+                    contains_inanyorder(*[has_properties(name=name) for name in DOMAINS + ["expired.local"]]))
+
+    def test_records_of_every_domain_are_filtered(self):
+        records = list(self.connection.iter_records(record_type=RecordType.A, status="active"))
+
+        assert_that([record.domain_name for record in records], contains_exactly(*DOMAINS))
+        assert_that({(record.name, record.record_type) for record in records}, equal_to({("home", RecordType.A)}))
+
+    def test_name_patterns(self):
+        globbed = self.connection.iter_records(domain="domain1.local", name="auto*")
+        searched = self.connection.iter_records(domain=["domain1.local", "domain2.local"], name=re.compile("^h"),
+                                                record_type=[RecordType.A, RecordType.CNAME])
+
+        assert_that([record.name for record in globbed], contains_exactly("autodiscover"))
+        assert_that([(record.domain_name, record.name) for record in searched],
+                    contains_exactly(("domain1.local", "home"), ("domain2.local", "home")))
+
+    def test_zones_are_fetched_ahead_within_the_prefetch_window(self):
+        records = self.connection.iter_records(prefetch=2)
+
+        first = next(records)
+        records.close()
+
+        assert_that(first.domain_name, equal_to(DOMAINS[0]))
+        assert_that(self.zone_requests(), less_than_or_equal_to(2))
+
+    def test_failed_zone_fetch_is_raised(self):
+        records = self.connection.iter_records(domain=["domain1.local", "unknown.local"])
+
+        assert_that(next(records).domain_name, equal_to("domain1.local"))
+        assert_that(calling(list).with_args(records), raises(HoverResponseException))
@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+import yaml
+from hamcrest import assert_that, equal_to, has_entries, has_length, has_properties, only_contains, contains_exactly, \
+    none
+from httmock import HTTMock
+
+from hoverconnector.batch import EntryChange
+from hoverconnector.connection import Connection
+from hoverconnector.journal import WriteJournal, change_key
+from hoverconnector.record_type import RecordType
+from testkit.configuration import test_config
+from testkit.hover_emulator import HoverEmulator
+
+CREATE_ENTRY = ("POST", "/api/control_panel/dns")
+UPDATE_ENTRY = ("PUT", "/api/control_panel/dns")
+
+CHANGES = [
+    EntryChange("some_domain1.local", "www", RecordType.A, "10.0.0.1", 300),
+    EntryChange("some_domain1.local", "@", RecordType.TXT, "v=spf1 -all", 300),
+    EntryChange("some_domain1.local", "home", RecordType.A, "10.0.0.9", dns_entry_id="dns1234565"),
+]
+
+
+class TestWriteJournal(TestCase):
+    def setUp(self) -> None:
+        self.emulator = HoverEmulator.with_fixtures()
+        self.mock = HTTMock(self.emulator.mock())
+        self.mock.__enter__()
+        self.connection = Connection(yaml.safe_load(test_config))
+        self.connection.log_in()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "journal.jsonl")
+
+    def tearDown(self) -> None:
+        self.connection.close()
+        self.mock.__exit__(None, None, None)
+        self.directory.cleanup()
+
+    def interrupted_batch(self, changes: list) -> str:
+        # The process died while the batch was being applied: the journal has no "finished" entry
+        with WriteJournal(self.path) as journal:
+            batch = journal.start_batch()
+            results = list(journal.apply(self.connection, changes, batch=batch))
+        with open(self.path) as f:
+            lines = [line for line in f if '"finished"' not in line]
+        with open(self.path, "w") as f:
+            f.writelines(lines)
+        assert_that([result.ok for result in results], only_contains(True))
+        return batch
+
+    def test_writes_and_created_ids_are_journaled(self):
+        with WriteJournal(self.path) as journal:
+            batch = journal.start_batch()
+            results = list(journal.apply(self.connection, CHANGES, batch=batch))
+
+        assert_that([result.ok for result in results], only_contains(True))
+        created = self.connection.get_zone("some_domain1.local", refresh=True).find_one("www", RecordType.A)
+        journal = WriteJournal(self.path)
+        assert_that(journal.completed, has_entries({change_key(batch, 0, CHANGES[0]): created.id,
+                                                   change_key(batch, 2, CHANGES[2]): "dns1234565"}))
+        assert_that(journal.in_doubt, has_length(0))
+        assert_that(journal.unfinished_batch, none())
+
+    def test_request_payloads_are_journaled(self):
+        with WriteJournal(self.path) as journal:
+            list(journal.apply(self.connection, CHANGES[2:]))
+
+        with open(self.path) as f:
+            planned = [json.loads(line) for line in f if '"planned"' in line]
+        assert_that(planned[0]["request"], has_entries(fields={"content": "10.0.0.9"}))
+
+    def test_resumed_run_skips_completed_writes(self):
+        self.interrupted_batch(CHANGES[:2])
+        self.emulator.requests.clear()
+
+        with WriteJournal(self.path) as journal:
+            results = list(journal.apply(self.connection, CHANGES))
+
+        assert_that([result.skipped for result in results], contains_exactly(True, True, False))
+        assert_that(self.emulator.requests[CREATE_ENTRY], equal_to(0))
+        assert_that(self.emulator.requests[UPDATE_ENTRY], equal_to(1))
+
+    def test_creation_in_doubt_is_looked_up_instead_of_sent_again(self):
+        # The process died after Hover created the record, before the response was journaled
+        with WriteJournal(self.path) as journal:
+            batch = journal.start_batch()
+            journal.record_planned(change_key(batch, 0, CHANGES[0]), CHANGES[0])
+            journal.record_planned(change_key(batch, 1, CHANGES[1]), CHANGES[1])
+        self.connection.apply_change(CHANGES[0])
+        self.emulator.requests.clear()
+
+        with WriteJournal(self.path) as journal:
+            assert_that(journal.in_doubt, has_length(2))
+            results = list(journal.apply(self.connection, CHANGES[:2]))
+
+        assert_that(results[0], has_properties(skipped=True))
+        assert_that(results[1], has_properties(skipped=False, ok=True))
+        assert_that(self.emulator.requests[CREATE_ENTRY], equal_to(1))
+
+    def test_same_change_in_a_later_batch_is_applied_again(self):
+        back = EntryChange("some_domain1.local", "home", RecordType.A, "10.0.0.1", dns_entry_id="dns1234565")
+        with WriteJournal(self.path) as journal:
+            list(journal.apply(self.connection, [back]))
+            list(journal.apply(self.connection, [CHANGES[2]]))
+            results = list(journal.apply(self.connection, [back]))
+
+        assert_that(results[0].skipped, equal_to(False))
+        assert_that(self.emulator.requests[UPDATE_ENTRY], equal_to(3))
+        assert_that(self.emulator.records("some_domain1.local"),
+                    has_entries(dns1234565=has_entries(content="10.0.0.1")))
+
+    def test_truncated_last_line_is_ignored(self):
+        with WriteJournal(self.path) as journal:
+            list(journal.apply(self.connection, CHANGES[:1]))
+        with open(self.path, "a") as f:
+            f.write('{"state":"planned","ke')
+
+        assert_that(WriteJournal(self.path).completed, has_length(1))
+
+    def test_failed_writes_are_sent_again(self):
+        unknown = EntryChange("some_domain1.local", "home", RecordType.A, "10.0.0.9", dns_entry_id="unknown")
+        with WriteJournal(self.path) as journal:
+            assert_that(list(journal.apply(self.connection, [unknown]))[0].ok, equal_to(False))
+        self.emulator.requests.clear()
+
+        with WriteJournal(self.path) as journal:
+            list(journal.apply(self.connection, [unknown]))
+        assert_that(self.emulator.requests[UPDATE_ENTRY], equal_to(1))
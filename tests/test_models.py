@@ -0,0 +1,29 @@
+from unittest import TestCase
+
+from hamcrest import assert_that, equal_to, contains_exactly, has_properties
+
+from hoverconnector.models import parse_domains, parse_records, DnsRecord
+from hoverconnector.record_type import RecordType
+from testkit.hover_mock import HOVER_LIST_DOMAINS, HOVER_DOMAIN_DETAILS
+
+
+class TestModels(TestCase):
+    def test_parse_domains(self):
+        domains = parse_domains(HOVER_LIST_DOMAINS)
+
+        assert_that(domains, contains_exactly(
+            has_properties(id="domain-some_domain1.local", name="some_domain1.local", status="active",
+                           expiry_date="2022-05-19", autorenew=False, locked=True,
+                           nameservers=("ns1.hover.com", "ns2.hover.com")),
+            has_properties(name="some_domain2.local"),
+        ))
+        assert_that(domains[0].nameservers is domains[1].nameservers, equal_to(True))
+
+    def test_parse_records(self):
+        records = parse_records(HOVER_DOMAIN_DETAILS)
+
+        assert_that(len(records), equal_to(5))
+        assert_that(records[4], equal_to(DnsRecord("dns1234565", "some_domain1.local", "home", RecordType.A,
+                                                   "127.0.0.1", 300)))
+        assert_that(records[3], has_properties(record_type=RecordType.MX, can_revert=True))
+        assert_that(hasattr(records[0], "__dict__"), equal_to(False))
@@ -0,0 +1,74 @@
+from unittest import TestCase
+
+import yaml
+from hamcrest import assert_that, equal_to, close_to, has_properties
+from httmock import HTTMock
+from requests import Response
+
+from hoverconnector.connection import Connection
+from hoverconnector.rate_limiter import AdaptiveRateLimiter
+from testkit.configuration import test_config
+from testkit.hover_mock import http_mock_domains
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def response_with(status_code: int, headers: dict = None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+class TestAdaptiveRateLimiter(TestCase):
+    def setUp(self) -> None:
+        self.time = FakeTime()
+
+    def limiter(self, **kwargs) -> AdaptiveRateLimiter:
+        return AdaptiveRateLimiter(clock=self.time.clock, sleep=self.time.sleep, **kwargs)
+
+    def test_burst_then_steady_rate(self):
+        limiter = self.limiter(rate=10, burst=5)
+
+        for _ in range(5):
+            assert_that(limiter.acquire(), equal_to(0.0))
+        for _ in range(10):
+            limiter.acquire()
+
+        assert_that(self.time.now, close_to(1.0, 0.001))
+
+    def test_backs_off_on_throttling_and_ramps_up_after_successes(self):
+        limiter = self.limiter(rate=8, burst=1, min_rate=1, ramp_up_factor=2, ramp_up_after=3)
+
+        limiter.feedback(response_with(429, {"Retry-After": "5"}))
+        assert_that(limiter.rate, equal_to(4))
+        limiter.acquire()
+        assert_that(self.time.now, close_to(5.0, 0.001))
+
+        for _ in range(3):
+            limiter.feedback(response_with(200))
+        assert_that(limiter.rate, equal_to(8))
+
+        for _ in range(10):
+            limiter.feedback(response_with(503))
+        assert_that(limiter.rate, equal_to(1))
+
+    def test_connection_calls_go_through_configured_limiter(self):
+        config = yaml.safe_load(test_config)
+        config["rate_limit"] = dict(enabled=True, rate=2, burst=1, ramp_up_after=1)
+        connection = Connection(configuration=config)
+        connection.cookies.set("hoverauth", "HOVERAUTH")
+
+        with HTTMock(http_mock_domains):
+            connection.list_domains()
+
+        assert_that(connection.rate_limiter, has_properties(rate=2, _successes=1, _tokens=close_to(0, 0.1)))
@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+import yaml
+from hamcrest import assert_that, equal_to, contains_exactly, contains_inanyorder, has_properties
+from httmock import HTTMock, urlmatch
+
+from hoverconnector.connection import Connection
+from hoverconnector.reconciler import ZoneReconciler, RecordSpec, RecordUpdate
+from hoverconnector.record_type import RecordType
+from testkit.configuration import test_config
+from testkit.hover_mock import http_mock_domain, http_mock_entry_update, http_mock_entry_create, HOVER_TEST_DOMAIN
+
+DESIRED = [
+    RecordSpec("@", RecordType.TXT, "MS=ms12345678", 900),
+    RecordSpec("@", RecordType.TXT, "v=spf1 include:spf.protection.outlook.com ~all", 900),
+    RecordSpec("autodiscover", RecordType.CNAME, "autodiscover.outlook.com", 300),
+    RecordSpec("home", RecordType.A, "127.0.0.1", 300),
+    RecordSpec("www", RecordType.A, "127.0.0.2", 300),
+]
+
+
+class TestZoneReconciler(TestCase):
+    def setUp(self) -> None:
+        self.connection = Connection(configuration=yaml.safe_load(test_config))
+        self.connection.cookies.set("hoverauth", "HOVERAUTH")
+
+    def test_plan_computes_minimal_diff(self):
+        with HTTMock(http_mock_domain):
+            plan = ZoneReconciler(self.connection).plan("some_domain1.local", DESIRED)
+
+        assert_that(plan.updates, contains_inanyorder(
+            RecordUpdate("dns1234562", "@", RecordType.TXT, content="v=spf1 include:spf.protection.outlook.com ~all"),
+            RecordUpdate("dns1234563", "autodiscover", RecordType.CNAME, ttl=300),
+        ))
+        assert_that(plan.creates, contains_exactly(RecordSpec("www", RecordType.A, "127.0.0.2", 300)))
+        assert_that(plan.removals, contains_exactly(has_properties(id="dns1234564", record_type=RecordType.MX)))
+        assert_that(len(plan.unchanged), equal_to(2))
+
+    def test_apply_only_calls_for_changes(self):
+        calls = []
+
+        @urlmatch(netloc=HOVER_TEST_DOMAIN, path="/api/control_panel/dns")
+        def count_writes(url, request):
+            calls.append(request.method)
+
+        with HTTMock(http_mock_domain):
+            reconciler = ZoneReconciler(self.connection)
+            plan = reconciler.plan("some_domain1.local", DESIRED[:1] + DESIRED[3:])
+
+        with HTTMock(count_writes, http_mock_entry_update, http_mock_entry_create):
+            responses = reconciler.apply(plan)
+
+        assert_that(calls, contains_exactly("POST"))
+        assert_that([response.status_code for response in responses], contains_exactly(200))
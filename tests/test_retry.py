@@ -0,0 +1,58 @@
+from unittest import TestCase
+
+import requests
+import yaml
+from hamcrest import assert_that, equal_to, calling, raises, contains_exactly
+from httmock import HTTMock, urlmatch, response
+
+from hoverconnector.connection import Connection
+from hoverconnector.record_type import RecordType
+from hoverconnector.retry import RetryPolicy
+from testkit.configuration import test_config
+from testkit.hover_mock import HOVER_TEST_DOMAIN, http_mock_entry_update, http_mock_domains
+
+
+def flaky(path: str, failures: list):
+    @urlmatch(netloc=HOVER_TEST_DOMAIN, path=path)
+    def handler(url, request):
+        if failures:
+            failure = failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return response(status_code=failure, request=request)
+
+    return handler
+
+
+class TestRetryPolicy(TestCase):
+    def setUp(self) -> None:
+        self.sleeps = []
+        self.policy = RetryPolicy(max_attempts=4, backoff_base=1, backoff_cap=3, jitter=False,
+                                  sleep=self.sleeps.append)
+
+    def test_backoff_is_exponential_and_capped(self):
+        assert_that([self.policy.backoff(attempt) for attempt in range(1, 5)], contains_exactly(1, 2, 3, 3))
+
+    def test_gives_up_after_max_attempts(self):
+        def always_reset(attempt):
+            raise requests.ConnectionError("connection reset")
+
+        assert_that(calling(self.policy.execute).with_args(always_reset), raises(requests.ConnectionError))
+        assert_that(self.sleeps, contains_exactly(1, 2, 3))
+
+    def test_reads_are_retried_and_writes_only_on_request(self):
+        connection = Connection(configuration=yaml.safe_load(test_config), retry_policy=self.policy)
+        connection.cookies.set("hoverauth", "HOVERAUTH")
+
+        with HTTMock(flaky("/api/control_panel/domains", [502, requests.ConnectionError("reset")]), http_mock_domains):
+            assert_that(connection.list_domains().status_code, equal_to(200))
+        assert_that(self.sleeps, contains_exactly(1, 2))
+
+        with HTTMock(flaky("/api/control_panel/dns", [503]), http_mock_entry_update):
+            arguments = dict(domain_name="some_domain1.local", dns_entry_id="dns1234567", name="hostname",
+                             record_type=RecordType.A, content="127.0.0.1", ttl=300)
+            assert_that(connection.update_entry(**arguments).status_code, equal_to(503))
+            assert_that(connection.update_entry(**arguments).status_code, equal_to(200))
+
+        with HTTMock(flaky("/api/control_panel/dns", [503]), http_mock_entry_update):
+            assert_that(connection.update_entry(retry=True, **arguments).status_code, equal_to(200))
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+import yaml
+from hamcrest import assert_that, equal_to, none, has_entries, anything, contains_exactly
+from httmock import HTTMock, all_requests
+
+from hoverconnector.connection import Connection
+from hoverconnector.session_store import SessionStore
+from testkit.configuration import test_config
+from testkit.hover_mock import http_mock_signin
+
+
+class TestSessionStore(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.json")
+        self.calls = []
+
+        @all_requests
+        def record_call(url, request):
+            self.calls.append(request.method)
+
+        self.record_call = record_call
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def connection(self, max_age: float = None) -> Connection:
+        config = yaml.safe_load(test_config)
+        config["session_store"] = dict(path=self.path, max_age=max_age)
+        return Connection(configuration=config)
+
+    def test_authenticated_session_is_shared(self):
+        with HTTMock(self.record_call, http_mock_signin):
+            self.connection().log_in()
+            hover_response = self.connection().log_in()
+
+        assert_that(self.calls, contains_exactly("GET", "POST"))
+        assert_that(hover_response.status_code, none())
+        assert_that(hover_response.cookies, has_entries(dict(hoverauth=anything(), hover_device_id=anything())))
+
+    def test_expired_session_is_refreshed(self):
+        with HTTMock(self.record_call, http_mock_signin):
+            self.connection().log_in()
+            time.sleep(0.01)
+            connection = self.connection(max_age=0.001)
+            connection.log_in()
+
+        # The stale "hoverauth" is still accepted by Hover: the session check is enough and no login is posted
+        assert_that(self.calls, contains_exactly("GET", "POST", "GET"))
+        assert_that(SessionStore(self.path).load().saved_at > 0, equal_to(True))
+        assert_that(os.stat(self.path).st_mode & 0o777, equal_to(0o600))
+
+    def test_rejected_session_is_not_restored(self):
+        with HTTMock(self.record_call, http_mock_signin):
+            connection = self.connection()
+            connection.log_in()
+            connection.log_in(refresh=True)
+
+        # The refresh skips the stored session and logs in again from scratch
+        assert_that(self.calls, contains_exactly("GET", "POST", "GET", "POST"))
+        assert_that(SessionStore(self.path).load().cookies.get("hoverauth"), equal_to(connection.cookies["hoverauth"]))
+
+    def test_session_refreshed_by_another_process_is_restored(self):
+        with HTTMock(self.record_call, http_mock_signin):
+            connection = self.connection()
+            connection.log_in()
+        store = SessionStore(self.path)
+        stored = store.load()
+        stored.cookies.set("hoverauth", "REFRESHED", domain=connection.cookies.list_domains()[0])
+        store.save(stored.cookies)
+
+        with HTTMock(self.record_call, http_mock_signin):
+            connection.log_in(refresh=True)
+
+        assert_that(self.calls, contains_exactly("GET", "POST"))
+        assert_that(connection.cookies.get("hoverauth"), equal_to("REFRESHED"))
@@ -0,0 +1,101 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from hamcrest import assert_that, equal_to, has_properties, calling, raises, has_entries, only_contains
+
+from hoverconnector.connection import Connection
+from hoverconnector.instrumentation import MetricsAggregator
+from hoverconnector.single_flight import SingleFlight
+from testkit.hover_emulator import HoverEmulator, Faults, constant
+from testkit.hover_server import HoverServer
+
+GET_DOMAIN = ("GET", "/api/control_panel/some_domain1.local/dns")
+
+
+class TestSingleFlight(TestCase):
+    def test_concurrent_calls_share_the_leader_result(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def call():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "value"
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            leader = executor.submit(flight.do, "key", call)
+            started.wait(5)
+            followers = [executor.submit(flight.do, "key", call) for _ in range(3)]
+            while flight.stats.coalesced < 3:
+                release.wait(0.001)
+            release.set()
+
+            assert_that(leader.result(), equal_to(("value", False)))
+            assert_that([follower.result() for follower in followers], only_contains(("value", True)))
+        assert_that(calls, equal_to([1]))
+        assert_that(flight.stats, has_properties(calls=1, coalesced=3, in_flight=0))
+
+    def test_followers_get_the_leader_exception(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def call():
+            started.set()
+            release.wait(5)
+            raise ValueError("failed")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flight.do, "key", call)
+            started.wait(5)
+            follower = executor.submit(flight.do, "key", call)
+            while flight.stats.coalesced < 1:
+                release.wait(0.001)
+            release.set()
+
+            assert_that(calling(leader.result), raises(ValueError))
+            assert_that(calling(follower.result), raises(ValueError))
+
+    def test_sequential_calls_are_not_coalesced(self):
+        flight = SingleFlight()
+
+        assert_that(flight.do("key", lambda: 1), equal_to((1, False)))
+        assert_that(flight.do("key", lambda: 2), equal_to((2, False)))
+        assert_that(flight.stats, has_properties(calls=2, coalesced=0))
+
+
+class TestConnectionCoalescing(TestCase):
+    def setUp(self) -> None:
+        self.server = HoverServer(emulator=HoverEmulator.with_fixtures(Faults(latency=constant(0.2)))).start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def concurrent_get_domain(self, connection: Connection, count: int) -> list:
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            return list(executor.map(lambda _: connection.get_domain("some_domain1.local"), range(count)))
+
+    def test_concurrent_reads_share_one_request(self):
+        metrics = MetricsAggregator()
+        with Connection(self.server.configuration(), hooks=[metrics]) as connection:
+            connection.log_in()
+
+            responses = self.concurrent_get_domain(connection, 5)
+
+            assert_that([response.status_code for response in responses], only_contains(200))
+            assert_that(self.server.emulator.requests[GET_DOMAIN], equal_to(1))
+            assert_that(connection.single_flight.stats, has_properties(calls=1, coalesced=4))
+            assert_that(metrics.summary()["get_domain"], has_entries(calls=1, coalesced=4))
+
+    def test_coalescing_can_be_disabled(self):
+        with Connection(self.server.configuration(single_flight=dict(enabled=False))) as connection:
+            connection.log_in()
+
+            self.concurrent_get_domain(connection, 3)
+
+            assert_that(connection.single_flight, equal_to(None))
+            assert_that(self.server.emulator.requests[GET_DOMAIN], equal_to(3))
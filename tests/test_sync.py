@@ -0,0 +1,80 @@
+import multiprocessing
+from unittest import TestCase
+
+from hamcrest import assert_that, equal_to, contains_inanyorder, has_length, has_properties, close_to, \
+    contains_string
+
+from hoverconnector.rate_limiter import SharedRateLimiter
+from hoverconnector.record_type import RecordType
+from hoverconnector.sync import ShardedSync, shards
+from testkit.hover_emulator import HoverEmulator
+from testkit.hover_server import HoverServer
+
+LOG_IN = ("POST", "/signin/auth.json")
+DOMAIN_COUNT = 6
+
+
+def count_a_records(connection, zone) -> int:
+    return sum(1 for record in zone if record.record_type == RecordType.A)
+
+
+def fail_on_second_domain(connection, zone) -> int:
+    if zone.domain_name == "domain1.local":
+        raise ValueError("broken zone")
+    return 0
+
+
+def throttle(limiter: SharedRateLimiter) -> None:
+    limiter._rate = limiter._rate / 2
+
+
+class TestShardedSync(TestCase):
+    def setUp(self) -> None:
+        emulator = HoverEmulator()
+        for index in range(DOMAIN_COUNT):
+            emulator.add_domain(f"domain{index}.local", [
+                dict(name=f"host{record}", type="A", content=f"10.0.0.{record}", ttl=300)
+                for record in range(index)
+            ])
+        self.server = HoverServer(emulator=emulator).start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_zones_are_processed_by_the_workers(self):
+        sync = ShardedSync(self.server.configuration(), processes=2, shard_size=2)
+
+        results = list(sync.run(count_a_records))
+
+        assert_that([(result.domain_name, result.result) for result in results],
+                    contains_inanyorder(*[(f"domain{index}.local", index) for index in range(DOMAIN_COUNT)]))
+        assert_that(self.server.emulator.requests[LOG_IN], equal_to(1))
+
+    def test_errors_are_reported_per_domain(self):
+        sync = ShardedSync(self.server.configuration(), processes=2)
+
+        results = {result.domain_name: result for result in sync.run(fail_on_second_domain,
+                                                                      ["domain0.local", "domain1.local"])}
+
+        assert_that(results["domain0.local"], has_properties(ok=True, result=0))
+        assert_that(results["domain1.local"], has_properties(ok=False, error=contains_string("broken zone")))
+
+    def test_rate_limit_configuration_builds_a_shared_limiter(self):
+        sync = ShardedSync(dict(self.server.configuration(), rate_limit=dict(enabled=True, rate=50, burst=5)))
+
+        assert_that(sync.rate_limiter, has_properties(rate=50, burst=5))
+        assert_that(list(sync.run(count_a_records)), has_length(DOMAIN_COUNT))
+
+
+class TestSharedRateLimiter(TestCase):
+    def test_budget_is_shared_with_child_processes(self):
+        limiter = SharedRateLimiter(rate=8, burst=2)
+
+        process = multiprocessing.Process(target=throttle, args=(limiter,))
+        process.start()
+        process.join()
+
+        assert_that(limiter.rate, close_to(4, 0.001))
+
+    def test_shards(self):
+        assert_that(list(shards(["a", "b", "c"], 2)), equal_to([["a", "b"], ["c"]]))
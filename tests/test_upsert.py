@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+import yaml
+from hamcrest import assert_that, equal_to, none, contains_exactly, has_properties
+from httmock import HTTMock, all_requests
+
+from hoverconnector.connection import Connection
+from hoverconnector.models import DnsRecord
+from hoverconnector.record_type import RecordType
+from testkit.configuration import test_config
+from testkit.hover_emulator import HoverEmulator, Faults, constant
+from testkit.hover_mock import http_mock_domain, http_mock_entry_update, http_mock_entry_create
+
+
+class TestUpsert(TestCase):
+    def setUp(self) -> None:
+        self.connection = Connection(configuration=yaml.safe_load(test_config))
+        self.connection.cookies.set("hoverauth", "HOVERAUTH")
+        self.calls = []
+
+        @all_requests
+        def record_call(url, request):
+            self.calls.append(request.method)
+
+        self.mock = HTTMock(record_call, http_mock_domain, http_mock_entry_update, http_mock_entry_create)
+
+    def test_matching_record_is_left_alone(self):
+        with self.mock:
+            first = self.connection.upsert_entry("some_domain1.local", "home", RecordType.A, "127.0.0.1", 300)
+            second = self.connection.upsert_entry("some_domain1.local", "@", RecordType.TXT, "MS=ms12345678", 900)
+
+        assert_that(first, none())
+        assert_that(second, none())
+        assert_that(self.calls, contains_exactly("GET"))
+
+    def test_changed_record_is_updated_and_missing_record_created(self):
+        with self.mock:
+            updated = self.connection.upsert_entry("some_domain1.local", "home", RecordType.A, "10.0.0.1", 300)
+            created = self.connection.upsert_entry("some_domain1.local", "@", RecordType.TXT, "v=DKIM1", 900)
+            again = self.connection.upsert_entry("some_domain1.local", "home", RecordType.A, "10.0.0.1", 300)
+
+        assert_that(updated.status_code, equal_to(200))
+        assert_that(created.status_code, equal_to(200))
+        assert_that(again, none())
+        assert_that(self.calls, contains_exactly("GET", "PUT", "POST"))
+
+    def test_mx_record_is_matched_on_mail_server(self):
+        mail_server = "some-domain1.local.mail.protection.outlook.com"
+        with self.mock:
+            unchanged = self.connection.upsert_mx_entry("some_domain1.local", mail_server, ttl=900)
+            self.connection.upsert_mx_entry("some_domain1.local", mail_server, priority=10, ttl=900)
+            self.connection.upsert_mx_entry("some_domain1.local", "mx.fake_domain.com", priority=20, ttl=900)
+
+        assert_that(unchanged, none())
+        assert_that(self.calls, contains_exactly("GET", "PUT", "POST"))
+        assert_that(self.connection.get_zone("some_domain1.local").find("@", RecordType.MX), contains_exactly(
+            has_properties(content=f"10 {mail_server}"), has_properties(content="20 mx.fake_domain.com")
+        ))
+
+    def test_mx_record_without_content_is_not_matched(self):
+        with self.mock:
+            self.connection.get_zone("some_domain1.local").add(
+                DnsRecord("dns9", "some_domain1.local", "@", RecordType.MX, "", 900))
+            created = self.connection.upsert_mx_entry("some_domain1.local", "mx.fake_domain.com", ttl=900)
+
+        assert_that(created.status_code, equal_to(200))
+
+    def test_concurrent_upserts_create_the_record_once(self):
+        emulator = HoverEmulator.with_fixtures(Faults(latency=constant(0.01)))
+        with HTTMock(emulator.mock()), Connection(yaml.safe_load(test_config)) as connection:
+            connection.log_in()
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda _: connection.upsert_entry("some_domain1.local", "www", RecordType.A,
+                                                                    "10.0.0.1", 300), range(4)))
+
+        assert_that(emulator.requests[("POST", "/api/control_panel/dns")], equal_to(1))
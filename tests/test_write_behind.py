@@ -0,0 +1,127 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import yaml
+from hamcrest import assert_that, equal_to, has_entries, has_properties, has_length, calling, raises, \
+    only_contains, contains_inanyorder
+from httmock import HTTMock
+
+from hoverconnector.batch import EntryChange
+from hoverconnector.connection import Connection
+from hoverconnector.record_type import RecordType
+from hoverconnector.write_behind import WriteBehindQueue, merge
+from testkit.configuration import test_config
+from testkit.hover_emulator import HoverEmulator
+
+UPDATE_ENTRY = ("PUT", "/api/control_panel/dns")
+CREATE_ENTRY = ("POST", "/api/control_panel/dns")
+
+
+class TestWriteBehindQueue(TestCase):
+    def setUp(self) -> None:
+        self.emulator = HoverEmulator.with_fixtures()
+        self.mock = HTTMock(self.emulator.mock())
+        self.mock.__enter__()
+        self.connection = Connection(yaml.safe_load(test_config))
+        self.connection.log_in()
+
+    def tearDown(self) -> None:
+        self.connection.close()
+        self.mock.__exit__(None, None, None)
+
+    def test_writes_to_a_record_are_merged_last_write_wins(self):
+        with WriteBehindQueue(self.connection, delay=60) as queue:
+            futures = [queue.update_entry("some_domain1.local", "dns1234565", "home", content=f"10.0.0.{index}")
+                       for index in range(5)]
+            queue.update_entry("some_domain1.local", "dns1234565", "home", ttl=600)
+
+            assert_that(queue.stats, has_properties(submitted=6, merged=5, pending=1))
+            queue.flush()
+
+        assert_that([future.result().status_code for future in futures], only_contains(200))
+        assert_that(len(set(futures)), equal_to(5))
+        assert_that(self.emulator.requests[UPDATE_ENTRY], equal_to(1))
+        assert_that(self.emulator.records("some_domain1.local"),
+                    has_entries(dns1234565=has_entries(content="10.0.0.4", ttl=600)))
+
+    def test_pending_writes_are_flushed_after_the_delay(self):
+        queue = WriteBehindQueue(self.connection, delay=0.05)
+        first = queue.create_entry("some_domain1.local", "www", RecordType.A, "10.0.0.1", 300)
+        second = queue.create_entry("some_domain1.local", "www", RecordType.A, "10.0.0.2", 300)
+
+        assert_that(first.result(timeout=5).status_code, equal_to(200))
+        assert_that(second.result(timeout=5).status_code, equal_to(200))
+        queue.close()
+        assert_that(self.emulator.requests[CREATE_ENTRY], equal_to(2))
+        assert_that(queue.stats, has_properties(written=2, merged=0, pending=0))
+        assert_that([record["content"] for record in self.emulator.records("some_domain1.local").values()
+                     if record["name"] == "www"], contains_inanyorder("10.0.0.1", "10.0.0.2"))
+
+    def test_identical_creations_are_merged(self):
+        with WriteBehindQueue(self.connection, delay=60) as queue:
+            queue.create_entry("some_domain1.local", "www", RecordType.A, "10.0.0.1", 300)
+            queue.create_entry("some_domain1.local", "www", RecordType.A, "10.0.0.1", 300)
+
+            assert_that(queue.stats, has_properties(merged=1, pending=1))
+
+    def test_full_queue_is_flushed_without_waiting(self):
+        queue = WriteBehindQueue(self.connection, delay=60, max_pending=2)
+        first = queue.create_entry("some_domain1.local", "www", RecordType.A, "10.0.0.1", 300)
+        second = queue.create_entry("some_domain1.local", "mail", RecordType.A, "10.0.0.2", 300)
+
+        assert_that(first.result(timeout=5).status_code, equal_to(200))
+        assert_that(second.result(timeout=5).status_code, equal_to(200))
+        queue.close()
+
+    def test_cancelled_writes_are_not_sent(self):
+        with WriteBehindQueue(self.connection, delay=60) as queue:
+            first = queue.update_entry("some_domain1.local", "dns1234565", "home", content="10.0.0.8")
+            second = queue.update_entry("some_domain1.local", "dns1234565", "home", content="10.0.0.9")
+            first.cancel()
+            second.cancel()
+
+            assert_that(queue.flush(), has_length(0))
+        assert_that(self.emulator.requests[UPDATE_ENTRY], equal_to(0))
+
+    def test_merged_write_is_sent_while_a_caller_still_waits(self):
+        with WriteBehindQueue(self.connection, delay=60) as queue:
+            cancelled = queue.update_entry("some_domain1.local", "dns1234565", "home", content="10.0.0.8")
+            waiting = queue.update_entry("some_domain1.local", "dns1234565", "home", content="10.0.0.9")
+            cancelled.cancel()
+            queue.flush()
+
+        assert_that(waiting.result().status_code, equal_to(200))
+        assert_that(cancelled.cancelled(), equal_to(True))
+        assert_that(self.emulator.records("some_domain1.local"),
+                    has_entries(dns1234565=has_entries(content="10.0.0.9")))
+
+    def test_pending_writes_are_flushed_at_exit(self):
+        queue = WriteBehindQueue(self.connection, delay=60)
+        with patch("atexit.register") as register:
+            future = queue.update_entry("some_domain1.local", "dns1234565", "home", content="10.0.0.9")
+        exit_handler = register.call_args.args[0]
+
+        exit_handler()
+
+        assert_that(future.result(timeout=0).status_code, equal_to(200))
+
+    def test_closed_queue_rejects_writes(self):
+        queue = WriteBehindQueue(self.connection)
+        queue.close()
+
+        assert_that(calling(queue.update_entry).with_args("some_domain1.local", "dns1234565", "home", content="x"),
+                    raises(RuntimeError))
+
+    def test_multi_value_creations_are_kept_apart(self):
+        with WriteBehindQueue(self.connection, delay=60) as queue:
+            queue.create_entry("some_domain1.local", "@", RecordType.TXT, "first", 300)
+            queue.create_entry("some_domain1.local", "@", RecordType.TXT, "second", 300)
+
+            assert_that(queue.stats, has_properties(merged=0, pending=2))
+
+    def test_merge_keeps_fields_left_out_by_the_last_update(self):
+        pending = EntryChange("some_domain1.local", "home", RecordType.A, content="10.0.0.1", ttl=300,
+                              dns_entry_id="dns1")
+        change = EntryChange("some_domain1.local", "home", RecordType.A, ttl=600, dns_entry_id="dns1")
+
+        assert_that(merge(pending, change), has_properties(content="10.0.0.1", ttl=600))
@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+import yaml
+from hamcrest import assert_that, equal_to, contains_exactly, has_properties, empty, none
+from httmock import HTTMock
+
+from hoverconnector.connection import Connection
+from hoverconnector.record_type import RecordType
+from hoverconnector.zone import Zone
+from testkit.configuration import test_config
+from testkit.hover_mock import HOVER_DOMAIN_DETAILS, http_mock_domain, http_mock_entry_update, \
+    http_mock_entry_create
+
+
+class TestZone(TestCase):
+    def test_indexes(self):
+        zone = Zone.from_response(HOVER_DOMAIN_DETAILS)
+
+        assert_that(len(zone), equal_to(5))
+        assert_that(zone.get("dns1234565"), has_properties(name="home", content="127.0.0.1"))
+        assert_that([record.id for record in zone.find("@", RecordType.TXT)],
+                    contains_exactly("dns1234561", "dns1234562"))
+        assert_that(zone.find_one("@", RecordType.TXT, content="MS=ms12345678"), has_properties(id="dns1234561"))
+        assert_that(zone.with_content("autodiscover.outlook.com"), contains_exactly(has_properties(id="dns1234563")))
+
+    def test_indexes_follow_changes(self):
+        zone = Zone.from_response(HOVER_DOMAIN_DETAILS)
+
+        zone.update("dns1234565", content="10.0.0.1", ttl=60)
+        zone.remove("dns1234563")
+
+        assert_that(zone.with_content("127.0.0.1"), empty())
+        assert_that(zone.find_one("home", RecordType.A), has_properties(content="10.0.0.1", ttl=60))
+        assert_that(zone.find("autodiscover", RecordType.CNAME), empty())
+        assert_that(zone.get("dns1234563"), none())
+
+    def test_connection_keeps_zone_up_to_date(self):
+        connection = Connection(configuration=yaml.safe_load(test_config))
+        connection.cookies.set("hoverauth", "HOVERAUTH")
+
+        with HTTMock(http_mock_domain, http_mock_entry_update, http_mock_entry_create):
+            zone = connection.get_zone("some_domain1.local")
+            connection.update_entry(domain_name="some_domain1.local", dns_entry_id="dns1234565", name="home",
+                                    content="10.0.0.1", ttl=300)
+            connection.create_entry(domain_name="some_domain1.local", name="www", record_type=RecordType.A,
+                                    content="10.0.0.2", ttl=300)
+
+        assert_that(connection.get_zone("some_domain1.local") is zone, equal_to(True))
+        assert_that(zone.find_one("home", RecordType.A), has_properties(content="10.0.0.1"))
+        assert_that(zone.find_one("www", RecordType.A), has_properties(id="dns1234567", content="10.0.0.2"))
@@ -0,0 +1,19 @@
+test_config = """
+        credential:
+            username: my_username
+            password: my_password
+        endpoints:
+            protocol: http
+            base: fake_hover.local
+            establish: /signin
+            login: /signin/auth.json
+            list_domains: /api/control_panel/domains
+            list_entries: /api/control_panel/{domain}/dns
+            update_entry: &update_entry /api/control_panel/dns
+            create_entry: *update_entry
+        session:
+            pool_connections: 4
+            pool_maxsize: 8
+            connect_timeout: 2
+            read_timeout: 10
+        """
@@ -0,0 +1,219 @@
+import copy
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from http.cookies import SimpleCookie
+from typing import Callable, Dict, Iterable, NamedTuple, Optional
+
+from httmock import all_requests, response
+from requests import PreparedRequest
+
+from testkit.hover_mock import HOVER_LIST_DOMAINS, HOVER_DOMAIN_DETAILS, validate_credentials
+
+DOMAIN_PATH = re.compile(r"^/api/control_panel/(?P<domain>[^/]+)/dns$")
+UNAUTHENTICATED = {"succeeded": False, "error_code": "login", "error": "You must login first"}
+
+
+def constant(seconds: float) -> Callable[[], float]:
+    return lambda: seconds
+
+
+def uniform(low: float, high: float, seed: int = None) -> Callable[[], float]:
+    generator = random.Random(seed)
+    return lambda: generator.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float = 0.5, seed: int = None) -> Callable[[], float]:
+    # Long-tailed, like real API latencies: most calls close to the median, a few much slower
+    generator = random.Random(seed)
+    return lambda: median * generator.lognormvariate(0, sigma)
+
+
+class EmulatorResponse(NamedTuple):
+    status_code: int
+    content: Optional[dict] = None
+    cookies: Optional[dict] = None
+    headers: Optional[dict] = None
+
+
+class Faults:
+    def __init__(self, latency: Callable[[], float] = None, error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 retry_after: float = None, session_lifetime: float = None, seed: int = None) -> None:
+        super().__init__()
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.session_lifetime = session_lifetime
+        self.random = random.Random(seed)
+        self.scheduled = deque()
+        self.lock = threading.Lock()
+
+    def fail_next(self, count: int = 1, status_code: int = 503) -> None:
+        with self.lock:
+            self.scheduled.extend([status_code] * count)
+
+    def injected_status(self) -> Optional[int]:
+        with self.lock:
+            if self.scheduled:
+                return self.scheduled.popleft()
+            draw = self.random.random()
+        if draw < self.throttle_rate:
+            return 429
+        if draw < self.throttle_rate + self.error_rate:
+            return 503
+        return None
+
+
+class HoverEmulator:
+    def __init__(self, faults: Faults = None) -> None:
+        super().__init__()
+        self.faults = faults or Faults()
+        self.lock = threading.Lock()
+        self.domains: Dict[str, Dict[str, dict]] = {}
+        self.domain_details: Dict[str, dict] = {}
+        self.sessions: Dict[str, float] = {}
+        self.requests = Counter()
+        self.ids = itertools.count(1)
+
+    @classmethod
+    def with_fixtures(cls, faults: Faults = None) -> "HoverEmulator":
+        emulator = cls(faults=faults)
+        for domain in HOVER_LIST_DOMAINS["domains"]:
+            emulator.add_domain(domain["name"], HOVER_DOMAIN_DETAILS["domain"]["dns"], details=domain)
+        return emulator
+
+    def add_domain(self, domain_name: str, records: Iterable[dict] = (), details: dict = None) -> Dict[str, dict]:
+        with self.lock:
+            self.domain_details[domain_name] = dict(copy.deepcopy(details or {}), id=f"domain-{domain_name}",
+                                                    name=domain_name)
+            zone = self.domains[domain_name] = {}
+            for record in records:
+                record = dict(record, id=record.get("id", None) or self.next_id())
+                zone[record["id"]] = record
+            return copy.deepcopy(zone)
+
+    def records(self, domain_name: str) -> Dict[str, dict]:
+        with self.lock:
+            return copy.deepcopy(self.domains[domain_name])
+
+    def next_id(self) -> str:
+        return f"dns{next(self.ids):07d}"
+
+    def handle(self, method: str, path: str, cookies: dict, payload: dict = None) -> EmulatorResponse:
+        with self.lock:
+            self.requests[(method, path)] += 1
+        if self.faults.latency is not None:
+            time.sleep(self.faults.latency())
+
+        status_code = self.faults.injected_status()
+        if status_code is not None:
+            headers = {"Retry-After": str(self.faults.retry_after)} \
+                if status_code == 429 and self.faults.retry_after is not None else None
+            return EmulatorResponse(status_code, {"succeeded": False, "error": "injected"}, headers=headers)
+
+        if path == "/signin" and method == "GET":
+            return self.establish(cookies)
+        if path == "/signin/auth.json" and method == "POST":
+            return self.log_in(cookies, payload or {})
+        if not self.authenticated(cookies):
+            return EmulatorResponse(401, UNAUTHENTICATED)
+
+        if path == "/api/control_panel/domains" and method == "GET":
+            return self.list_domains()
+        if DOMAIN_PATH.match(path) and method == "GET":
+            return self.get_domain(DOMAIN_PATH.match(path).group("domain"))
+        if path == "/api/control_panel/dns" and method == "PUT":
+            return self.update_entry(payload or {})
+        if path == "/api/control_panel/dns" and method == "POST":
+            return self.create_entry(payload or {})
+        return EmulatorResponse(404, {"succeeded": False})
+
+    def authenticated(self, cookies: dict) -> bool:
+        with self.lock:
+            issued_at = self.sessions.get(cookies.get("hoverauth", None), None)
+        if issued_at is None:
+            return False
+        lifetime = self.faults.session_lifetime
+        return lifetime is None or time.monotonic() - issued_at < lifetime
+
+    def establish(self, cookies: dict) -> EmulatorResponse:
+        if self.authenticated(cookies):
+            return EmulatorResponse(302, headers={"Location": "/control_panel"})
+        return EmulatorResponse(200, {}, cookies={"hover_session": uuid.uuid4().hex})
+
+    def log_in(self, cookies: dict, payload: dict) -> EmulatorResponse:
+        if "hover_session" not in cookies:
+            return EmulatorResponse(401, UNAUTHENTICATED)
+        if not validate_credentials(payload.get("password", None), payload.get("username", None)):
+            return EmulatorResponse(401, {"succeeded": False, "error": "Invalid username or password."})
+
+        token = uuid.uuid4().hex
+        with self.lock:
+            self.sessions[token] = time.monotonic()
+        return EmulatorResponse(200, {"succeeded": True, "status": "completed"},
+                                cookies={"hoverauth": token,
+                                         "hover_device_id": cookies.get("hover_device_id", uuid.uuid4().hex)})
+
+    def list_domains(self) -> EmulatorResponse:
+        with self.lock:
+            domains = [copy.deepcopy(details) for details in self.domain_details.values()]
+        return EmulatorResponse(200, {"succeeded": True, "domains": domains})
+
+    def get_domain(self, domain_name: str) -> EmulatorResponse:
+        with self.lock:
+            zone = self.domains.get(domain_name, None)
+            if zone is None:
+                return EmulatorResponse(404, {"succeeded": False, "error": "Domain not found"})
+            records = [dict(record) for record in zone.values()]
+        return EmulatorResponse(200, {"succeeded": True, "domain": {
+            "id": f"domain-{domain_name}", "name": domain_name, "local_nameservers": True, "dns": records
+        }})
+
+    def update_entry(self, payload: dict) -> EmulatorResponse:
+        domain_name = payload["domain"]["id"][len("domain-"):]
+        dns_record = payload["domain"]["dns_records"][0]
+        with self.lock:
+            record = self.domains.get(domain_name, {}).get(dns_record["id"], None)
+            if record is None:
+                return EmulatorResponse(422, {"succeeded": False, "error": "Record not found"})
+            record.update(payload["fields"])
+            record = dict(record)
+        return EmulatorResponse(200, {"succeeded": True, "domain": {
+            "id": payload["domain"]["id"], "name": domain_name, "dns_records": [record]
+        }})
+
+    def create_entry(self, payload: dict) -> EmulatorResponse:
+        domain_name = payload["id"][len("domain-"):]
+        with self.lock:
+            zone = self.domains.get(domain_name, None)
+            if zone is None:
+                return EmulatorResponse(422, {"succeeded": False, "error": "Domain not found"})
+            # Like Hover, duplicates are accepted
+            record = dict(payload["dns_record"], id=self.next_id(), is_default=False, can_revert=False)
+            zone[record["id"]] = record
+            record = dict(record)
+        return EmulatorResponse(200, {"succeeded": True, "dns_record": record})
+
+    def mock(self):
+        @all_requests
+        def handler(url, request: PreparedRequest):
+            cookie = SimpleCookie(request.headers.get("Cookie", ""))
+            payload = json.loads(request.body) if request.body else None
+            emulated = self.handle(request.method, url.path, {name: morsel.value for name, morsel in cookie.items()},
+                                   payload)
+
+            headers = dict(emulated.headers or {}, **{"Content-Type": "application/json"})
+            mocked = response(status_code=emulated.status_code,
+                              content=json.dumps(emulated.content) if emulated.content is not None else "",
+                              headers=headers, request=request)
+            for name, value in (emulated.cookies or {}).items():
+                mocked.cookies.set(name, value)
+            return mocked
+
+        return handler
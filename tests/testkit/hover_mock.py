@@ -154,8 +154,9 @@ def http_mock_signin(url: SplitResult, request: PreparedRequest) -> Response:
     original_request: Request = request.original
 
     if original_request.method == "POST":
-        username = original_request.json.get('username', None)
-        password = original_request.json.get('password', None)
+        payload = request_json(request)
+        username = payload.get('username', None)
+        password = payload.get('password', None)
         if not session_established(request=original_request):
             return error_401_unauthenticated(request)
 
@@ -164,7 +165,7 @@ def http_mock_signin(url: SplitResult, request: PreparedRequest) -> Response:
 
         headers = {"content-type": "application/json"}
         content = dict(succeeded=True, status="completed", url="/control_panel", email_verified=True,
-                       email="some_email@mailinator.com", username=original_request.json.get('username', None),
+                       email="some_email@mailinator.com", username=payload.get('username', None),
                        email_notifications=dict(renew60before=False, renew30before=True, renew15before=False,
                                                 renew7before=True, renew3before=True, renew1before=True,
                                                 renew1after=True, renew7after=True, renew10after=False,
@@ -217,17 +218,18 @@ def http_mock_entry_update(url: SplitResult, request: PreparedRequest):
     if not_authenticated:
         return error_401_unauthenticated(request)
 
-    dns_records = original_request.json['domain']['dns_records'][0]
-    fields = original_request.json['fields']
+    payload = request_json(request)
+    dns_records = payload['domain']['dns_records'][0]
+    fields = payload['fields']
 
-    HOVER_ENTRY_DETAILS["domain"]["id"] = original_request.json['domain']['id']
-    HOVER_ENTRY_DETAILS["domain"]["name"] = re.match(r"domain-(.*)", original_request.json['domain']['id']).group(1)
+    HOVER_ENTRY_DETAILS["domain"]["id"] = payload['domain']['id']
+    HOVER_ENTRY_DETAILS["domain"]["name"] = re.match(r"domain-(.*)", payload['domain']['id']).group(1)
     HOVER_ENTRY_DETAILS["domain"]["dns_records"][0].update(dict(
         id=dns_records['id'],
         name=dns_records['name'],
         type=dns_records['type'],
-        content=fields['content'],
-        ttl=fields['ttl']
+        content=fields.get('content', None),
+        ttl=fields.get('ttl', None)
     ))
     return response(status_code=200, content=(json.dumps(HOVER_ENTRY_DETAILS)))
 
@@ -241,18 +243,24 @@ def http_mock_entry_create(url: SplitResult, request: PreparedRequest):
     if not_authenticated:
         return error_401_unauthenticated(request)
 
+    payload = request_json(request)
     HOVER_ENTRY_NEW["dns_record"].update(dict(
         id="dns1234567",
-        name=original_request.json['dns_record']['name'],
-        content=original_request.json['dns_record']['content'],
-        type=original_request.json['dns_record']['type'],
-        ttl=original_request.json['dns_record']['ttl']
+        name=payload['dns_record']['name'],
+        content=payload['dns_record']['content'],
+        type=payload['dns_record']['type'],
+        ttl=payload['dns_record']['ttl']
 
     ))
 
     return response(status_code=200, content=json.dumps(HOVER_ENTRY_NEW))
 
 
+def request_json(request: PreparedRequest) -> dict:
+    # Payloads are encoded by the connection's codec: the original request only holds the serialized body
+    return json.loads(request.body) if request.body else {}
+
+
 def is_authenticated(request: Request):
     return "hoverauth" in (request.cookies or [])
 
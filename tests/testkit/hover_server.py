@@ -0,0 +1,81 @@
+import json
+import threading
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from testkit.hover_emulator import HoverEmulator
+
+
+class HoverRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps the connections alive, as Hover does
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately: without this, delayed ACKs add ~40ms to every call
+    disable_nagle_algorithm = True
+    server: "HoverServer"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def cookies(self) -> dict:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return {name: morsel.value for name, morsel in cookie.items()}
+
+    def json_body(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def dispatch(self) -> None:
+        emulated = self.server.emulator.handle(self.command, self.path, self.cookies(), self.json_body())
+        body = json.dumps(emulated.content).encode() if emulated.content is not None else b""
+        self.send_response(emulated.status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (emulated.headers or {}).items():
+            self.send_header(name, value)
+        for name, value in (emulated.cookies or {}).items():
+            self.send_header("Set-Cookie", f"{name}={value}; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = dispatch
+
+
+class HoverServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, emulator: HoverEmulator = None) -> None:
+        super().__init__((host, port), HoverRequestHandler)
+        self.emulator = emulator or HoverEmulator.with_fixtures()
+        self.thread = None
+
+    @property
+    def base(self) -> str:
+        host, port = self.server_address[:2]
+        return f"{host}:{port}"
+
+    def configuration(self, **sections) -> dict:
+        configuration = dict(
+            credential=dict(username="my_username", password="my_password"),
+            endpoints=dict(protocol="http", base=self.base, establish="/signin", login="/signin/auth.json",
+                           list_domains="/api/control_panel/domains", list_entries="/api/control_panel/{domain}/dns",
+                           update_entry="/api/control_panel/dns", create_entry="/api/control_panel/dns")
+        )
+        configuration.update(sections)
+        return configuration
+
+    def start(self) -> "HoverServer":
+        # A short poll interval keeps stop() (and the tests' tear down) fast
+        self.thread = threading.Thread(target=self.serve_forever, kwargs=dict(poll_interval=0.05),
+                                       name="hover-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "HoverServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+from typing import Dict, NamedTuple
+
+import hoverconnector
+
+SOURCE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(hoverconnector.__file__)))
+
+
+class ImportTime(NamedTuple):
+    self_us: int
+    cumulative_us: int
+    # 0 for modules imported by the statement itself, 1 for their own imports, ...
+    depth: int
+
+
+def measure_imports(statement: str) -> Dict[str, ImportTime]:
+    # A fresh interpreter per measure: modules already imported by the test run would not show up otherwise
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SOURCE_PATH,
+                                                                             os.environ.get("PYTHONPATH", None)])))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], env=environment,
+                            stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, universal_newlines=True, check=True)
+
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports[name.strip()] = ImportTime(int(self_us), int(cumulative_us), depth)
+    return imports
+
+
+def total_import_time(statement: str, package: str = "hoverconnector", runs: int = 3) -> int:
+    # Time spent importing the package and everything it pulled in, the best of a few runs to leave out noise
+    return min(sum(measure.cumulative_us for name, measure in measure_imports(statement).items()
+                   if measure.depth == 0 and name.split(".")[0] == package)
+               for _ in range(runs))